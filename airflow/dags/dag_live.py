@@ -12,10 +12,12 @@ default_args = {
     "execution_timeout": timedelta(hours=4),
 }
 
+# Le tracker est un service permanent (docker-compose : live_tracker) qui se cale sur
+# les coups d'envoi en base ; ce DAG ne sert plus qu'au lancement manuel
 with DAG(
     dag_id="live_tracker",
-    description="Lance le live tracker pendant les jours de match",
-    schedule="0 13 * * *",
+    description="Lancement manuel du live tracker (service permanent en production)",
+    schedule=None,
     start_date=datetime(2026, 2, 25),
     catchup=False,
     default_args=default_args,
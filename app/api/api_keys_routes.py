@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime, timedelta
 
-from app.db.database import get_db
+from app.db.database import get_primary_db
 from app.db.models import APIKey
 from app.auth import generate_api_key
 from app.schemas import APIResponse
@@ -26,7 +26,7 @@ async def create_api_key(
     expires_in_days: int = None,
     rate_limit: int = 1000,
     admin_secret: str = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_primary_db)
 ):
     verify_admin(admin_secret)
     
@@ -60,7 +60,7 @@ async def create_api_key(
 @router.get("", response_model=APIResponse)
 async def list_api_keys(
     admin_secret: str = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_primary_db)
 ):
     verify_admin(admin_secret)
     
@@ -90,7 +90,7 @@ async def list_api_keys(
 async def revoke_api_key(
     key_id: int,
     admin_secret: str = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_primary_db)
 ):
     verify_admin(admin_secret)
     
@@ -5,7 +5,7 @@ from sqlalchemy.orm import joinedload
 from typing import Optional
 
 from app.db.database import get_db
-from app.db.models import MatchEvent, Fixture, Player, Team
+from app.db.models import MatchEvent, Fixture, Player, Team, PlayerSeasonAggregate
 from app.schemas import MatchEventSchema, APIResponse, PaginationMeta
 
 router = APIRouter(prefix="/events", tags=["Match Events"])
@@ -180,31 +180,25 @@ async def get_top_scorers(
     db: AsyncSession = Depends(get_db)
 ):
     
-    from sqlalchemy import and_
+    # Lecture directe des agrégats saison (index season_id, goals DESC)
+    goals = func.sum(PlayerSeasonAggregate.goals).label('goals')
+    assists = func.sum(PlayerSeasonAggregate.assists).label('assists')
     
-    # Requête pour compter les buts par joueur
-    query = select(
-        Player,
-        func.count(MatchEvent.id).label('goals')
-    ).join(
-        MatchEvent, MatchEvent.player_id == Player.id
+    query = select(Player, goals, assists).join(
+        PlayerSeasonAggregate, PlayerSeasonAggregate.player_id == Player.id
     ).where(
-        MatchEvent.type == 'goal'
+        PlayerSeasonAggregate.goals > 0
     )
     
     # Filtres optionnels
-    if league_id or season_id:
-        query = query.join(Fixture, MatchEvent.fixture_id == Fixture.id)
-        
-        if league_id:
-            query = query.where(Fixture.league_id == league_id)
-        if season_id:
-            query = query.where(Fixture.season_id == season_id)
-    
+    if league_id:
+        query = query.where(PlayerSeasonAggregate.league_id == league_id)
+    if season_id:
+        query = query.where(PlayerSeasonAggregate.season_id == season_id)
     if team_id:
         query = query.where(Player.team_id == team_id)
     
-    query = query.group_by(Player.id).order_by(func.count(MatchEvent.id).desc()).limit(limit)
+    query = query.group_by(Player.id).order_by(goals.desc(), assists.desc()).limit(limit)
     
     result = await db.execute(query)
     scorers = result.all()
@@ -218,9 +212,10 @@ async def get_top_scorers(
                 "jersey_number": player.jersey_number,
                 "photo_url": player.photo_url
             },
-            "goals": goals
+            "goals": goals,
+            "assists": assists
         }
-        for player, goals in scorers
+        for player, goals, assists in scorers
     ]
     
     return APIResponse(
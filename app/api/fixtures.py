@@ -14,6 +14,7 @@ from app.schemas import (
     MatchStatisticsSchema, APIResponse, PaginationMeta, MatchStatusEnum
 )
 from app.auth import verify_api_key
+from app.utils.fast_response import fast_api_response, select_fixtures_detailed, fixture_detailed_rows
 
 router = APIRouter(prefix="/fixtures", tags=["Fixtures"])
 
@@ -36,12 +37,8 @@ async def get_fixtures(
     # api_key = Depends(verify_api_key),
 ):
     
-    query = select(Fixture).options(
-        joinedload(Fixture.home_team),
-        joinedload(Fixture.away_team),
-        joinedload(Fixture.league),
-        joinedload(Fixture.season)
-    )
+    # Colonnes seulement : pas d'objets ORM ni de double passage Pydantic
+    query = select_fixtures_detailed()
     
     # Filtres
     if league_id:
@@ -74,26 +71,22 @@ async def get_fixtures(
     if round:
         query = query.where(Fixture.round == round)
     if live:
-        query = query.where(Fixture.is_live == live)
+        # Littéral (et non paramètre) pour que l'index partiel ix_fixtures_live_date soit utilisable
+        query = query.where(Fixture.is_live == True)
     
     count_query = select(func.count()).select_from(query.subquery())
     total_result = await db.execute(count_query)
     total = total_result.scalar()
     
     # offset = (page - 1) * per_page
-    query = (query.order_by(Fixture.date.asc())
+    query = (query.order_by(Fixture.date.asc(), Fixture.id)
             #  .offset(offset).limit(per_page)
     )
     
     result = await db.execute(query)
-    fixtures = result.scalars().all()
     
-    # Convertir
-    fixtures_data = [FixtureDetailed.model_validate(fixture) for fixture in fixtures]
-    
-    return APIResponse(
-        success=True,
-        data={"fixtures": [fixture.model_dump() for fixture in fixtures_data]},
+    return fast_api_response(
+        data={"fixtures": fixture_detailed_rows(result.mappings())},
         # meta=PaginationMeta(
         #     page=page,
         #     per_page=per_page,
@@ -109,25 +102,15 @@ async def get_fixture(
     db: AsyncSession = Depends(get_db)
 ):
     
-    query = select(Fixture).options(
-        joinedload(Fixture.home_team),
-        joinedload(Fixture.away_team),
-        joinedload(Fixture.league),
-        joinedload(Fixture.season)
-    ).where(Fixture.id == fixture_id)
+    query = select_fixtures_detailed().where(Fixture.id == fixture_id)
     
     result = await db.execute(query)
-    fixture = result.scalar_one_or_none()
+    rows = fixture_detailed_rows(result.mappings())
     
-    if not fixture:
+    if not rows:
         raise HTTPException(status_code=404, detail="Fixture not found")
     
-    fixture_data = FixtureDetailed.model_validate(fixture)
-    
-    return APIResponse(
-        success=True,
-        data={"fixture": fixture_data.model_dump()}
-    )
+    return fast_api_response(data={"fixture": rows[0]})
 
 
 @router.get("/{fixture_id}/events", response_model=APIResponse)
@@ -147,7 +130,11 @@ async def get_fixture_events(
     events_query = select(MatchEvent).options(
         joinedload(MatchEvent.player),
         joinedload(MatchEvent.assist_player)
-    ).where(MatchEvent.fixture_id == fixture_id).order_by(MatchEvent.minute)
+    ).where(
+        MatchEvent.fixture_id == fixture_id,
+        # Clé de partition : une seule partition parcourue
+        MatchEvent.season_id == fixture.season_id
+    ).order_by(MatchEvent.minute)
     
     events_result = await db.execute(events_query)
     events = events_result.scalars().all()
@@ -183,7 +170,10 @@ async def get_fixture_lineups(
     lineups_query = select(Lineup).options(
         joinedload(Lineup.player),
         joinedload(Lineup.team)
-    ).where(Lineup.fixture_id == fixture_id)
+    ).where(
+        Lineup.fixture_id == fixture_id,
+        Lineup.season_id == fixture.season_id
+    )
     
     lineups_result = await db.execute(lineups_query)
     lineups = lineups_result.scalars().all()
@@ -259,7 +249,10 @@ async def get_fixture_statistics(
     # Récupérer les statistiques
     stats_query = select(MatchStatistics).options(
         joinedload(MatchStatistics.team)
-    ).where(MatchStatistics.fixture_id == fixture_id)
+    ).where(
+        MatchStatistics.fixture_id == fixture_id,
+        MatchStatistics.season_id == fixture.season_id
+    )
     
     stats_result = await db.execute(stats_query)
     statistics = stats_result.scalars().all()
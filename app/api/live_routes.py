@@ -1,24 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, WebSocketException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from datetime import datetime, timedelta
 
+from app.core.config import settings
 from app.db.database import get_db
 from app.db.models import Fixture
 from app.schemas import APIResponse
-from app.services.scraper.live_service import LiveMatchService
+from app.services.scraper.circuit_breaker import GuardedSofascoreAPI, upstream_budget
+from app.services.scraper.live_clock import match_clock
+from app.services.scraper.live_events import LiveEventFanout
+from app.services.scraper.live_latency import DeliveryLag
+from app.services.scraper.live_service import LiveMatchService, FINAL_STATUSES
+from app.services.scraper.stat_timeline import timeline_series
+from app.services.scraper.tracker_cluster import TrackerCluster
+
+
+async def live_upstream_budget():
+    # Temps Sofascore total accordé à une requête /live, tous appels confondus
+    with upstream_budget(settings.LIVE_UPSTREAM_BUDGET_SECONDS):
+        yield
 
-router = APIRouter(prefix="/live", tags=["Live Matches"])
+
+router = APIRouter(prefix="/live", tags=["Live Matches"], dependencies=[Depends(live_upstream_budget)])
 
 live_service = LiveMatchService()
+# Appels Sofascore des routes : disjoncteur partagé entre workers, délai par appel
+live_service.api = GuardedSofascoreAPI(live_service.api, live_service.redis)
+# Événements poussés aux clients WebSocket (journal live:events)
+live_fanout = LiveEventFanout(live_service.redis)
+# Retard sur Sofascore au moment où une donnée est servie
+api_lag, websocket_lag = DeliveryLag("api"), DeliveryLag("websocket")
+
+# WebSocket : authentification propre (voir verify_websocket_api_key), pas de budget amont
+ws_router = APIRouter(prefix="/live", tags=["Live Matches"])
 
 
 async def _get_cached_or_fetch(sofascore_id: int) -> dict:
     cached = await live_service.get_cached_live_data(sofascore_id)
     if not cached:
         cached = await live_service.update_live_match(sofascore_id)
+    if not cached:
+        # Sofascore lent ou coupé : dernière version connue plutôt qu'une erreur
+        cached = await live_service.get_stale_live_data(sofascore_id)
     if not cached:
         raise HTTPException(status_code=503, detail="Données live indisponibles")
+    api_lag.delivered(sofascore_id, cached.get("latency"), final=cached.get("status") in FINAL_STATUSES)
     return cached
 
 @router.get("/matches", response_model=APIResponse)
@@ -28,8 +59,12 @@ async def get_live_matches(db: AsyncSession = Depends(get_db)):
     one_hour_before = now - timedelta(hours=1)
     three_hours_after = now + timedelta(hours=3)
 
-    # DB
-    query = select(Fixture).where(Fixture.date.between(one_hour_before, three_hours_after))
+    # DB — league et équipes chargées dans la même requête
+    query = select(Fixture).options(
+        joinedload(Fixture.league),
+        joinedload(Fixture.home_team),
+        joinedload(Fixture.away_team),
+    ).where(Fixture.date.between(one_hour_before, three_hours_after))
     result = await db.execute(query)
     db_fixtures = result.scalars().all()
     fixtures_map = {f.sofascore_id: f for f in db_fixtures}
@@ -37,11 +72,16 @@ async def get_live_matches(db: AsyncSession = Depends(get_db)):
     # IDs live (DB + Sofascore)
     live_sofascore_ids = await live_service.get_live_fixtures(db)
 
+    # Cache Redis lu en une seule fois pour tous les matchs
+    cached_map = await live_service.get_cached_live_data_many(
+        list(set(fixtures_map) | set(live_sofascore_ids))
+    )
+
     matches = []
 
     # Matchs DB — infos enrichies depuis le cache
     for sofascore_id, fixture in fixtures_map.items():
-        cached = await live_service.get_cached_live_data(sofascore_id)
+        cached = cached_map.get(sofascore_id)
         match_info = cached.get("match_info", {}) if cached else {}
         score = match_info.get("score", {})
 
@@ -56,7 +96,8 @@ async def get_live_matches(db: AsyncSession = Depends(get_db)):
                 "home": score.get("home", fixture.home_score),
                 "away": score.get("away", fixture.away_score),
             },
-            "minute": match_info.get("minute"),
+            # Minute recalculée à chaque requête depuis l'horloge brute en cache
+            **match_clock(match_info),
             "status": cached.get("status") if cached else fixture.status,
             "status_description": match_info.get("status_description"),
             "kickoff": fixture.date.isoformat(),
@@ -67,9 +108,11 @@ async def get_live_matches(db: AsyncSession = Depends(get_db)):
     for sofascore_id in live_sofascore_ids:
         if sofascore_id in fixtures_map:
             continue
-        cached = await live_service.get_cached_live_data(sofascore_id)
+        cached = cached_map.get(sofascore_id)
         if not cached:
             cached = await live_service.update_live_match(sofascore_id)
+        if not cached:
+            cached = await live_service.get_stale_live_data(sofascore_id)
         if not cached:
             continue
 
@@ -87,7 +130,7 @@ async def get_live_matches(db: AsyncSession = Depends(get_db)):
                 "home": score.get("home"),
                 "away": score.get("away"),
             },
-            "minute": match_info.get("minute"),
+            **match_clock(match_info),
             "status": cached.get("status"),
             "status_description": match_info.get("status_description"),
             "kickoff": None,
@@ -118,7 +161,7 @@ async def get_live_match(sofascore_id: int, db: AsyncSession = Depends(get_db)):
         "in_db": fixture is not None,
         "status": cached.get("status"),
         "status_description": match_info.get("status_description"),
-        "minute": match_info.get("minute"),
+        **match_clock(match_info),
         "tournament": match_info.get("tournament"),
         "kickoff": fixture.date.isoformat() if fixture else None,
         "home_team": match_info.get("home_team"),
@@ -220,6 +263,25 @@ async def get_live_stats(sofascore_id: int, db: AsyncSession = Depends(get_db)):
         "details": stats,            
     })
 
+@router.get("/match/{sofascore_id}/timeline", response_model=APIResponse)
+async def get_live_timeline(
+    sofascore_id: int,
+    stats: str = Query(None, description="Clés Sofascore séparées par des virgules (ex. ballPossession,expectedGoals)"),
+    db: AsyncSession = Depends(get_db),
+):
+
+    # Évolution des stats (un point par changement) et pression minute par minute ;
+    # lu en Redis pendant le match, en base ensuite, sans appel Sofascore
+    samples = await live_service.timeline.load(sofascore_id, db)
+    if not samples:
+        raise HTTPException(status_code=404, detail="Aucun historique de statistiques pour ce match")
+
+    stat_keys = [key.strip() for key in stats.split(",")] if stats else None
+    return APIResponse(success=True, data={
+        "sofascore_id": sofascore_id,
+        **timeline_series(samples, stat_keys),
+    })
+
 @router.get("/match/{sofascore_id}/lineups", response_model=APIResponse)
 async def get_live_lineups(sofascore_id: int, db: AsyncSession = Depends(get_db)):
    
@@ -235,4 +297,93 @@ async def get_live_lineups(sofascore_id: int, db: AsyncSession = Depends(get_db)
         "away_team": match_info.get("away_team", {}).get("name"),
         "available": lineups is not None,
         "lineups": lineups,
-    })
\ No newline at end of file
+    })
+@router.get("/standings/{season_id}", response_model=APIResponse)
+async def get_live_standings(season_id: int):
+
+    # Classement incluant les scores des matchs en cours (cache Redis)
+    live_standings = await live_service.get_live_standings(season_id)
+    if not live_standings["standings"]:
+        raise HTTPException(status_code=404, detail="Aucun match de groupe pour cette saison")
+
+    return APIResponse(success=True, data={
+        "season_id": season_id,
+        "last_updated": live_standings.get("timestamp"),
+        "standings": live_standings["standings"],
+    })
+
+
+@router.get("/debug/lag", response_model=APIResponse)
+async def get_live_lag():
+
+    # Retard courant de chaque match suivi, du plus en retard au plus frais
+    matches = await live_service.lag_board.snapshot()
+    return APIResponse(success=True, data={
+        "slo_seconds": settings.LIVE_FRESHNESS_SLO_SECONDS,
+        "breached": sum(1 for m in matches if m["slo_breached"]),
+        "matches": matches,
+    })
+
+
+@router.get("/trackers", response_model=APIResponse)
+async def get_live_trackers():
+
+    # Instances du tracker vivantes et charge déclarée au dernier passage
+    instances = await TrackerCluster(live_service.redis, instance_id="api").instances()
+    return APIResponse(success=True, data={
+        "instances": instances,
+        "owned_fixtures": sum(int(i.get("owned", 0)) for i in instances),
+    })
+
+
+# Identifiant d'entrée Redis Stream (<ms>-<séquence>)
+STREAM_ID = re.compile(r"\d+-\d+")
+
+
+@ws_router.websocket("/match/{sofascore_id}/ws")
+async def live_match_events(websocket: WebSocket, sofascore_id: int, since: str = None):
+
+    # Événements du match (incidents, score, statut) dès leur écriture par le tracker ;
+    # ?since=<id> rejoue d'abord ce qui suit cet id (reconnexion), ?since=0 tout le match
+    if since is not None and since != "0" and not STREAM_ID.fullmatch(since):
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="since invalide")
+    await websocket.accept()
+    queue = await live_fanout.subscribe(sofascore_id)
+    # Déconnexion vue tout de suite, même sans événement à envoyer (mi-temps, match fini)
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
+    next_record = None
+    try:
+        last_id = None
+        if since is not None:
+            for record in await live_service.events.read(sofascore_id, "-" if since == "0" else since):
+                await websocket.send_json(record)
+                last_id = record["id"]
+        while True:
+            next_record = asyncio.create_task(queue.get())
+            await asyncio.wait({disconnected, next_record}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                break
+            record = next_record.result()
+            # Déjà envoyé par la relecture
+            if last_id and _entry_key(record["id"]) <= _entry_key(last_id):
+                continue
+            await websocket.send_json(record)
+            websocket_lag.delivered(sofascore_id, record, final=record.get("status") in FINAL_STATUSES)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in (disconnected, next_record):
+            if task is not None:
+                task.cancel()
+        live_fanout.unsubscribe(sofascore_id, queue)
+
+
+async def _wait_disconnect(websocket: WebSocket):
+    # Messages du client ignorés : le flux est en lecture seule
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+def _entry_key(entry_id: str):
+    milliseconds, sequence = entry_id.split("-")
+    return int(milliseconds), int(sequence)
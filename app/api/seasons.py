@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, distinct
 from sqlalchemy.orm import joinedload
 from typing import Optional
 
 from app.db.database import get_db
-from app.db.models import Season, League, Fixture, Standing
+from app.db.models import Season, League, Fixture, Standing, MatchEvent, MatchStatus, EventType
 from app.schemas import SeasonBase, APIResponse, PaginationMeta
+from app.utils.fast_response import fast_api_response, select_fixtures_detailed, fixture_detailed_rows
 
 router = APIRouter(prefix="/seasons", tags=["Seasons"])
 
@@ -78,8 +79,6 @@ async def get_season_fixtures(
     db: AsyncSession = Depends(get_db)
 ):
     
-    from app.schemas import FixtureDetailed
-    
     # Vérifier que la saison existe
     season_query = select(Season).where(Season.id == season_id)
     season_result = await db.execute(season_query)
@@ -88,12 +87,7 @@ async def get_season_fixtures(
     if not season:
         raise HTTPException(status_code=404, detail="Season not found")
     
-    query = select(Fixture).options(
-        joinedload(Fixture.home_team),
-        joinedload(Fixture.away_team),
-        joinedload(Fixture.league),
-        joinedload(Fixture.season)
-    ).where(Fixture.season_id == season_id)
+    query = select_fixtures_detailed().where(Fixture.season_id == season_id)
     
     if status:
         query = query.where(Fixture.status == status)
@@ -102,20 +96,16 @@ async def get_season_fixtures(
     total = (await db.execute(count_query)).scalar()
     
     offset = (page - 1) * per_page
-    query = query.order_by(Fixture.date).offset(offset).limit(per_page)
+    query = query.order_by(Fixture.date, Fixture.id).offset(offset).limit(per_page)
     
     result = await db.execute(query)
-    fixtures = result.scalars().all()
-    
-    fixtures_data = [FixtureDetailed.model_validate(fixture) for fixture in fixtures]
     
-    return APIResponse(
-        success=True,
+    return fast_api_response(
         data={
-            "season": SeasonBase.model_validate(season).model_dump(),
-            "fixtures": [fixture.model_dump() for fixture in fixtures_data]
+            "season": SeasonBase.model_validate(season).model_dump(mode="json"),
+            "fixtures": fixture_detailed_rows(result.mappings())
         },
-        meta=PaginationMeta(page=page, per_page=per_page, total=total, total_pages=(total + per_page - 1) // per_page)
+        meta=PaginationMeta(page=page, per_page=per_page, total=total, total_pages=(total + per_page - 1) // per_page).model_dump()
     )
 
 
@@ -165,55 +155,39 @@ async def get_season_statistics(
     db: AsyncSession = Depends(get_db)
 ):
     
-    # Vérifier que la saison existe
-    season_query = select(Season).where(Season.id == season_id)
-    season_result = await db.execute(season_query)
-    season = season_result.scalar_one_or_none()
-    
-    if not season:
+    # Saison + agrégats en une seule passe (COUNT ... FILTER)
+    query = select(
+        Season,
+        func.count(distinct(Fixture.id)).label("total_matches"),
+        func.count(distinct(Fixture.id)).filter(
+            Fixture.status == MatchStatus.FINISHED
+        ).label("finished_matches"),
+        func.count(MatchEvent.id).filter(
+            MatchEvent.type == EventType.GOAL
+        ).label("total_goals"),
+        func.count(MatchEvent.id).filter(
+            MatchEvent.type == EventType.YELLOW_CARD
+        ).label("total_yellow_cards"),
+        func.count(MatchEvent.id).filter(
+            MatchEvent.type == EventType.RED_CARD
+        ).label("total_red_cards"),
+    ).outerjoin(
+        Fixture, Fixture.season_id == Season.id
+    ).outerjoin(
+        MatchEvent, MatchEvent.fixture_id == Fixture.id
+    ).where(Season.id == season_id).group_by(Season.id)
+    
+    row = (await db.execute(query)).one_or_none()
+    
+    if not row:
         raise HTTPException(status_code=404, detail="Season not found")
     
-    # Compter les matchs
-    total_matches = (await db.execute(
-        select(func.count(Fixture.id)).where(Fixture.season_id == season_id)
-    )).scalar()
-    
-    finished_matches = (await db.execute(
-        select(func.count(Fixture.id)).where(
-            Fixture.season_id == season_id,
-            Fixture.status == 'finished'
-        )
-    )).scalar()
-    
-    # Total de buts
-    from app.db.models import MatchEvent
-    total_goals = (await db.execute(
-        select(func.count(MatchEvent.id)).join(
-            Fixture, MatchEvent.fixture_id == Fixture.id
-        ).where(
-            Fixture.season_id == season_id,
-            MatchEvent.type == 'goal'
-        )
-    )).scalar()
-    
-    # Total de cartons
-    total_yellow_cards = (await db.execute(
-        select(func.count(MatchEvent.id)).join(
-            Fixture, MatchEvent.fixture_id == Fixture.id
-        ).where(
-            Fixture.season_id == season_id,
-            MatchEvent.type == 'YELLOW_CARD'
-        )
-    )).scalar()
-    
-    total_red_cards = (await db.execute(
-        select(func.count(MatchEvent.id)).join(
-            Fixture, MatchEvent.fixture_id == Fixture.id
-        ).where(
-            Fixture.season_id == season_id,
-            MatchEvent.type == 'RED_CARD'
-        )
-    )).scalar()
+    season = row.Season
+    total_matches = row.total_matches
+    finished_matches = row.finished_matches
+    total_goals = row.total_goals
+    total_yellow_cards = row.total_yellow_cards
+    total_red_cards = row.total_red_cards
     
     statistics = {
         "total_matches": total_matches,
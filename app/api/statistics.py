@@ -8,7 +8,7 @@ from app.db.models import Standing
 
 from app.db.database import get_db
 from app.db.models import (
-    MatchStatistics, PlayerStatistics, TeamStatistics,
+    MatchStatistics, PlayerStatistics, TeamStatistics, PlayerSeasonAggregate,
     Fixture, Player, Team, Season
 )
 from app.schemas import APIResponse 
@@ -125,26 +125,27 @@ async def get_player_season_statistics(
     db: AsyncSession = Depends(get_db)
 ):
 
-    # Vérifier que le joueur existe
-    player_query = select(Player).where(Player.id == player_id)
-    player_result = await db.execute(player_query)
-    player = player_result.scalar_one_or_none()
+    # Joueur + agrégats calculés + stats saison Sofascore en une requête
+    query = select(Player, PlayerSeasonAggregate, PlayerStatistics).outerjoin(
+        PlayerSeasonAggregate, and_(
+            PlayerSeasonAggregate.player_id == Player.id,
+            PlayerSeasonAggregate.season_id == season_id
+        )
+    ).outerjoin(
+        PlayerStatistics, and_(
+            PlayerStatistics.player_id == Player.id,
+            PlayerStatistics.season_id == season_id
+        )
+    ).where(Player.id == player_id)
     
-    if not player:
-        raise HTTPException(status_code=404, detail="Player not found")
+    row = (await db.execute(query)).first()
     
-    # Récupérer toutes les stats du joueur pour la saison
-    stats_query = select(PlayerStatistics).join(
-        Fixture, PlayerStatistics.fixture_id == Fixture.id
-    ).where(
-        PlayerStatistics.player_id == player_id,
-        Fixture.season_id == season_id
-    )
+    if not row:
+        raise HTTPException(status_code=404, detail="Player not found")
     
-    result = await db.execute(stats_query)
-    statistics = result.scalars().all()
+    player, aggregate, season_stats = row
     
-    if not statistics:
+    if not aggregate and not season_stats:
         return APIResponse(
             success=True,
             data={
@@ -159,25 +160,31 @@ async def get_player_season_statistics(
             }
         )
     
-    # Agréger les statistiques
+    def from_aggregate(field, fallback=None):
+        if aggregate:
+            return getattr(aggregate, field)
+        return getattr(season_stats, fallback or field) if season_stats else None
+    
+    def from_season_stats(field):
+        return getattr(season_stats, field) if season_stats else None
+    
+    average_rating = from_aggregate("average_rating", "rating")
+    
     aggregated = {
-        "matches_played": len(statistics),
-        "minutes_played": sum(s.minutes_played or 0 for s in statistics),
-        "goals": sum(s.goals or 0 for s in statistics),
-        "assists": sum(s.assists or 0 for s in statistics),
-        "shots": sum(s.shots or 0 for s in statistics),
-        "shots_on_target": sum(s.shots_on_target or 0 for s in statistics),
-        "passes": sum(s.passes or 0 for s in statistics),
-        "tackles": sum(s.tackles or 0 for s in statistics),
-        "interceptions": sum(s.interceptions or 0 for s in statistics),
-        "fouls": sum(s.fouls or 0 for s in statistics),
-        "yellow_cards": sum(s.yellow_cards or 0 for s in statistics),
-        "red_cards": sum(s.red_cards or 0 for s in statistics),
-        "dribbles": sum(s.dribbles or 0 for s in statistics),
-        "average_rating": round(
-            sum(s.rating or 0 for s in statistics if s.rating) / 
-            len([s for s in statistics if s.rating]), 2
-        ) if any(s.rating for s in statistics) else None
+        "matches_played": from_aggregate("appearances"),
+        "minutes_played": from_aggregate("minutes_played"),
+        "goals": from_aggregate("goals"),
+        "assists": from_aggregate("assists"),
+        "shots": from_season_stats("total_shots"),
+        "shots_on_target": from_season_stats("shots_on_target"),
+        "passes": from_season_stats("total_passes"),
+        "tackles": from_season_stats("tackles"),
+        "interceptions": from_season_stats("interceptions"),
+        "fouls": from_season_stats("fouls"),
+        "yellow_cards": from_aggregate("yellow_cards"),
+        "red_cards": from_aggregate("red_cards"),
+        "dribbles": from_season_stats("successful_dribbles"),
+        "average_rating": round(average_rating, 2) if average_rating is not None else None
     }
     
     return APIResponse(
@@ -279,8 +286,9 @@ async def get_league_top_teams(
     db: AsyncSession = Depends(get_db)
 ):
     
-    query = select(Standing).join(
-        Team, Standing.team_id == Team.id
+    # Une seule requête : l'équipe est chargée par jointure avec le classement
+    query = select(Standing).options(
+        joinedload(Standing.team)
     ).join(
         Season, Standing.season_id == Season.id
     ).where(Season.league_id == league_id)
@@ -295,9 +303,7 @@ async def get_league_top_teams(
     
     teams_data = []
     for standing in standings:
-        team_query = select(Team).where(Team.id == standing.team_id)
-        team_result = await db.execute(team_query)
-        team = team_result.scalar_one()
+        team = standing.team
         
         teams_data.append({
             "rank": standing.rank,
@@ -0,0 +1,115 @@
+import socket
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from typing import List, Optional
+
+from app.auth import verify_api_key
+from app.core.config import settings
+from app.db.database import get_primary_db
+from app.db.models import APIKey, WebhookSubscription
+from app.schemas import APIResponse
+from app.services.scraper.webhooks import (
+    EVENT_TYPES, DEFAULT_EVENT_TYPES, UnsafeWebhookURL, check_webhook_url, generate_webhook_secret
+)
+
+
+router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
+
+
+def _subscription_data(subscription: WebhookSubscription) -> dict:
+    return {
+        "id": subscription.id,
+        "url": subscription.url,
+        "team_ids": subscription.team_ids,
+        "fixture_ids": subscription.fixture_ids,
+        "event_types": subscription.event_types or list(DEFAULT_EVENT_TYPES),
+        "max_concurrency": subscription.max_concurrency,
+        "is_active": subscription.is_active,
+        "failure_count": subscription.failure_count,
+        "last_failure_at": subscription.last_failure_at.isoformat() if subscription.last_failure_at else None,
+        "last_error": subscription.last_error,
+    }
+
+
+@router.post("", response_model=APIResponse)
+async def create_webhook(
+    url: str = Query(..., description="URL appelée en POST (JSON signé)"),
+    team_ids: Optional[List[int]] = Query(None, description="Équipes (id Sofascore)"),
+    fixture_ids: Optional[List[int]] = Query(None, description="Matchs (id Sofascore)"),
+    event_types: Optional[List[str]] = Query(None, description=f"Types d'événement ({', '.join(EVENT_TYPES)})"),
+    max_concurrency: int = Query(settings.WEBHOOK_MAX_CONCURRENCY, ge=1, le=10, description="Envois simultanés"),
+    api_key: APIKey = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_primary_db)
+):
+    try:
+        await check_webhook_url(url)
+    except UnsafeWebhookURL as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except (socket.gaierror, UnicodeError):
+        raise HTTPException(status_code=422, detail="Hôte introuvable")
+    unknown = sorted(set(event_types or []) - set(EVENT_TYPES))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Types d'événement inconnus : {', '.join(unknown)}")
+
+    count = await db.scalar(
+        select(func.count(WebhookSubscription.id)).where(
+            WebhookSubscription.api_key_id == api_key.id,
+            WebhookSubscription.is_active == True
+        )
+    )
+    if count >= settings.WEBHOOK_MAX_PER_KEY:
+        raise HTTPException(status_code=409, detail="Nombre maximal de webhooks atteint")
+
+    subscription = WebhookSubscription(
+        api_key_id=api_key.id,
+        url=url,
+        secret=generate_webhook_secret(),
+        team_ids=team_ids,
+        fixture_ids=fixture_ids,
+        event_types=event_types,
+        max_concurrency=max_concurrency,
+        is_active=True,
+        failure_count=0,
+    )
+    db.add(subscription)
+    await db.commit()
+
+    # Secret renvoyé une seule fois : vérification de X-Webhook-Signature côté partenaire
+    return APIResponse(success=True, data={**_subscription_data(subscription), "secret": subscription.secret})
+
+
+@router.get("", response_model=APIResponse)
+async def list_webhooks(
+    api_key: APIKey = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_primary_db)
+):
+    result = await db.execute(
+        select(WebhookSubscription)
+        .where(WebhookSubscription.api_key_id == api_key.id)
+        .order_by(WebhookSubscription.id)
+    )
+    return APIResponse(success=True, data={"webhooks": [_subscription_data(s) for s in result.scalars().all()]})
+
+
+@router.delete("/{subscription_id}", response_model=APIResponse)
+async def delete_webhook(
+    subscription_id: int,
+    api_key: APIKey = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_primary_db)
+):
+    result = await db.execute(
+        select(WebhookSubscription).where(
+            WebhookSubscription.id == subscription_id,
+            WebhookSubscription.api_key_id == api_key.id
+        )
+    )
+    subscription = result.scalar_one_or_none()
+    if not subscription:
+        raise HTTPException(status_code=404, detail="Webhook non trouvé")
+
+    subscription.is_active = False
+    await db.commit()
+
+    return APIResponse(success=True, data={"message": "Webhook désactivé"})
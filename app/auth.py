@@ -1,16 +1,16 @@
-from fastapi import Security, HTTPException, status, Depends
+from fastapi import Security, HTTPException, status, Depends, WebSocket, WebSocketException
 from fastapi.security import APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
-from app.db.database import get_db
+from app.db.database import get_primary_db
 import secrets
 import os
 
 ADMIN_SECRET = os.getenv("ADMIN_SECRET")
 API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
 
-async def verify_api_key(api_key: str = Security(API_KEY_HEADER), db: AsyncSession = Depends(get_db)):
+async def verify_api_key(api_key: str = Security(API_KEY_HEADER), db: AsyncSession = Depends(get_primary_db)):
     if not api_key:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,5 +45,14 @@ async def verify_api_key(api_key: str = Security(API_KEY_HEADER), db: AsyncSessi
     return api_key_obj
 
 
+async def verify_websocket_api_key(websocket: WebSocket, db: AsyncSession = Depends(get_primary_db)):
+    # APIKeyHeader ne s'applique pas aux WebSocket ; clé en en-tête ou en paramètre (navigateurs)
+    api_key = websocket.headers.get("X-API-Key") or websocket.query_params.get("api_key")
+    try:
+        return await verify_api_key(api_key, db)
+    except HTTPException as e:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+
+
 def generate_api_key():
     return f"goga_{secrets.token_urlsafe(32)}"
\ No newline at end of file
@@ -0,0 +1,97 @@
+import re
+import time
+
+import redis.asyncio as redis
+from prometheus_client import Counter, Gauge, Histogram
+
+# Latences courtes (cache, SQL) comme longues (Sofascore via navigateur)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ================= HTTP =================
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Durée des requêtes HTTP par route",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+HTTP_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements", "Requêtes SQL exécutées par appel HTTP",
+    ["method", "route"], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+HTTP_SQL_DURATION = Histogram(
+    "http_request_sql_duration_seconds", "Temps SQL cumulé par appel HTTP",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+
+# ================= POOL SQL =================
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Attente d'une connexion du pool",
+    ["pool"], buckets=LATENCY_BUCKETS,
+)
+DB_POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connexions empruntées au pool", ["pool"])
+
+# ================= REDIS =================
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds", "Durée des commandes Redis",
+    ["command"], buckets=LATENCY_BUCKETS,
+)
+LIVE_CACHE_LOOKUPS = Counter("live_cache_lookups_total", "Lectures du cache live par résultat", ["result"])
+
+# ================= SOFASCORE =================
+SOFASCORE_REQUEST_DURATION = Histogram(
+    "sofascore_request_duration_seconds", "Durée des appels Sofascore par endpoint",
+    ["endpoint"], buckets=LATENCY_BUCKETS,
+)
+SOFASCORE_REQUEST_ERRORS = Counter(
+    "sofascore_request_errors_total", "Appels Sofascore en échec par endpoint", ["endpoint"]
+)
+SOFASCORE_CIRCUIT_OPENED = Counter(
+    "sofascore_circuit_opened_total", "Ouvertures de disjoncteur Sofascore", ["circuit"]
+)
+SOFASCORE_CIRCUIT_REJECTED = Counter(
+    "sofascore_circuit_rejected_total", "Appels refusés (disjoncteur ouvert ou budget épuisé)", ["endpoint"]
+)
+
+# ================= LIVE TRACKER =================
+LIVE_TRACKER_OWNED_FIXTURES = Gauge("live_tracker_owned_fixtures", "Matchs suivis par cette instance du tracker")
+# Secondes entre un changement côté Sofascore et son passage à chaque étape ; le label
+# fixture est retiré en fin de match (app/services/scraper/live_latency.py)
+LIVE_LAG_SECONDS = Histogram(
+    "live_lag_seconds", "Retard sur Sofascore par étape du pipeline live",
+    ["stage", "fixture"], buckets=(1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300),
+)
+
+# ================= WEBHOOKS =================
+WEBHOOK_DELIVERIES = Counter(
+    "webhook_deliveries_total", "Envois de webhooks par résultat (delivered, retried, dropped)", ["outcome"]
+)
+WEBHOOK_DELIVERY_DURATION = Histogram(
+    "webhook_delivery_duration_seconds", "Durée d'un envoi de webhook", buckets=LATENCY_BUCKETS,
+)
+
+
+def route_label(request) -> str:
+    # Gabarit de la route (/live/match/{fixture_id}) : un identifiant par match ferait exploser les séries
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def endpoint_label(endpoint: str) -> str:
+    # /event/12345/lineups -> /event/{id}/lineups
+    return re.sub(r"/\d+", "/{id}", endpoint.split("?")[0])
+
+
+def record_cache_lookups(hits: int, misses: int):
+    if hits:
+        LIVE_CACHE_LOOKUPS.labels("hit").inc(hits)
+    if misses:
+        LIVE_CACHE_LOOKUPS.labels("miss").inc(misses)
+
+
+class InstrumentedRedis(redis.Redis):
+    # Client Redis dont chaque commande alimente redis_command_duration_seconds
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.labels(str(args[0]).lower()).observe(time.perf_counter() - started)
@@ -0,0 +1,146 @@
+import functools
+import json
+from typing import Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+TRACING_EXPORTERS = ("none", "otlp", "json")
+
+# Sans setup_tracing, le provider par défaut d'OpenTelemetry ne fait rien : spans quasi gratuits
+tracer = trace.get_tracer("gogainde-data")
+
+_traced_engines = set()
+
+
+def span_record(span) -> dict:
+    # Horodatages en nanosecondes : durées exactes pour l'analyse par match
+    parent = span.parent
+    return {
+        "name": span.name,
+        "trace_id": format(span.context.trace_id, "032x"),
+        "span_id": format(span.context.span_id, "016x"),
+        "parent_id": format(parent.span_id, "016x") if parent else None,
+        "start_ns": span.start_time,
+        "end_ns": span.end_time,
+        "status": span.status.status_code.name,
+        "process": span.resource.attributes.get("service.namespace"),
+        "attributes": dict(span.attributes or {}),
+    }
+
+
+class JsonFileSpanExporter(SpanExporter):
+    # Un span JSON par ligne, lisible par benchmarks/trace_report.py
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: Sequence) -> SpanExportResult:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span_record(span), ensure_ascii=False) + "\n")
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def _exporter(kind: str) -> Optional[SpanExporter]:
+    if kind not in TRACING_EXPORTERS:
+        raise ValueError(f"Exporteur de traces inconnu : {kind} (attendu : {', '.join(TRACING_EXPORTERS)})")
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    if kind == "json":
+        return JsonFileSpanExporter(settings.TRACING_JSON_PATH)
+    return None
+
+
+def setup_tracing(process: str, exporter: Optional[SpanExporter] = None) -> Optional[TracerProvider]:
+    # Un provider par processus (api, ingestion, live_tracker), selon TRACING_EXPORTER
+    exporter = exporter or _exporter(settings.TRACING_EXPORTER)
+    if exporter is None:
+        return None
+
+    provider = TracerProvider(resource=Resource.create({
+        "service.name": settings.APP_NAME,
+        "service.namespace": process,
+        "service.version": settings.APP_VERSION,
+    }))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+def shutdown_tracing():
+    # Vide les spans en attente (fin de pipeline)
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, TracerProvider):
+        provider.shutdown()
+
+
+def traced(name: Optional[str] = None):
+    # Span autour d'une coroutine : @traced() ou @traced("sofascore.lineups")
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def fixture_span(event_id: int):
+    # Racine de l'analyse par match (chemin critique HTTP / SQL / Python)
+    return tracer.start_as_current_span("fixture", attributes={"sofascore.event_id": event_id})
+
+
+# ================= SQL =================
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None:
+        return
+    span = tracer.start_span(statement.split(None, 1)[0].upper() if statement else "SQL", kind=SpanKind.CLIENT)
+    if span.is_recording():
+        span.set_attribute("db.system", "postgresql")
+        span.set_attribute("db.statement", statement)
+    context._otel_span = span
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_otel_span", None)
+    if span is not None:
+        span.end()
+        context._otel_span = None
+
+
+def _handle_error(exception_context):
+    span = getattr(exception_context.execution_context, "_otel_span", None)
+    if span is not None:
+        span.set_status(Status(StatusCode.ERROR, str(exception_context.original_exception)))
+        span.end()
+        exception_context.execution_context._otel_span = None
+
+
+def install_sql_tracing(engine):
+    # Un span par requête SQL, enfant du span courant (service d'ingestion, route...)
+    sync_engine: Engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    if id(sync_engine) in _traced_engines:
+        return
+
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    _traced_engines.add(id(sync_engine))
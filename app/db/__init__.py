@@ -1,3 +1,7 @@
-from .database import engine, AsyncSessionLocal, get_db
+from .database import (
+    engine, replica_engine, AsyncSessionLocal, ReplicaSessionLocal, get_db, get_primary_db
+)
 
-__all__ = ['engine', 'AsyncSessionLocal', 'get_db']
+__all__ = [
+    'engine', 'replica_engine', 'AsyncSessionLocal', 'ReplicaSessionLocal', 'get_db', 'get_primary_db'
+]
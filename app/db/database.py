@@ -1,25 +1,118 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import time
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from app.core.config import settings
+from app.db.instrumentation import TimedQueuePool, install_pool_metrics
 
-# Créer l'engine asynchrone
-engine = create_async_engine(
-    settings.DATABASE_URL, 
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+# Profils de connexion : un pool dimensionné pour la concurrence de chaque type de processus
+ENGINE_PROFILES = ("api", "api_replica", "ingestion", "live_tracker")
+
+
+def engine_options(profile: str) -> dict:
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Profil de base inconnu : {profile} (attendu : {', '.join(ENGINE_PROFILES)})")
+
+    prefix = f"DB_{profile.upper()}_"
+    return {
+        "echo": settings.DEBUG,
+        "pool_pre_ping": True,
+        "pool_size": getattr(settings, f"{prefix}POOL_SIZE"),
+        "max_overflow": getattr(settings, f"{prefix}MAX_OVERFLOW"),
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+        "connect_args": {
+            "prepared_statement_cache_size": getattr(settings, f"{prefix}PREPARED_STATEMENT_CACHE_SIZE"),
+            # Appliqués par le serveur à chaque connexion du pool
+            "server_settings": {
+                "application_name": f"{settings.APP_NAME}-{profile}",
+                "statement_timeout": str(getattr(settings, f"{prefix}STATEMENT_TIMEOUT_MS")),
+                "idle_in_transaction_session_timeout": str(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS),
+            },
+        },
+    }
+
+
+def create_engine_for(profile: str, url: Optional[str] = None) -> AsyncEngine:
+    options = engine_options(profile)
+    if settings.METRICS_ENABLED:
+        # Attente de checkout et connexions empruntées, par profil (voir app/core/metrics.py)
+        options.update(poolclass=TimedQueuePool, pool_logging_name=profile)
+
+    engine = create_async_engine(url or settings.DATABASE_URL, **options)
+    if settings.METRICS_ENABLED:
+        install_pool_metrics(engine, profile)
+    return engine
+
+
+# Base principale, profil du processus (DB_PROFILE)
+engine = create_engine_for(settings.DB_PROFILE)
 
 # Créer la session factory
 AsyncSessionLocal = async_sessionmaker(
-    engine, 
-    expire_on_commit=False, 
+    engine,
+    expire_on_commit=False,
     class_=AsyncSession
 )
 
+# Réplique en lecture : pool séparé, repli sur la principale si non configurée
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine_for("api_replica", settings.DATABASE_REPLICA_URL)
+    ReplicaSessionLocal = async_sessionmaker(
+        replica_engine,
+        expire_on_commit=False,
+        class_=AsyncSession
+    )
+else:
+    replica_engine = engine
+    ReplicaSessionLocal = AsyncSessionLocal
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Posé après une requête d'écriture : timestamp jusqu'auquel le client lit sur la principale
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+
+
+class SessionRouter:
+
+    def __init__(self, primary, replica, sticky_seconds: int = 0):
+        self.primary = primary
+        self.replica = replica
+        self.sticky_seconds = sticky_seconds
+
+    def is_sticky(self, request: Request) -> bool:
+        # Lire ses propres écritures : la réplique peut avoir du retard
+        if not self.sticky_seconds:
+            return False
+        try:
+            return float(request.cookies.get(PRIMARY_STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def sessionmaker_for(self, request: Request):
+        if self.replica is self.primary or request.method not in READ_METHODS:
+            return self.primary
+        if self.is_sticky(request):
+            return self.primary
+        return self.replica
+
+
+session_router = SessionRouter(
+    AsyncSessionLocal, ReplicaSessionLocal, settings.DB_READ_YOUR_WRITES_SECONDS
+)
+
+
+async def get_db(request: Request):
+    # GET -> réplique, sinon principale (voir SessionRouter)
+    async with session_router.sessionmaker_for(request)() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
 
-async def get_db():
-  
+async def get_primary_db():
+    # Routes qui écrivent quelle que soit la méthode (auth, administration)
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -1,6 +1,15 @@
-from app.db.session import engine
-from app.db.models import Base
+from pathlib import Path
 
-async def init_db():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+from alembic import command
+from alembic.config import Config
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def init_db(revision: str = "head"):
+    # Schéma géré par Alembic : applique les migrations en attente, sans perte de données
+    command.upgrade(Config(str(ALEMBIC_INI)), revision)
+
+
+if __name__ == "__main__":
+    init_db()
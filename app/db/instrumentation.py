@@ -0,0 +1,101 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT, DB_POOL_IN_USE
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: List[str] = []
+        self.parameters: List = []
+
+    def record(self, statement: str, parameters=None):
+        self.count += 1
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+
+# Compteurs actifs pour la requête / le bloc en cours, imbriqués (vide = pas de comptage)
+_current_counters: ContextVar[Tuple[QueryCounter, ...]] = ContextVar("query_counters", default=())
+
+_instrumented_engines = set()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counters = _current_counters.get()
+    if not counters:
+        return
+    for counter in counters:
+        counter.record(statement, parameters)
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    for counter in _current_counters.get():
+        counter.duration += elapsed
+
+
+def install_query_counter(engine):
+    # Accepte un engine sync ou async ; l'écouteur n'est posé qu'une fois
+    sync_engine: Engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    if id(sync_engine) in _instrumented_engines:
+        return
+
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    _instrumented_engines.add(id(sync_engine))
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    # Mesure l'attente d'une connexion libre (pool saturé) ; le nom du pool est le profil
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.logging_name or "default").observe(time.perf_counter() - started)
+
+
+def install_pool_metrics(engine: AsyncEngine, profile: str):
+    # Connexions empruntées, lues au moment du scrape
+    DB_POOL_IN_USE.labels(profile).set_function(engine.sync_engine.pool.checkedout)
+
+
+@contextmanager
+def count_queries():
+    # Un bloc imbriqué (test dans une requête instrumentée) compte aussi pour les blocs englobants
+    counter = QueryCounter()
+    token = _current_counters.set(_current_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _current_counters.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    with count_queries() as counter:
+        yield counter
+
+    if counter.count > max_queries:
+        statements = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(counter.statements))
+        raise AssertionError(
+            f"{counter.count} requêtes SQL exécutées (maximum {max_queries}):\n{statements}"
+        )
@@ -1,16 +1,13 @@
 
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Float, Text, Enum,
-    UniqueConstraint
+    Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Float, Text, Enum, LargeBinary, JSON,
+    UniqueConstraint, ForeignKeyConstraint, Index, func, select, text
 )
 from sqlalchemy.orm import relationship
 # from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine
 import enum
-import asyncio
 
-from app.core.config import settings
 
 Base = declarative_base()
 
@@ -63,7 +60,7 @@ class League(Base):
     logo_url = Column(String(500))
 
     created_at = Column(DateTime, server_default="now()")
-    updated_at = Column(DateTime, onupdate="now()")
+    updated_at = Column(DateTime, onupdate=func.now())
 
     seasons = relationship("Season", back_populates="league")
     fixtures = relationship("Fixture", back_populates="league")
@@ -105,7 +102,7 @@ class Team(Base):
     secondary_color = Column(String(7))
 
     created_at = Column(DateTime, server_default="now()")
-    updated_at = Column(DateTime, onupdate="now()")
+    updated_at = Column(DateTime, onupdate=func.now())
 
     home_fixtures = relationship("Fixture", foreign_keys="Fixture.home_team_id", back_populates="home_team")
     away_fixtures = relationship("Fixture", foreign_keys="Fixture.away_team_id", back_populates="away_team")
@@ -132,7 +129,7 @@ class Manager(Base):
     photo_url = Column(String(500))
     
     created_at = Column(DateTime, server_default="now()")
-    updated_at = Column(DateTime, onupdate="now()")
+    updated_at = Column(DateTime, onupdate=func.now())
     
     team_managers = relationship("TeamManager", back_populates="manager")
 
@@ -182,7 +179,7 @@ class Player(Base):
     photo_url = Column(String(500))
 
     created_at = Column(DateTime, server_default="now()")
-    updated_at = Column(DateTime, onupdate="now()")
+    updated_at = Column(DateTime, onupdate=func.now())
 
     team = relationship("Team", back_populates="players")
     statistics = relationship("PlayerStatistics", back_populates="player")
@@ -194,14 +191,16 @@ class Player(Base):
 class Fixture(Base):
     __tablename__ = "fixtures"
 
-    id = Column(Integer, primary_key=True)
-    sofascore_id = Column(Integer, unique=True, nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sofascore_id = Column(Integer, nullable=False)
 
-    league_id = Column(Integer, ForeignKey("leagues.id"), nullable=False, index=True)
-    season_id = Column(Integer, ForeignKey("seasons.id"), nullable=False, index=True)
+    # Index simples remplacés par les index composites (..., date) ci-dessous
+    league_id = Column(Integer, ForeignKey("leagues.id"), nullable=False)
+    # Clé de partition (LIST, une partition par saison, voir app/db/partitions.py)
+    season_id = Column(Integer, ForeignKey("seasons.id"), primary_key=True)
 
-    home_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
-    away_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
+    home_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    away_team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
 
     date = Column(DateTime, nullable=False, index=True)
     timestamp = Column(Integer)
@@ -211,7 +210,7 @@ class Fixture(Base):
     group_name = Column(String(100)) 
     group_sign = Column(String(10))
 
-    status = Column(Enum(MatchStatus), default=MatchStatus.NOT_STARTED, index=True)
+    status = Column(Enum(MatchStatus), default=MatchStatus.NOT_STARTED)
     status_long = Column(String(50))
     elapsed = Column(Integer)
 
@@ -230,7 +229,22 @@ class Fixture(Base):
     has_events = Column(Boolean, default=False)
 
     created_at = Column(DateTime, server_default="now()")
-    updated_at = Column(DateTime, onupdate="now()")
+    updated_at = Column(DateTime, onupdate=func.now())
+
+    # Filtres de get_fixtures, toujours triés par date
+    __table_args__ = (
+        Index("ix_fixtures_league_date", "league_id", "date"),
+        Index("ix_fixtures_season_date", "season_id", "date"),
+        Index("ix_fixtures_home_team_date", "home_team_id", "date"),
+        Index("ix_fixtures_away_team_date", "away_team_id", "date"),
+        Index("ix_fixtures_status_date", "status", "date"),
+        Index("ix_fixtures_live_date", "date", postgresql_where=text("is_live")),
+        # Toute contrainte d'unicité d'une table partitionnée inclut la clé de partition
+        UniqueConstraint("sofascore_id", "season_id", name="uq_fixtures_sofascore_season"),
+        {"postgresql_partition_by": "LIST (season_id)"},
+    )
+    # Identité ORM : l'id seul (la clé primaire SQL est (id, season_id))
+    __mapper_args__ = {"primary_key": [id]}
 
     league = relationship("League", back_populates="fixtures")
     season = relationship("Season", back_populates="fixtures")
@@ -241,15 +255,32 @@ class Fixture(Base):
     match_statistics = relationship("MatchStatistics", back_populates="fixture")
 
 
+def _fixture_season_id(context):
+    # Garde-fou : les services d'ingestion passent season_id (celui du match) ;
+    # sinon une requête par ligne insérée pour le retrouver
+    fixture_id = context.get_current_parameters()["fixture_id"]
+    return context.connection.execute(
+        select(Fixture.__table__.c.season_id).where(Fixture.__table__.c.id == fixture_id)
+    ).scalar_one()
+
+
+def _fixture_foreign_key(table_name: str) -> ForeignKeyConstraint:
+    return ForeignKeyConstraint(
+        ["fixture_id", "season_id"], ["fixtures.id", "fixtures.season_id"],
+        name=f"{table_name}_fixture_id_fkey"
+    )
+
+
 # ================= EVENTS =================
 class MatchEvent(Base):
     __tablename__ = "match_events"
 
-    id = Column(Integer, primary_key=True)
-    sofascore_id = Column(Integer, unique=True, index=True)
-    fixture_id = Column(Integer, ForeignKey("fixtures.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sofascore_id = Column(Integer)
+    fixture_id = Column(Integer, nullable=False)
+    season_id = Column(Integer, primary_key=True, default=_fixture_season_id)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
-    player_id = Column(Integer, ForeignKey("players.id"), nullable=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=True)
     assist_player_id = Column(Integer, ForeignKey("players.id"), nullable=True, index=True)
     player_out_id = Column(Integer, ForeignKey("players.id"), nullable=True)
 
@@ -265,7 +296,17 @@ class MatchEvent(Base):
     comments = Column(Text)
     
     created_at = Column(DateTime, server_default="now()")
-    updated_at = Column(DateTime, onupdate="now()")
+    updated_at = Column(DateTime, onupdate=func.now())
+
+    # Agrégations par (match, type) et (joueur, type)
+    __table_args__ = (
+        _fixture_foreign_key("match_events"),
+        Index("ix_match_events_fixture_type", "fixture_id", "type"),
+        Index("ix_match_events_player_type", "player_id", "type"),
+        UniqueConstraint("sofascore_id", "season_id", name="uq_match_events_sofascore_season"),
+        {"postgresql_partition_by": "LIST (season_id)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
 
     fixture = relationship("Fixture", back_populates="events")
     player = relationship("Player", foreign_keys=[player_id], back_populates="events")
@@ -278,8 +319,9 @@ class MatchEvent(Base):
 class Lineup(Base):
     __tablename__ = "lineups"
 
-    id = Column(Integer, primary_key=True)
-    fixture_id = Column(Integer, ForeignKey("fixtures.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    fixture_id = Column(Integer, nullable=False, index=True)
+    season_id = Column(Integer, primary_key=True, default=_fixture_season_id)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
     player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
 
@@ -293,8 +335,11 @@ class Lineup(Base):
     substitute = Column(Boolean, default=False)
 
     __table_args__ = (
-        UniqueConstraint('fixture_id', 'team_id', 'player_id', name='uq_lineup_fixture_team_player'),
+        _fixture_foreign_key("lineups"),
+        UniqueConstraint('fixture_id', 'team_id', 'player_id', 'season_id', name='uq_lineup_fixture_team_player'),
+        {"postgresql_partition_by": "LIST (season_id)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
     fixture = relationship("Fixture", back_populates="lineups")
     team = relationship("Team")
@@ -305,8 +350,9 @@ class Lineup(Base):
 class MatchStatistics(Base):
     __tablename__ = "match_statistics"
 
-    id = Column(Integer, primary_key=True)
-    fixture_id = Column(Integer, ForeignKey("fixtures.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    fixture_id = Column(Integer, nullable=False, index=True)
+    season_id = Column(Integer, primary_key=True, default=_fixture_season_id)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
 
     shots_on_goal = Column(Integer)
@@ -344,15 +390,37 @@ class MatchStatistics(Base):
     tackles_lost = Column(Float)
     
     created_at = Column(DateTime, server_default="now()")
-    updated_at = Column(DateTime, onupdate="now()")
+    updated_at = Column(DateTime, onupdate=func.now())
 
     __table_args__ = (
-        UniqueConstraint('fixture_id', 'team_id', name='uq_match_stats_fixture_team'),
+        _fixture_foreign_key("match_statistics"),
+        UniqueConstraint('fixture_id', 'team_id', 'season_id', name='uq_match_stats_fixture_team'),
+        {"postgresql_partition_by": "LIST (season_id)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
     fixture = relationship("Fixture", back_populates="match_statistics")
     team = relationship("Team", back_populates="match_statistics")
 
+class MatchStatTimeline(Base):
+    __tablename__ = "match_stat_timelines"
+
+    # Évolution d'une stat pendant le match, copiée depuis Redis au coup de sifflet final
+    # (format : app/services/scraper/stat_timeline.py). Pas de FK : fixtures est partitionnée.
+    id = Column(Integer, primary_key=True)
+    fixture_id = Column(Integer, nullable=False, index=True)
+    sofascore_id = Column(Integer, nullable=False)
+    stat_key = Column(String(100), nullable=False)
+    samples = Column(LargeBinary, nullable=False)
+    sample_count = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime, server_default="now()")
+
+    __table_args__ = (
+        UniqueConstraint('sofascore_id', 'stat_key', name='uq_match_stat_timeline'),
+    )
+
+
 class PlayerStatistics(Base):
     __tablename__ = "player_statistics"
 
@@ -433,7 +501,7 @@ class PlayerStatistics(Base):
     own_goals = Column(Integer)
     
     created_at = Column(DateTime, server_default="now()")
-    updated_at = Column(DateTime, onupdate="now()")
+    updated_at = Column(DateTime, onupdate=func.now())
 
     __table_args__ = (
         UniqueConstraint('player_id', 'season_id', 'league_id', name='uq_player_stats_season_league'),
@@ -534,7 +602,7 @@ class TeamStatistics(Base):
     avg_rating = Column(Float)
     
     created_at = Column(DateTime, server_default="now()")
-    updated_at = Column(DateTime, onupdate="now()")
+    updated_at = Column(DateTime, onupdate=func.now())
 
     __table_args__ = (
         UniqueConstraint('team_id', 'season_id', 'league_id', name='uq_team_stats_season_league'),
@@ -544,12 +612,53 @@ class TeamStatistics(Base):
     season = relationship("Season")
     league = relationship("League")
 
+class PlayerSeasonAggregate(Base):
+    __tablename__ = "player_season_aggregates"
+
+    # Agrégats calculés depuis lineups et match_events (maintenus à l'ingestion)
+    id = Column(Integer, primary_key=True)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
+    season_id = Column(Integer, ForeignKey("seasons.id"), nullable=False)
+    league_id = Column(Integer, ForeignKey("leagues.id"), nullable=False, index=True)
+
+    appearances = Column(Integer, nullable=False, default=0)
+    starts = Column(Integer, nullable=False, default=0)
+    minutes_played = Column(Integer, nullable=False, default=0)
+
+    goals = Column(Integer, nullable=False, default=0)
+    assists = Column(Integer, nullable=False, default=0)
+    yellow_cards = Column(Integer, nullable=False, default=0)
+    red_cards = Column(Integer, nullable=False, default=0)
+
+    rated_matches = Column(Integer, nullable=False, default=0)
+    average_rating = Column(Float)
+
+    updated_at = Column(DateTime, server_default="now()", onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('player_id', 'season_id', name='uq_player_season_aggregate'),
+    )
+
+    player = relationship("Player")
+    season = relationship("Season")
+    league = relationship("League")
+
+
+# Classements buteurs : lecture directe par saison, triée par buts
+Index(
+    "ix_player_season_aggregates_season_goals",
+    PlayerSeasonAggregate.season_id,
+    PlayerSeasonAggregate.goals.desc(),
+)
+
+
 # ================= STANDINGS =================
 class Standing(Base):
     __tablename__ = "standings"
 
     id = Column(Integer, primary_key=True)
-    sofascore_id = Column(Integer, unique=True, nullable=False, index=True)
+    # NULL pour les lignes calculées par le moteur de classement (app/services/standings_engine.py)
+    sofascore_id = Column(Integer, unique=True, nullable=True, index=True)
     season_id = Column(Integer, ForeignKey("seasons.id"), nullable=False, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
 
@@ -565,7 +674,7 @@ class Standing(Base):
     points = Column(Integer)
 
     created_at = Column(DateTime, server_default="now()")
-    updated_at = Column(DateTime, onupdate="now()")
+    updated_at = Column(DateTime, onupdate=func.now())
 
     __table_args__ = (
         UniqueConstraint('season_id', 'team_id', 'group', name='uq_standing_season_team_group'),
@@ -595,17 +704,28 @@ class APIKey(Base):
     
     owner_email = Column(String(255))
 
-# ================= CREATE SCHEMA =================
-async def create_schema():
-    engine = create_async_engine(settings.DATABASE_URL, echo=True)
-    
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
-    
-    await engine.dispose()
-    print("Database schema created successfully!")
 
+# ================= WEBHOOKS =================
+class WebhookSubscription(Base):
+    __tablename__ = "webhook_subscriptions"
+
+    # Événements live poussés à l'URL d'un partenaire (app/services/scraper/webhooks.py).
+    # Filtres : identifiants Sofascore des équipes / matchs, types d'événement ; NULL = tous
+    id = Column(Integer, primary_key=True)
+    api_key_id = Column(Integer, ForeignKey("api_keys.id"), nullable=False, index=True)
+    url = Column(String(500), nullable=False)
+    secret = Column(String(100), nullable=False)
+
+    team_ids = Column(JSON, nullable=True)
+    fixture_ids = Column(JSON, nullable=True)
+    event_types = Column(JSON, nullable=True)
+    max_concurrency = Column(Integer, default=2)
+
+    is_active = Column(Boolean, default=True)
+    failure_count = Column(Integer, default=0)
+    last_failure_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, server_default="now()")
 
-if __name__ == "__main__":
-    asyncio.run(create_schema())
\ No newline at end of file
+    api_key = relationship("APIKey")
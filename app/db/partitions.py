@@ -0,0 +1,85 @@
+import asyncio
+
+from sqlalchemy import text, select
+
+from app.db.database import engine
+from app.db.models import Season
+
+# Tables partitionnées par LIST (season_id) ; fixtures d'abord (référencée par les autres)
+PARTITIONED_TABLES = ["fixtures", "match_events", "lineups", "match_statistics"]
+
+# Attente maximale des verrous : la création ne doit jamais bloquer l'API ni l'ingestion
+PARTITION_LOCK_TIMEOUT = "5s"
+
+
+def partition_name(table: str, season_id: int) -> str:
+    return f"{table}_season_{season_id}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+async def ensure_season_partitions(season_id: int) -> bool:
+    # Connexion dédiée en autocommit : les verrous de l'ALTER TABLE ne sont pas
+    # conservés jusqu'à la fin d'une longue transaction d'ingestion
+    created = False
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"SET lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+
+        for table in PARTITIONED_TABLES:
+            name = partition_name(table, season_id)
+
+            exists = await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+            if exists:
+                continue
+
+            # Lignes déjà tombées dans la partition par défaut : à déplacer manuellement
+            pending = await conn.scalar(text(
+                f"SELECT EXISTS (SELECT 1 FROM {default_partition_name(table)} WHERE season_id = :season_id)"
+            ), {"season_id": season_id})
+            if pending:
+                print(f"Partition {name} non créée : {default_partition_name(table)} contient déjà la saison {season_id}")
+                return created
+
+            try:
+                await conn.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES IN ({int(season_id)})"
+                ))
+                created = True
+            except Exception as e:
+                # Verrou indisponible : les lignes iront dans la partition par défaut
+                print(f"Partition {name} non créée : {str(e)}")
+                return created
+
+    return created
+
+
+async def ensure_all_season_partitions():
+    async with engine.connect() as conn:
+        season_ids = (await conn.execute(select(Season.id).order_by(Season.id))).scalars().all()
+
+    for season_id in season_ids:
+        if await ensure_season_partitions(season_id):
+            print(f"Partitions créées pour la saison {season_id}")
+
+    await engine.dispose()
+
+
+async def drop_season_partitions(season_id: int):
+    # Tables filles d'abord ; une partition de fixtures référencée doit être
+    # détachée (plus aucune ligne fille) avant d'être supprimée
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in reversed(PARTITIONED_TABLES):
+            name = partition_name(table, season_id)
+            if not await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}):
+                continue
+            await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            await conn.execute(text(f"DROP TABLE {name}"))
+
+
+if __name__ == "__main__":
+    asyncio.run(ensure_all_season_partitions())
@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+import os
+
+os.environ.setdefault("DB_PROFILE", "live_tracker")
+
+from app.core.tracing import setup_tracing, shutdown_tracing, install_sql_tracing
+from app.db.database import engine
+from app.services.scraper.live_events import MatchPersister
+from app.services.scraper.live_service import LiveMatchService
+from app.services.scraper.webhooks import WebhookDispatcher
+
+# Groupes de consommateurs du journal live:events lançables à part (un processus par instance)
+CONSUMERS = {
+    "persister": MatchPersister,
+    "webhooks": WebhookDispatcher,
+}
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consommateur du journal des événements live")
+    parser.add_argument("group", choices=sorted(CONSUMERS))
+    parser.add_argument("--consumer", help="Nom du consommateur dans le groupe (défaut : hôte:pid)")
+    args = parser.parse_args(argv)
+
+    service = LiveMatchService()
+    if setup_tracing(f"live_{args.group}"):
+        install_sql_tracing(engine)
+    try:
+        await CONSUMERS[args.group](service, consumer=args.consumer).run()
+    finally:
+        await service.close()
+        shutdown_tracing()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,17 +1,43 @@
 import asyncio
+import os
+
+# Avant tout import de app.db : l'engine est créé à l'import
+os.environ.setdefault("DB_PROFILE", "live_tracker")
+
+from prometheus_client import start_http_server
+
+from app.core.config import settings
+from app.core.tracing import setup_tracing, shutdown_tracing, install_sql_tracing
+from app.db.database import engine
+from app.services.scraper.live_events import MatchPersister
 from app.services.scraper.live_service import LiveMatchService
 
 
 async def main():
     service = LiveMatchService()
+
+    # Pas d'API dans ce processus : métriques (Sofascore, Redis, pool) sur un port dédié
+    if settings.METRICS_ENABLED and settings.LIVE_TRACKER_METRICS_PORT:
+        start_http_server(settings.LIVE_TRACKER_METRICS_PORT)
+        print(f"Métriques sur :{settings.LIVE_TRACKER_METRICS_PORT}/metrics")
+    if setup_tracing("live_tracker"):
+        install_sql_tracing(engine)
     
+    # Persistance des événements dans le même processus, sauf si lancée à part (app.live_consumers)
+    persister = None
+    if settings.LIVE_TRACKER_RUN_PERSISTER:
+        persister = asyncio.create_task(MatchPersister(service).run())
+
     try:
         print("Live Tracker démarré...")
         await service.run_live_tracker()
     except KeyboardInterrupt:
         print("Arrêt du tracker...")
     finally:
+        if persister:
+            persister.cancel()
         await service.close()
+        shutdown_tracing()
 
 
 if __name__ == "__main__":
@@ -1,15 +1,23 @@
 from fastapi import FastAPI, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 import time
 
+from opentelemetry.propagate import extract
+from opentelemetry.trace import SpanKind
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
 from app.core.config import settings
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_SQL_STATEMENTS, HTTP_SQL_DURATION, route_label
+from app.core.tracing import setup_tracing, install_sql_tracing, tracer
+from app.db.database import engine, replica_engine, READ_METHODS, PRIMARY_STICKY_COOKIE
+from app.db.instrumentation import install_query_counter, count_queries
 from app.api import (leagues, teams, fixtures, players, standings,
                      events, statistics, lineups, managers, seasons, live_routes
 )
-from app.api import api_keys_routes
-from app.auth import verify_api_key
+from app.api import api_keys_routes, webhooks
+from app.auth import verify_api_key, verify_websocket_api_key
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -46,6 +54,88 @@ async def add_process_time_header(request: Request, call_next):
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
+
+# Mode instrumentation : compte les requêtes SQL exécutées par appel HTTP
+if settings.QUERY_COUNT_ENABLED:
+    install_query_counter(engine)
+    install_query_counter(replica_engine)
+
+    @app.middleware("http")
+    async def add_query_count_header(request: Request, call_next):
+        with count_queries() as counter:
+            response = await call_next(request)
+        response.headers["X-Query-Count"] = str(counter.count)
+        if counter.count > settings.QUERY_COUNT_THRESHOLD:
+            print(
+                f"[query-count] {request.method} {request.url.path}: "
+                f"{counter.count} requêtes SQL (seuil {settings.QUERY_COUNT_THRESHOLD})"
+            )
+        return response
+
+# Métriques Prometheus par route : latence, nombre et temps des requêtes SQL
+if settings.METRICS_ENABLED:
+    install_query_counter(engine)
+    install_query_counter(replica_engine)
+
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        status = 500
+        start_time = time.perf_counter()
+        with count_queries() as counter:
+            try:
+                response = await call_next(request)
+                status = response.status_code
+                return response
+            finally:
+                # La route n'est connue qu'après le routage
+                route = route_label(request)
+                HTTP_REQUEST_DURATION.labels(request.method, route, status).observe(
+                    time.perf_counter() - start_time
+                )
+                HTTP_SQL_STATEMENTS.labels(request.method, route).observe(counter.count)
+                HTTP_SQL_DURATION.labels(request.method, route).observe(counter.duration)
+
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics(request: Request, admin_secret: str = None):
+        # Réservé au scraper : secret admin en bearer (authorization Prometheus) ou en paramètre
+        bearer = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        api_keys_routes.verify_admin(admin_secret or bearer)
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+# Traces OpenTelemetry (TRACING_EXPORTER) : un span serveur par requête, requêtes SQL en enfants
+if setup_tracing("api"):
+    install_sql_tracing(engine)
+    install_sql_tracing(replica_engine)
+
+    @app.middleware("http")
+    async def trace_request(request: Request, call_next):
+        # traceparent entrant (proxy, autre service) respecté
+        with tracer.start_as_current_span(
+            request.method, context=extract(request.headers), kind=SpanKind.SERVER
+        ) as span:
+            response = await call_next(request)
+            route = route_label(request)
+            span.update_name(f"{request.method} {route}")
+            span.set_attribute("http.route", route)
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+# Lecture de ses propres écritures : après une écriture, les GET du client
+# restent sur la base principale pendant DB_READ_YOUR_WRITES_SECONDS
+if settings.DB_READ_YOUR_WRITES_SECONDS:
+
+    @app.middleware("http")
+    async def stick_to_primary_after_write(request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in READ_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PRIMARY_STICKY_COOKIE,
+                str(time.time() + settings.DB_READ_YOUR_WRITES_SECONDS),
+                max_age=settings.DB_READ_YOUR_WRITES_SECONDS,
+                httponly=True
+            )
+        return response
+
 # Gestionnaire d'erreurs global
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -101,6 +191,8 @@ app.include_router(standings.router, dependencies=[Depends(verify_api_key)])
 app.include_router(events.router, dependencies=[Depends(verify_api_key)])
 app.include_router(statistics.router, dependencies=[Depends(verify_api_key)])
 app.include_router(live_routes.router, dependencies=[Depends(verify_api_key)])
+app.include_router(live_routes.ws_router, dependencies=[Depends(verify_websocket_api_key)])
+app.include_router(webhooks.router, dependencies=[Depends(verify_api_key)])
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,420 @@
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Enum, Float, Integer, select, text
+
+from app.db.database import AsyncSessionLocal
+from app.db.models import (
+    League, Season, Team, Player, Fixture, Lineup, MatchEvent, MatchStatistics, TournamentType
+)
+from app.db.partitions import ensure_season_partitions
+from app.services.player_aggregate_service import rebuild_player_season_aggregates
+from app.services.scraper.fixture_service import event_fixture_values, cup_tree_fixture_values
+from app.services.scraper.lineup_service import lineup_player_values, lineup_values
+from app.services.scraper.match_event_service import match_incidents, incident_values, incident_players
+from app.services.scraper.statistics_service import match_statistics_values
+from app.services.scraper.team_service import team_values, is_placeholder_team
+from app.services.standings_engine import recompute_standings
+
+
+# ================= STAGING =================
+# Par table : (modèle, colonnes recopiées telles quelles, clés Sofascore résolues au merge)
+STAGING = {
+    "leagues": (League, ["sofascore_id", "name", "slug", "type", "country"], []),
+    "seasons": (Season, ["sofascore_id", "year", "name"], ["league_sofascore_id"]),
+    "teams": (Team, [
+        "sofascore_id", "name", "slug", "short_name", "code", "country", "national",
+        "primary_color", "secondary_color",
+    ], []),
+    "players": (Player, [
+        "sofascore_id", "name", "slug", "short_name", "first_name", "last_name",
+        "position", "jersey_number", "height",
+    ], ["team_sofascore_id"]),
+    "fixtures": (Fixture, [
+        "sofascore_id", "date", "timestamp", "round", "round_name", "group_name", "group_sign",
+        "status", "home_score", "away_score", "home_score_period1", "home_score_period2",
+        "home_score_normaltime", "away_score_period1", "away_score_period2", "away_score_normaltime",
+    ], ["league_sofascore_id", "season_sofascore_id", "home_team_sofascore_id", "away_team_sofascore_id"]),
+    "lineups": (Lineup, [
+        "formation", "position", "starter", "rating", "minutes_played", "captain", "substitute",
+    ], ["fixture_sofascore_id", "team_sofascore_id", "player_sofascore_id"]),
+    "match_events": (MatchEvent, [
+        "sofascore_id", "type", "minute", "extra_minute", "is_home", "home_score", "away_score",
+        "incident_class", "reason", "detail", "comments",
+    ], ["fixture_sofascore_id", "player_sofascore_id", "assist_sofascore_id", "player_out_sofascore_id"]),
+    "match_statistics": (MatchStatistics, [
+        column.name for column in MatchStatistics.__table__.columns
+        if column.name not in ("id", "fixture_id", "season_id", "team_id", "created_at", "updated_at")
+    ], ["fixture_sofascore_id", "is_home"]),
+}
+
+# Tables de référence (phase 1) puis tables de matchs (phase 2, après création des partitions)
+REFERENCE_TABLES = ["leagues", "seasons", "teams", "players"]
+MATCH_TABLES = ["fixtures", "lineups", "match_events", "match_statistics"]
+
+_KEY_COLUMN_TYPES = {"is_home": ("boolean", bool)}
+
+
+def _staging_columns(table: str):
+    # (nom, type SQL, conversion Python) ; les enums sont chargés par nom puis castés au merge
+    model, columns, keys = STAGING[table]
+    staged = []
+    for name in keys:
+        sql_type, convert = _KEY_COLUMN_TYPES.get(name, ("integer", int))
+        staged.append((name, sql_type, convert))
+    for name in columns:
+        column_type = model.__table__.c[name].type
+        if isinstance(column_type, Enum):
+            staged.append((name, "text", lambda value: value.name))
+        elif isinstance(column_type, BigInteger):
+            staged.append((name, "bigint", int))
+        elif isinstance(column_type, Integer):
+            staged.append((name, "integer", int))
+        elif isinstance(column_type, Float):
+            staged.append((name, "double precision", float))
+        elif isinstance(column_type, Boolean):
+            staged.append((name, "boolean", bool))
+        elif isinstance(column_type, DateTime):
+            staged.append((name, "timestamp", lambda value: value))
+        else:
+            staged.append((name, "text", str))
+    return staged
+
+
+class StagedBatch:
+    # Lignes dédoublonnées par clé naturelle, converties au type des colonnes de staging
+
+    def __init__(self):
+        self.rows: Dict[str, Dict] = {table: {} for table in STAGING}
+        self._columns = {table: _staging_columns(table) for table in STAGING}
+
+    def add(self, table: str, key, values: Dict):
+        if key in self.rows[table]:
+            return
+        self.rows[table][key] = tuple(
+            None if values.get(name) is None else convert(values[name])
+            for name, _, convert in self._columns[table]
+        )
+
+    def records(self, table: str) -> List[tuple]:
+        return list(self.rows[table].values())
+
+    def columns(self, table: str) -> List[str]:
+        return [name for name, _, _ in self._columns[table]]
+
+    def ddl(self, table: str) -> str:
+        columns = ", ".join(f"{name} {sql_type}" for name, sql_type, _ in self._columns[table])
+        return f"CREATE TEMP TABLE stg_{table} ({columns}) ON COMMIT DROP"
+
+    def count(self) -> int:
+        return sum(len(rows) for rows in self.rows.values())
+
+
+# ================= JSON SOFASCORE -> STAGING =================
+def _stage_team(batch: StagedBatch, team_data) -> bool:
+    if is_placeholder_team(team_data):
+        return False
+    batch.add("teams", team_data["id"], team_values(team_data))
+    return True
+
+
+def stage_events(batch: StagedBatch, events: Iterable[Dict], league_type: TournamentType = TournamentType.AFCON):
+    for event in events:
+        unique_tournament = event["tournament"]["uniqueTournament"]
+        league_id = unique_tournament["id"]
+        season_id = event["season"]["id"]
+
+        batch.add("leagues", league_id, {
+            "sofascore_id": league_id,
+            "name": unique_tournament["name"],
+            "slug": unique_tournament["slug"],
+            "type": league_type,
+            "country": unique_tournament["category"]["name"],
+        })
+        batch.add("seasons", season_id, {
+            "sofascore_id": season_id,
+            "league_sofascore_id": league_id,
+            "year": event["season"]["year"],
+            "name": event["season"]["name"],
+        })
+
+        if not (_stage_team(batch, event["homeTeam"]) and _stage_team(batch, event["awayTeam"])):
+            continue
+
+        batch.add("fixtures", event["id"], {
+            **event_fixture_values(event),
+            "league_sofascore_id": league_id,
+            "season_sofascore_id": season_id,
+            "home_team_sofascore_id": event["homeTeam"]["id"],
+            "away_team_sofascore_id": event["awayTeam"]["id"],
+        })
+
+
+def stage_cup_tree(batch: StagedBatch, cup_tree_data: Dict, league_sofascore_id: int, season_sofascore_id: int):
+    # Phases finales : un match par bloc ayant un event et deux équipes connues
+    for cup_tree in cup_tree_data.get("cupTrees", []):
+        for round_data in cup_tree.get("rounds", []):
+            for block in round_data.get("blocks", []):
+                participants = block.get("participants", [])
+                if not block.get("events") or len(participants) < 2:
+                    continue
+
+                home, away = participants[0]["team"], participants[1]["team"]
+                if not (_stage_team(batch, home) and _stage_team(batch, away)):
+                    continue
+
+                event_id = block["events"][0]
+                batch.add("fixtures", event_id, {
+                    **cup_tree_fixture_values(event_id, block, round_data),
+                    "league_sofascore_id": league_sofascore_id,
+                    "season_sofascore_id": season_sofascore_id,
+                    "home_team_sofascore_id": home["id"],
+                    "away_team_sofascore_id": away["id"],
+                })
+
+
+def _lineup_side(side: Dict):
+    # Format du wrapper (starters / substitutes) ou réponse brute (players + substitute)
+    if "players" in side:
+        for block in side["players"]:
+            yield block, bool(block.get("substitute"))
+    else:
+        for block in side.get("starters", []):
+            yield block, False
+        for block in side.get("substitutes", []):
+            yield block, True
+
+
+def stage_match_details(batch: StagedBatch, event_id: int, home_team_id: int, away_team_id: int, details: Dict):
+    # details : {"lineups": {"home", "away"}, "incidents": {...}, "statistics": {...}} (clés optionnelles)
+    for side, team_id in (("home", home_team_id), ("away", away_team_id)):
+        lineup_data = (details.get("lineups") or {}).get(side)
+        if not lineup_data:
+            continue
+        for player_block, is_substitute in _lineup_side(lineup_data):
+            player = player_block["player"]
+            batch.add("players", player["id"], {
+                **lineup_player_values(player), "team_sofascore_id": team_id,
+            })
+            batch.add("lineups", (event_id, team_id, player["id"]), {
+                **lineup_values(player_block, lineup_data, is_substitute),
+                "fixture_sofascore_id": event_id,
+                "team_sofascore_id": team_id,
+                "player_sofascore_id": player["id"],
+            })
+
+    for incident, event_type in match_incidents(details.get("incidents") or {}):
+        values = incident_values(incident, event_type)
+        if not values["sofascore_id"]:
+            continue
+        player, assist, player_out = incident_players(incident)
+        batch.add("match_events", values["sofascore_id"], {
+            **values,
+            "fixture_sofascore_id": event_id,
+            "player_sofascore_id": player,
+            "assist_sofascore_id": assist,
+            "player_out_sofascore_id": player_out,
+        })
+
+    statistics = match_statistics_values(details.get("statistics") or {})
+    if statistics:
+        for is_home, values in zip((True, False), statistics):
+            batch.add("match_statistics", (event_id, is_home), {
+                **values, "fixture_sofascore_id": event_id, "is_home": is_home,
+            })
+
+
+# ================= MERGE =================
+def _value_columns(table: str, alias: str = "s"):
+    # Colonnes recopiées, enums recastés dans leur type Postgres
+    model, columns, _ = STAGING[table]
+    selects = []
+    for name in columns:
+        column_type = model.__table__.c[name].type
+        if isinstance(column_type, Enum):
+            selects.append(f"CAST({alias}.{name} AS {column_type.name})")
+        else:
+            selects.append(f"{alias}.{name}")
+    return columns, selects
+
+
+def _merge_sql(table: str, key_columns: List[str], key_selects: List[str], joins: str, conflict: str) -> str:
+    columns, selects = _value_columns(table)
+    return (
+        f"INSERT INTO {table} ({', '.join(key_columns + columns)}) "
+        f"SELECT {', '.join(key_selects + selects)} FROM stg_{table} s {joins} "
+        f"ON CONFLICT {conflict} DO NOTHING"
+    )
+
+
+# Lignes déjà présentes conservées (comme get_or_create)
+MERGES = {
+    "leagues": _merge_sql("leagues", [], [], "", "(sofascore_id)"),
+    "seasons": _merge_sql(
+        "seasons", ["league_id", "current"], ["l.id", "false"],
+        "JOIN leagues l ON l.sofascore_id = s.league_sofascore_id",
+        "(sofascore_id)"
+    ),
+    "teams": _merge_sql("teams", [], [], "", "(sofascore_id)"),
+    "players": _merge_sql(
+        "players", ["team_id"], ["t.id"],
+        "LEFT JOIN teams t ON t.sofascore_id = s.team_sofascore_id",
+        "(sofascore_id)"
+    ),
+    "fixtures": _merge_sql(
+        "fixtures", ["league_id", "season_id", "home_team_id", "away_team_id"],
+        ["l.id", "se.id", "h.id", "a.id"],
+        "JOIN leagues l ON l.sofascore_id = s.league_sofascore_id "
+        "JOIN seasons se ON se.sofascore_id = s.season_sofascore_id "
+        "JOIN teams h ON h.sofascore_id = s.home_team_sofascore_id "
+        "JOIN teams a ON a.sofascore_id = s.away_team_sofascore_id",
+        "ON CONSTRAINT uq_fixtures_sofascore_season"
+    ),
+    "lineups": _merge_sql(
+        "lineups", ["fixture_id", "season_id", "team_id", "player_id"],
+        ["f.id", "f.season_id", "t.id", "p.id"],
+        "JOIN fixtures f ON f.sofascore_id = s.fixture_sofascore_id "
+        "JOIN teams t ON t.sofascore_id = s.team_sofascore_id "
+        "JOIN players p ON p.sofascore_id = s.player_sofascore_id",
+        "ON CONSTRAINT uq_lineup_fixture_team_player"
+    ),
+    "match_events": _merge_sql(
+        "match_events", ["fixture_id", "season_id", "team_id", "player_id", "assist_player_id", "player_out_id"],
+        ["f.id", "f.season_id", "CASE WHEN s.is_home THEN f.home_team_id ELSE f.away_team_id END",
+         "p.id", "pa.id", "po.id"],
+        "JOIN fixtures f ON f.sofascore_id = s.fixture_sofascore_id "
+        "LEFT JOIN players p ON p.sofascore_id = s.player_sofascore_id "
+        "LEFT JOIN players pa ON pa.sofascore_id = s.assist_sofascore_id "
+        "LEFT JOIN players po ON po.sofascore_id = s.player_out_sofascore_id",
+        "ON CONSTRAINT uq_match_events_sofascore_season"
+    ),
+    "match_statistics": _merge_sql(
+        "match_statistics", ["fixture_id", "season_id", "team_id"],
+        ["f.id", "f.season_id", "CASE WHEN s.is_home THEN f.home_team_id ELSE f.away_team_id END"],
+        "JOIN fixtures f ON f.sofascore_id = s.fixture_sofascore_id",
+        "ON CONSTRAINT uq_match_stats_fixture_team"
+    ),
+}
+
+
+async def _copy_and_merge(session, batch: StagedBatch, tables: List[str]) -> Dict[str, int]:
+    inserted = {}
+
+    for table in tables:
+        await session.execute(text(batch.ddl(table)))
+
+    # COPY binaire sur la connexion asyncpg, dans la transaction de la session
+    connection = await session.connection()
+    raw = (await connection.get_raw_connection()).driver_connection
+
+    for table in tables:
+        records = batch.records(table)
+        if records:
+            await raw.copy_records_to_table(f"stg_{table}", records=records, columns=batch.columns(table))
+        result = await session.execute(text(MERGES[table]))
+        inserted[table] = result.rowcount
+
+    return inserted
+
+
+async def load_batch(batch: StagedBatch, recompute: bool = True) -> Dict[str, int]:
+    started = time.perf_counter()
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            inserted = await _copy_and_merge(session, batch, REFERENCE_TABLES)
+
+        season_sofascore_ids = [record[0] for record in batch.records("seasons")]
+        season_ids = (await session.execute(
+            select(Season.id).where(Season.sofascore_id.in_(season_sofascore_ids))
+        )).scalars().all()
+
+    # Saisons validées : leurs partitions peuvent être créées avant d'y insérer les matchs
+    for season_id in season_ids:
+        await ensure_season_partitions(season_id)
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            inserted.update(await _copy_and_merge(session, batch, MATCH_TABLES))
+
+        if recompute:
+            for season_id in season_ids:
+                async with session.begin():
+                    await rebuild_player_season_aggregates(session, season_id)
+                async with session.begin():
+                    await recompute_standings(session, season_id)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Backfill : {batch.count()} lignes stagées, {sum(inserted.values())} insérées "
+        f"en {elapsed:.2f}s ({batch.count() / elapsed:,.0f} lignes/s)"
+    )
+    for table, count in inserted.items():
+        print(f"  {table}: {count}")
+
+    return inserted
+
+
+# ================= CLI =================
+def _read_json(path) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_batch(events_path, cup_tree_path=None, details_dir=None, season_sofascore_id: Optional[int] = None,
+                league_type: TournamentType = TournamentType.AFCON) -> StagedBatch:
+    data = _read_json(events_path)
+    events = data["events"] if isinstance(data, dict) else data
+
+    batch = StagedBatch()
+    stage_events(batch, events, league_type)
+
+    if cup_tree_path:
+        # Le cup tree ne porte pas la saison : celle des events de la même compétition
+        cup_tree_data = _read_json(cup_tree_path)
+        league_id = cup_tree_data["cupTrees"][0]["tournament"]["uniqueTournament"]["id"]
+        if season_sofascore_id is None:
+            seasons = {e["season"]["id"] for e in events if e["tournament"]["uniqueTournament"]["id"] == league_id}
+            if len(seasons) != 1:
+                raise ValueError(f"Saison du cup tree ambiguë ({sorted(seasons)}) : préciser --season")
+            season_sofascore_id = seasons.pop()
+        stage_cup_tree(batch, cup_tree_data, league_id, season_sofascore_id)
+
+    if details_dir:
+        # Un fichier <event_id>.json par match : lineups / incidents / statistics
+        columns = batch.columns("fixtures")
+        for event_id, record in list(batch.rows["fixtures"].items()):
+            path = Path(details_dir) / f"{event_id}.json"
+            if path.exists():
+                row = dict(zip(columns, record))
+                stage_match_details(
+                    batch, event_id, row["home_team_sofascore_id"], row["away_team_sofascore_id"],
+                    _read_json(path)
+                )
+
+    return batch
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill COPY depuis des JSON Sofascore stagés")
+    parser.add_argument("events", help="Liste d'events (ex. notebooks/all_can_matches_complete.json)")
+    parser.add_argument("--cup-tree", help="Cup tree des phases finales (ex. notebooks/can_cup_tree.json)")
+    parser.add_argument("--details", help="Dossier de <event_id>.json (lineups, incidents, statistics)")
+    parser.add_argument("--season", type=int, help="sofascore_id de la saison du cup tree")
+    parser.add_argument("--league-type", default=TournamentType.AFCON.value,
+                        choices=[t.value for t in TournamentType])
+    parser.add_argument("--no-recompute", action="store_true", help="Sans recalcul agrégats / classements")
+    args = parser.parse_args()
+
+    batch = build_batch(
+        args.events, args.cup_tree, args.details, args.season, TournamentType(args.league_type)
+    )
+    await load_batch(batch, recompute=not args.no_recompute)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+import asyncio
+from typing import Optional
+
+from sqlalchemy import select, func, or_, union, literal
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.tracing import traced
+from app.db.database import AsyncSessionLocal
+from app.db.models import (
+    Fixture, Season, Lineup, MatchEvent, EventType, PlayerSeasonAggregate
+)
+
+AGGREGATE_FIELDS = [
+    "appearances", "starts", "minutes_played",
+    "goals", "assists", "yellow_cards", "red_cards",
+    "rated_matches", "average_rating",
+]
+
+
+def _aggregate_select(season_id: int, league_id: int, player_ids=None):
+
+    # season_id des tables filles = celui du match : une seule partition lue
+
+    # Temps de jeu et notes depuis les compositions
+    lineup_stats = select(
+        Lineup.player_id.label("player_id"),
+        func.count().filter(
+            or_(Lineup.starter.is_(True), Lineup.minutes_played > 0)
+        ).label("appearances"),
+        func.count().filter(Lineup.starter.is_(True)).label("starts"),
+        func.coalesce(func.sum(Lineup.minutes_played), 0).label("minutes_played"),
+        func.count(Lineup.rating).label("rated_matches"),
+        func.avg(Lineup.rating).label("average_rating"),
+    ).where(Lineup.season_id == season_id).group_by(Lineup.player_id)
+
+    # Buts (hors csc) et cartons depuis les événements
+    event_stats = select(
+        MatchEvent.player_id.label("player_id"),
+        func.count().filter(
+            MatchEvent.type == EventType.GOAL,
+            MatchEvent.incident_class.is_distinct_from("ownGoal"),
+        ).label("goals"),
+        func.count().filter(MatchEvent.type == EventType.YELLOW_CARD).label("yellow_cards"),
+        func.count().filter(MatchEvent.type == EventType.RED_CARD).label("red_cards"),
+    ).where(
+        MatchEvent.season_id == season_id,
+        MatchEvent.player_id.is_not(None),
+    ).group_by(MatchEvent.player_id)
+
+    assist_stats = select(
+        MatchEvent.assist_player_id.label("player_id"),
+        func.count().label("assists"),
+    ).where(
+        MatchEvent.season_id == season_id,
+        MatchEvent.type == EventType.GOAL,
+        MatchEvent.assist_player_id.is_not(None),
+    ).group_by(MatchEvent.assist_player_id)
+
+    if player_ids is not None:
+        lineup_stats = lineup_stats.where(Lineup.player_id.in_(player_ids))
+        event_stats = event_stats.where(MatchEvent.player_id.in_(player_ids))
+        assist_stats = assist_stats.where(MatchEvent.assist_player_id.in_(player_ids))
+
+    lineup_stats = lineup_stats.subquery()
+    event_stats = event_stats.subquery()
+    assist_stats = assist_stats.subquery()
+
+    players = union(
+        select(lineup_stats.c.player_id),
+        select(event_stats.c.player_id),
+        select(assist_stats.c.player_id),
+    ).subquery()
+
+    return select(
+        players.c.player_id,
+        literal(season_id).label("season_id"),
+        literal(league_id).label("league_id"),
+        func.coalesce(lineup_stats.c.appearances, 0),
+        func.coalesce(lineup_stats.c.starts, 0),
+        func.coalesce(lineup_stats.c.minutes_played, 0),
+        func.coalesce(event_stats.c.goals, 0),
+        func.coalesce(assist_stats.c.assists, 0),
+        func.coalesce(event_stats.c.yellow_cards, 0),
+        func.coalesce(event_stats.c.red_cards, 0),
+        func.coalesce(lineup_stats.c.rated_matches, 0),
+        lineup_stats.c.average_rating,
+    ).select_from(
+        players
+        .outerjoin(lineup_stats, lineup_stats.c.player_id == players.c.player_id)
+        .outerjoin(event_stats, event_stats.c.player_id == players.c.player_id)
+        .outerjoin(assist_stats, assist_stats.c.player_id == players.c.player_id)
+    )
+
+
+async def _upsert_aggregates(session, season_id: int, league_id: int, player_ids=None):
+
+    stmt = insert(PlayerSeasonAggregate).from_select(
+        ["player_id", "season_id", "league_id", *AGGREGATE_FIELDS],
+        _aggregate_select(season_id, league_id, player_ids),
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_player_season_aggregate",
+        set_={
+            **{field: stmt.excluded[field] for field in AGGREGATE_FIELDS},
+            "updated_at": func.now(),
+        },
+    )
+    await session.execute(stmt)
+
+
+@traced()
+async def refresh_player_season_aggregates(session, fixture_id: int):
+    # Recalcule la saison uniquement pour les joueurs présents dans ce match
+    result = await session.execute(
+        select(Fixture.season_id, Fixture.league_id).where(Fixture.id == fixture_id)
+    )
+    row = result.first()
+    if not row:
+        return
+
+    fixture_players = union(
+        select(Lineup.player_id).where(Lineup.fixture_id == fixture_id),
+        select(MatchEvent.player_id).where(
+            MatchEvent.fixture_id == fixture_id, MatchEvent.player_id.is_not(None)
+        ),
+        select(MatchEvent.assist_player_id).where(
+            MatchEvent.fixture_id == fixture_id, MatchEvent.assist_player_id.is_not(None)
+        ),
+    )
+
+    await _upsert_aggregates(session, row.season_id, row.league_id, select(fixture_players.subquery()))
+
+
+async def rebuild_player_season_aggregates(session, season_id: Optional[int] = None):
+    # Reconstruction complète (backfill) d'une saison ou de toutes les saisons
+    query = select(Season.id, Season.league_id)
+    if season_id:
+        query = query.where(Season.id == season_id)
+
+    seasons = (await session.execute(query)).all()
+    for season in seasons:
+        await _upsert_aggregates(session, season.id, season.league_id)
+
+    print(f"Agrégats joueurs reconstruits pour {len(seasons)} saison(s)")
+
+
+async def main():
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            await rebuild_player_season_aggregates(session)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
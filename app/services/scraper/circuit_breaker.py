@@ -0,0 +1,163 @@
+import asyncio
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sofascore_wrapper.api import SofascoreAPI
+
+from app.core.config import settings
+from app.core.metrics import SOFASCORE_CIRCUIT_OPENED, SOFASCORE_CIRCUIT_REJECTED, endpoint_label
+from app.services.scraper.replay_api import _endpoint
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+# Échéance (time.monotonic) des appels amont de la requête HTTP en cours ; None = pas de budget
+_deadline: ContextVar[Optional[float]] = ContextVar("upstream_deadline", default=None)
+
+
+@contextmanager
+def upstream_budget(seconds: float):
+    # Temps total accordé aux appels Sofascore d'une requête, tous appels confondus
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def is_upstream_failure(exc: Exception) -> bool:
+    # Un 404 (pas de lineups, match inconnu) est une réponse normale, pas une panne
+    match = re.search(r": (\d{3})$", str(exc))
+    if match:
+        status = int(match.group(1))
+        return status >= 500 or status in (403, 429)
+    return True
+
+
+class CircuitBreaker:
+    # État partagé par tous les workers via Redis :
+    #   circuit:<nom>:failures  échecs dans la fenêtre (INCR + EXPIRE)
+    #   circuit:<nom>:open      présent = ouvert (TTL = open_seconds)
+    #   circuit:<nom>:tripped   ouvert puis expiré = semi-ouvert : un seul appel test (probe)
+
+    def __init__(self, redis, name: str, failure_threshold: int = 5, window_seconds: int = 30,
+                 open_seconds: int = 30, call_timeout: float = 3.0):
+        self.redis = redis
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.call_timeout = call_timeout
+        self._keys = {k: f"circuit:{name}:{k}" for k in ("failures", "open", "tripped", "probe")}
+
+    async def state(self) -> str:
+        is_open, tripped = await self.redis.mget(self._keys["open"], self._keys["tripped"])
+        if is_open:
+            return "open"
+        return "half_open" if tripped else "closed"
+
+    async def call(self, func, *args):
+        state = await self.state()
+        if state == "open":
+            raise CircuitOpen(f"Circuit {self.name} ouvert")
+        if state == "half_open":
+            # Un seul worker teste l'amont, les autres échouent vite
+            acquired = await self.redis.set(self._keys["probe"], 1, nx=True, px=int(self.call_timeout * 1000) + 1000)
+            if not acquired:
+                raise CircuitOpen(f"Circuit {self.name} en test")
+
+        timeout = self.call_timeout
+        remaining = remaining_budget()
+        if remaining is not None:
+            if remaining <= 0:
+                raise BudgetExceeded(f"Budget amont épuisé ({self.name})")
+            timeout = min(timeout, remaining)
+
+        try:
+            result = await asyncio.wait_for(func(*args), timeout)
+        except Exception as e:
+            if is_upstream_failure(e):
+                await self._record_failure(half_open=state == "half_open")
+            elif state == "half_open":
+                await self._reset()
+            raise
+
+        if state == "half_open":
+            await self._reset()
+        return result
+
+    async def _record_failure(self, half_open: bool):
+        failures = await self.redis.incr(self._keys["failures"])
+        if failures == 1:
+            await self.redis.expire(self._keys["failures"], self.window_seconds)
+        if half_open or failures >= self.failure_threshold:
+            await self.trip()
+
+    async def trip(self):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._keys["open"], 1, ex=self.open_seconds)
+            pipe.set(self._keys["tripped"], 1)
+            pipe.delete(self._keys["failures"], self._keys["probe"])
+            await pipe.execute()
+        SOFASCORE_CIRCUIT_OPENED.labels(self.name).inc()
+        print(f"[circuit] {self.name} ouvert pour {self.open_seconds}s")
+
+    async def _reset(self):
+        await self.redis.delete(*self._keys.values())
+
+
+class GuardedSofascoreAPI(SofascoreAPI):
+    # Chemin requête HTTP : un disjoncteur par gabarit d'endpoint, délai par appel, budget par requête.
+    # Les erreurs levées gardent la forme "Failed to fetch ..." attendue par les services.
+
+    def __init__(self, upstream: SofascoreAPI, redis):
+        super().__init__()
+        self.upstream = upstream
+        self.redis = redis
+        self.breakers = {}
+
+    def breaker(self, label: str) -> CircuitBreaker:
+        if label not in self.breakers:
+            self.breakers[label] = CircuitBreaker(
+                self.redis, f"sofascore:{label}",
+                failure_threshold=settings.SOFASCORE_BREAKER_FAILURES,
+                window_seconds=settings.SOFASCORE_BREAKER_WINDOW_SECONDS,
+                open_seconds=settings.SOFASCORE_BREAKER_OPEN_SECONDS,
+                call_timeout=settings.SOFASCORE_CALL_TIMEOUT_SECONDS,
+            )
+        return self.breakers[label]
+
+    async def _get(self, endpoint):
+        label = endpoint_label(endpoint)
+        try:
+            return await self.breaker(label).call(self.upstream._get, endpoint)
+        except (CircuitOpen, BudgetExceeded) as e:
+            SOFASCORE_CIRCUIT_REJECTED.labels(label).inc()
+            raise Exception(f"Failed to fetch {endpoint}: {e}")
+        except asyncio.TimeoutError:
+            raise Exception(f"Failed to fetch {endpoint}: timeout")
+
+    def __getattr__(self, name):
+        if name == "upstream":
+            raise AttributeError(name)
+        return getattr(self.upstream, name)
+
+    async def _raw_get(self, url):
+        return await self._get(_endpoint(url))
+
+    async def close(self):
+        await self.upstream.close()
@@ -7,9 +7,12 @@ from app.services.scraper.fixture_service import ingest_fixture_from_cup_tree
 from app.services.scraper.lineup_service import ingest_lineups;
 from app.services.scraper.statistics_service import ingest_match_statistics
 from app.services.scraper.match_event_service import ingest_match_events
+from app.services.player_aggregate_service import refresh_player_season_aggregates
 from app.utils import get_or_create
+from app.core.tracing import traced, fixture_span
 
 
+@traced()
 async def ingest_cup_tree_matches(session, api, season_id, league, season):
     
     try:
@@ -34,10 +37,11 @@ async def ingest_cup_tree_matches(session, api, season_id, league, season):
                 event_id = event_ids[0]
                 
                 try:
-                    await _process_cup_tree_match(
-                        session, api, event_id, block, round_data, 
-                        league, season
-                    )
+                    with fixture_span(event_id):
+                        await _process_cup_tree_match(
+                            session, api, event_id, block, round_data, 
+                            league, season
+                        )
                 except Exception as e:
                     print(f" Erreur match {event_id}: {str(e)}")
                     continue
@@ -76,9 +80,9 @@ async def _process_cup_tree_match(session, api, event_id, block, round_data, lea
     away_lineups = await match_obj.lineups_away()
     
     if home_lineups:
-        await ingest_lineups(session, fixture.id, home_lineups, participants[0]['team']['id'])
+        await ingest_lineups(session, fixture.id, home_lineups, participants[0]['team']['id'], season_id=fixture.season_id)
     if away_lineups:
-        await ingest_lineups(session, fixture.id, away_lineups, participants[1]['team']['id'])
+        await ingest_lineups(session, fixture.id, away_lineups, participants[1]['team']['id'], season_id=fixture.season_id)
 
     # Récupérer les statistiques
     match_stats = await match_obj.stats()
@@ -87,7 +91,8 @@ async def _process_cup_tree_match(session, api, event_id, block, round_data, lea
             session, fixture.id,
             participants[0]['team']['id'],
             participants[1]['team']['id'],
-            match_stats
+            match_stats,
+            season_id=fixture.season_id
         )
 
     # Récupérer les événements du match
@@ -95,9 +100,12 @@ async def _process_cup_tree_match(session, api, event_id, block, round_data, lea
     if match_incidents:
         await ingest_match_events(
             session, match_incidents, fixture.id,
-            home_team.id, away_team.id
+            home_team.id, away_team.id,
+            season_id=fixture.season_id
         )
 
+    await refresh_player_season_aggregates(session, fixture.id)
+
 async def _get_or_create_team_from_participant(session, api, participant):
     
     team_data = participant['team']
@@ -2,16 +2,13 @@
 from datetime import datetime
 from app.db.models import Fixture, MatchStatus
 from app.utils import get_or_create
+from app.core.tracing import traced
 
 
-async def ingest_fixture(session, event_data, league_id, season_id, home_team_id, away_team_id):
-   
-    fixture_defaults = {
+def event_fixture_values(event_data):
+    # Colonnes d'un match depuis un event Sofascore (hors clés étrangères)
+    return {
         "sofascore_id": event_data["id"],
-        "league_id": league_id,
-        "season_id": season_id,
-        "home_team_id": home_team_id,
-        "away_team_id": away_team_id,
         "date": datetime.fromtimestamp(event_data["startTimestamp"]),
         "timestamp": event_data["startTimestamp"],
         "round": event_data.get("roundInfo", {}).get("round"),
@@ -28,6 +25,31 @@ async def ingest_fixture(session, event_data, league_id, season_id, home_team_id
         "away_score_period2": event_data.get("awayScore", {}).get("period2"),
         "away_score_normaltime": event_data.get("awayScore", {}).get("normaltime"),
     }
+
+
+def cup_tree_fixture_values(event_id, block_data, round_data):
+    return {
+        "sofascore_id": event_id,
+        "date": datetime.fromtimestamp(block_data['seriesStartDateTimestamp']),
+        "timestamp": block_data['seriesStartDateTimestamp'],
+        "round": round_data['order'],
+        "round_name": round_data['description'],
+        "status": MatchStatus.FINISHED if block_data.get('finished') else MatchStatus.NOT_STARTED,
+        "home_score": int(block_data.get('homeTeamScore', '0').split()[0]) if block_data.get('homeTeamScore') else None,
+        "away_score": int(block_data.get('awayTeamScore', '0').split()[0]) if block_data.get('awayTeamScore') else None,
+    }
+
+
+@traced()
+async def ingest_fixture(session, event_data, league_id, season_id, home_team_id, away_team_id):
+   
+    fixture_defaults = {
+        "league_id": league_id,
+        "season_id": season_id,
+        "home_team_id": home_team_id,
+        "away_team_id": away_team_id,
+        **event_fixture_values(event_data),
+    }
     
     return await get_or_create(
         session, Fixture, "sofascore_id",
@@ -35,21 +57,15 @@ async def ingest_fixture(session, event_data, league_id, season_id, home_team_id
     )
 
 
+@traced()
 async def ingest_fixture_from_cup_tree(session, event_id, block_data, round_data, 
                                        league_id, season_id, home_team_id, away_team_id):
     fixture_defaults = {
-        "sofascore_id": event_id,
         "league_id": league_id,
         "season_id": season_id,
         "home_team_id": home_team_id,
         "away_team_id": away_team_id,
-        "date": datetime.fromtimestamp(block_data['seriesStartDateTimestamp']),
-        "timestamp": block_data['seriesStartDateTimestamp'],
-        "round": round_data['order'],
-        "round_name": round_data['description'],
-        "status": MatchStatus.FINISHED if block_data.get('finished') else MatchStatus.NOT_STARTED,
-        "home_score": int(block_data.get('homeTeamScore', '0').split()[0]) if block_data.get('homeTeamScore') else None,
-        "away_score": int(block_data.get('awayTeamScore', '0').split()[0]) if block_data.get('awayTeamScore') else None,
+        **cup_tree_fixture_values(event_id, block_data, round_data),
     }
     
     return await get_or_create(
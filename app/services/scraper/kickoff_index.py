@@ -0,0 +1,77 @@
+import bisect
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Fixture, MatchStatus
+
+# Matchs à suivre ; les autres statuts sortent de l'index
+TRACKED_STATUSES = (MatchStatus.NOT_STARTED, MatchStatus.IN_PROGRESS)
+
+
+class KickoffIndex:
+    # Coups d'envoi à venir ou en cours, triés par date (sofascore_id -> coup d'envoi UTC)
+
+    def __init__(self, lead: timedelta, max_duration: timedelta):
+        self.lead = lead
+        self.max_duration = max_duration
+        self._order: List[Tuple[datetime, int]] = []
+        self._kickoffs: Dict[int, datetime] = {}
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, sofascore_id: int):
+        return sofascore_id in self._kickoffs
+
+    def add(self, sofascore_id: int, kickoff: datetime) -> bool:
+        current = self._kickoffs.get(sofascore_id)
+        if current == kickoff:
+            return False
+        if current is not None:
+            self.discard(sofascore_id)
+        bisect.insort(self._order, (kickoff, sofascore_id))
+        self._kickoffs[sofascore_id] = kickoff
+        return True
+
+    def discard(self, sofascore_id: int):
+        kickoff = self._kickoffs.pop(sofascore_id, None)
+        if kickoff is not None:
+            self._order.remove((kickoff, sofascore_id))
+
+    def apply(self, rows: Iterable[Tuple[int, datetime]]) -> Dict[str, int]:
+        # rows : ensemble complet des matchs à suivre ; seules les différences sont appliquées
+        current = dict(rows)
+        changes = {"added": 0, "moved": 0, "removed": 0}
+        for sofascore_id in set(self._kickoffs) - set(current):
+            self.discard(sofascore_id)
+            changes["removed"] += 1
+        for sofascore_id, kickoff in current.items():
+            known = sofascore_id in self._kickoffs
+            if self.add(sofascore_id, kickoff):
+                changes["moved" if known else "added"] += 1
+        return changes
+
+    async def refresh(self, session: AsyncSession, now: datetime) -> Dict[str, int]:
+        # Peu de lignes (matchs non terminés), servies par ix_fixtures_status_date
+        result = await session.execute(
+            select(Fixture.sofascore_id, Fixture.date).where(
+                Fixture.status.in_(TRACKED_STATUSES),
+                Fixture.date >= now - self.max_duration,
+            )
+        )
+        return self.apply(result.all())
+
+    def due(self, now: datetime) -> List[Tuple[int, datetime]]:
+        # Matchs dont la fenêtre de suivi est ouverte (coup d'envoi - lead <= now)
+        end = bisect.bisect_right(self._order, (now + self.lead, float("inf")))
+        return [(sofascore_id, kickoff) for kickoff, sofascore_id in self._order[:end]]
+
+    def is_over(self, kickoff: datetime, now: datetime) -> bool:
+        # Garde-fou si Sofascore ne renvoie jamais "finished"
+        return now > kickoff + self.max_duration
+
+    def next_wake(self) -> Optional[datetime]:
+        return self._order[0][0] - self.lead if self._order else None
@@ -1,7 +1,11 @@
 
+from sqlalchemy import select
+
 from app.db.models import League, Season, TournamentType
 from app.utils import get_or_create
+from app.core.tracing import traced
 
+@traced()
 async def ingest_league(session, event_data):
    
     league_defaults = {
@@ -19,6 +23,7 @@ async def ingest_league(session, event_data):
     )
 
 
+@traced()
 async def ingest_season(session, event_data, league_id):
     
     season_defaults = {
@@ -29,7 +34,15 @@ async def ingest_season(session, event_data, league_id):
         "current": True,
     }
     
-    return await get_or_create(
+    existing = await session.scalar(
+        select(Season.id).where(Season.sofascore_id == season_defaults["sofascore_id"])
+    )
+
+    season = await get_or_create(
         session, Season, "sofascore_id",
         season_defaults["sofascore_id"], season_defaults
     )
+
+    # Saison créée : pas encore de partitions. L'appelant valide la transaction puis
+    # appelle ensure_season_partitions (connexion à part, voir bulk_loader.load_batch)
+    return season, existing is None
@@ -1,9 +1,38 @@
 
+from sqlalchemy import select
 from app.db.models import Lineup, Player, Team
 from app.utils import get_or_create, get_team_by_sofascore_id
+from app.core.tracing import traced
 
 
-async def ingest_lineups(session, fixture_id, lineup_data, team_sofascore_id):
+def lineup_player_values(p):
+    return {
+        "sofascore_id": p["id"],
+        "name": p["name"],
+        "slug": p.get("slug"),
+        "short_name": p.get("shortName"),
+        "first_name": p.get("firstName"),
+        "last_name": p.get("lastName"),
+        "position": p.get("position"),
+        "jersey_number": int(p.get("jerseyNumber")) if p.get("jerseyNumber") else None,
+        "height": p.get("height"),
+    }
+
+
+def lineup_values(player_block, lineup_data, is_substitute=False):
+    return {
+        "formation": lineup_data.get("formation"),
+        "position": player_block.get("position"),
+        "starter": not is_substitute,
+        "rating": player_block.get("statistics", {}).get("rating"),
+        "minutes_played": player_block.get("statistics", {}).get("minutesPlayed"),
+        "captain": player_block.get("captain", False),
+        "substitute": is_substitute,
+    }
+
+
+@traced()
+async def ingest_lineups(session, fixture_id, lineup_data, team_sofascore_id, season_id=None):
 
     # Récupérer l'équipe par son sofascore_id
     team_db_id, _ = await get_team_by_sofascore_id(session, Team, team_sofascore_id)
@@ -16,33 +45,21 @@ async def ingest_lineups(session, fixture_id, lineup_data, team_sofascore_id):
     for starter in lineup_data.get("starters", []):
         await _insert_player_lineup(
             session, fixture_id, team_db_id, 
-            starter, lineup_data, is_substitute=False
+            starter, lineup_data, is_substitute=False, season_id=season_id
         )
     
     # Insérer les substitutes
     for sub in lineup_data.get("substitutes", []):
         await _insert_player_lineup(
             session, fixture_id, team_db_id, 
-            sub, lineup_data, is_substitute=True
+            sub, lineup_data, is_substitute=True, season_id=season_id
         )
 
 
 async def _insert_player_lineup(session, fixture_id, team_db_id, player_block, 
-                                lineup_data, is_substitute=False):
-    p = player_block["player"]
-    
+                                lineup_data, is_substitute=False, season_id=None):
     # Créer ou récupérer le joueur
-    player_defaults = {
-        "sofascore_id": p["id"],
-        "name": p["name"],
-        "slug": p.get("slug"),
-        "short_name": p.get("shortName"),
-        "first_name": p.get("firstName"),
-        "last_name": p.get("lastName"),
-        "position": p.get("position"),
-        "jersey_number": int(p.get("jerseyNumber")) if p.get("jerseyNumber") else None,
-        "height": p.get("height"),
-    }
+    player_defaults = lineup_player_values(player_block["player"])
     player = await get_or_create(
         session, Player, "sofascore_id",
         player_defaults["sofascore_id"], player_defaults
@@ -53,16 +70,21 @@ async def _insert_player_lineup(session, fixture_id, team_db_id, player_block,
         "fixture_id": fixture_id,
         "team_id": team_db_id,
         "player_id": player.id,
-        "formation": lineup_data.get("formation"),
-        "position": player_block.get("position"),
-        "starter": not is_substitute,
-        "rating": player_block.get("statistics", {}).get("rating"),
-        "minutes_played": player_block.get("statistics", {}).get("minutesPlayed"),
-        "captain": player_block.get("captain", False),
-        "substitute": is_substitute,
+        **lineup_values(player_block, lineup_data, is_substitute),
     }
+    if season_id is not None:
+        lineup_defaults["season_id"] = season_id
     
-    await get_or_create(
-        session, Lineup, 
-        "player_id", lineup_defaults["player_id"], lineup_defaults
+    # Un lineup est unique par (match, équipe, joueur)
+    existing = await session.execute(
+        select(Lineup.id).where(
+            Lineup.fixture_id == fixture_id,
+            Lineup.team_id == team_db_id,
+            Lineup.player_id == player.id
+        )
     )
+    if existing.first():
+        return
+    
+    session.add(Lineup(**lineup_defaults))
+    await session.flush()
@@ -0,0 +1,73 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+# Codes de statut Sofascore (event.status.code) des pauses : la minute affichée reste figée
+BREAK_MINUTES = {31: 45, 32: 90, 33: 105, 34: 120}
+HALFTIME = 31
+# Fin réglementaire de chaque période (minutes), par minute de début de période (time.initial)
+PERIOD_ENDS = {0: 45, 45: 90, 90: 105, 105: 120}
+
+
+def clock_info(event: Dict) -> Dict:
+    # Horloge brute mise en cache (début de la période en cours, secondes déjà jouées à ce
+    # moment, fin réglementaire de la période) : la minute est recalculée à chaque lecture
+    time_info = event.get("time", {})
+    return {
+        "period_start": time_info.get("currentPeriodStartTimestamp"),
+        "initial": time_info.get("initial", 0),
+        "max": time_info.get("max"),
+        "status_code": event.get("status", {}).get("code"),
+    }
+
+
+def derive_clock(clock: Optional[Dict], now: Optional[float] = None) -> Dict:
+    # {"minute", "added_time"} à l'instant now : 45 et 2 pour 45+2
+    if not clock or not clock.get("period_start"):
+        return {"minute": None, "added_time": None}
+    if clock.get("status_code") in BREAK_MINUTES:
+        return {"minute": BREAK_MINUTES[clock["status_code"]], "added_time": None}
+
+    elapsed = (clock.get("initial") or 0) + max((now or time.time()) - clock["period_start"], 0)
+    minute = int(elapsed // 60)
+    period_end = clock.get("max")
+    if period_end and minute > period_end // 60:
+        return {"minute": period_end // 60, "added_time": minute - period_end // 60}
+    return {"minute": minute, "added_time": None}
+
+
+def timeline_position(clock: Optional[Dict], now: Optional[float] = None) -> Optional[int]:
+    # Position d'un point de la frise des stats : minute de début de la période x 100 + minutes
+    # jouées dans la période. 45+3 (48) et la 48e minute (4503) restent distinctes et ordonnées.
+    if not clock or not clock.get("period_start") or clock.get("status_code") in BREAK_MINUTES:
+        return None
+    played = int(max((now or time.time()) - clock["period_start"], 0) // 60)
+    return (clock.get("initial") or 0) // 60 * 100 + min(played, 99)
+
+
+def position_minute(position: int) -> Tuple[int, Optional[int]]:
+    # (minute, temps additionnel) d'une position de la frise, comme derive_clock
+    start, played = divmod(position, 100)
+    minute, period_end = start + played, PERIOD_ENDS.get(start)
+    if period_end is not None and minute > period_end:
+        return period_end, minute - period_end
+    return minute, None
+
+
+def match_clock(match_info: Dict, now: Optional[float] = None) -> Dict:
+    # Données en cache d'avant l'horloge brute : minute figée à la lecture Sofascore
+    if "clock" not in match_info:
+        return {"minute": match_info.get("minute"), "added_time": None}
+    return derive_clock(match_info["clock"], now)
+
+
+def quiet_until(status: str, match_info: Dict, now: float, halftime_since: Optional[float] = None) -> float:
+    # Heure jusqu'à laquelle le match ne devrait rien produire de nouveau (now : phase active)
+    start = match_info.get("start_timestamp")
+    if status == "notstarted" and start:
+        # Avant-match : compositions seulement, rythme normal dès le coup d'envoi prévu
+        return max(min(now + settings.LIVE_POLL_PREMATCH_SECONDS, start), now)
+    if match_info.get("clock", {}).get("status_code") == HALFTIME and halftime_since:
+        return max(halftime_since + settings.LIVE_HALFTIME_QUIET_SECONDS, now)
+    return now
@@ -0,0 +1,279 @@
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from redis.exceptions import ResponseError
+
+from app.core.config import settings
+from app.services.scraper.tracker_cluster import default_instance_id
+
+# Flux actifs : clé du flux -> dernier ajout (ms), parcouru par les groupes de consommateurs
+ACTIVE_STREAMS_KEY = "live:events:active"
+
+# Ajout idempotent : un incident n'est écrit qu'une fois (SADD sur live:events:<id>:seen),
+# score et statut seulement quand ils changent (HGET/HSET sur live:events:<id>:state).
+#   KEYS : flux, seen, state        ARGV : maxlen, ttl, puis (type, clé, données) par entrée
+APPEND_EVENTS = """
+local ids = {}
+for i = 3, #ARGV, 3 do
+  local kind, key, data = ARGV[i], ARGV[i + 1], ARGV[i + 2]
+  local new
+  if kind == 'incident' then
+    new = redis.call('sadd', KEYS[2], key) == 1
+  else
+    new = redis.call('hget', KEYS[3], kind) ~= key
+    if new then redis.call('hset', KEYS[3], kind, key) end
+  end
+  if new then
+    table.insert(ids, redis.call('xadd', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'type', kind, 'data', data))
+  end
+end
+for _, key in ipairs(KEYS) do redis.call('expire', key, ARGV[2]) end
+return ids
+"""
+
+
+def stream_key(fixture_id: int) -> str:
+    return f"live:events:{fixture_id}"
+
+
+def stream_fixture_id(key: str) -> int:
+    return int(key.rsplit(":", 1)[1])
+
+
+def incident_record(incident: Dict) -> Tuple[str, Dict]:
+    # (clé de déduplication, enregistrement) ; un incident corrigé (VAR, score) change de clé
+    key = ":".join(str(incident.get(field)) for field in (
+        "id", "incidentType", "incidentClass", "time", "addedTime", "homeScore", "awayScore",
+    ))
+    return key, {
+        "kind": incident.get("incidentType"),
+        "minute": incident.get("time"),
+        "added_time": incident.get("addedTime"),
+        "team": "home" if incident.get("isHome") else "away",
+        "incident": incident,
+    }
+
+
+def decode_entry(entry_id: str, fields: Dict) -> Dict:
+    return {"id": entry_id, "type": fields["type"], **json.loads(fields["data"])}
+
+
+class LiveEventLog:
+    # Journal des événements d'un match (Redis Stream live:events:<sofascore_id>) :
+    # incidents bruts normalisés, changements de score et de statut
+
+    def __init__(self, redis):
+        self.redis = redis
+        self._append = redis.register_script(APPEND_EVENTS)
+
+    async def append(self, fixture_id: int, status: str, score: Dict, incidents: List[Dict],
+                     latency: Optional[Dict] = None, stats: Optional[Dict] = None) -> List[str]:
+        recorded_at = time.time()
+        # Horodatages amont (changeTimestamp, lecture) : retard mesuré jusqu'à la livraison
+        stamps = {k: v for k, v in (latency or {}).items() if k in ("upstream_changed_at", "fetched_at")}
+        entries = [
+            ("incident", *incident_record(incident)) for incident in incidents
+            if incident.get("incidentType") in ("goal", "card", "substitution", "varDecision", "inGamePenalty", "period")
+        ]
+        # Statut en dernier : "finished" arrive après les derniers incidents, avec les
+        # statistiques finales (brutes) lues au même passage
+        status_record = {"status": status}
+        if status == "finished" and stats:
+            status_record["stats"] = stats
+        entries += [
+            ("score", f"{score.get('home')}-{score.get('away')}", {"home": score.get("home"), "away": score.get("away")}),
+            ("status", status, status_record),
+        ]
+
+        args = [settings.LIVE_EVENTS_MAXLEN, settings.LIVE_EVENTS_TTL_SECONDS]
+        for kind, key, record in entries:
+            args += [kind, key, json.dumps({"fixture_id": fixture_id, "recorded_at": recorded_at, **stamps, **record})]
+
+        key = stream_key(fixture_id)
+        ids = await self._append(keys=[key, f"{key}:seen", f"{key}:state"], args=args)
+        if ids:
+            await self.redis.zadd(ACTIVE_STREAMS_KEY, {key: int(recorded_at * 1000)})
+        return ids
+
+    async def read(self, fixture_id: int, since: str = "-") -> List[Dict]:
+        # Relecture (depuis le début ou après un id), sans repasser par Sofascore
+        start = since if since == "-" else f"({since}"
+        entries = await self.redis.xrange(stream_key(fixture_id), min=start)
+        return [decode_entry(entry_id, fields) for entry_id, fields in entries]
+
+    async def incidents(self, fixture_id: int) -> List[Dict]:
+        return [record["incident"] for record in await self.read(fixture_id) if record["type"] == "incident"]
+
+    async def final_stats(self, fixture_id: int) -> Optional[Dict]:
+        for record in reversed(await self.read(fixture_id)):
+            if record["type"] == "status" and record["status"] == "finished":
+                return record.get("stats")
+        return None
+
+    async def active_streams(self) -> List[str]:
+        cutoff = int((time.time() - settings.LIVE_EVENTS_TTL_SECONDS) * 1000)
+        await self.redis.zremrangebyscore(ACTIVE_STREAMS_KEY, "-inf", cutoff)
+        return await self.redis.zrange(ACTIVE_STREAMS_KEY, 0, -1)
+
+
+class LiveEventConsumer:
+    # Groupe de consommateurs sur tous les flux actifs. Chaque groupe avance à son rythme et
+    # reprend depuis le début du flux à sa création ; plusieurs processus d'un même groupe se
+    # partagent les messages, ceux d'un consommateur arrêté sont réclamés après claim_idle_ms.
+
+    group: str = ""
+
+    def __init__(self, redis, consumer: Optional[str] = None, count: int = 100,
+                 block_ms: int = 2000, claim_idle_ms: int = 60000):
+        self.redis = redis
+        self.log = LiveEventLog(redis)
+        self.consumer = consumer or default_instance_id()
+        self.count = count
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self._grouped: Set[str] = set()
+
+    async def handle(self, fixture_id: int, records: List[Dict]):
+        raise NotImplementedError
+
+    async def _ensure_group(self, key: str):
+        try:
+            await self.redis.xgroup_create(key, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._grouped.add(key)
+
+    async def _process(self, key: str, entries) -> int:
+        entries = [(entry_id, fields) for entry_id, fields in entries if fields]
+        if not entries:
+            return 0
+        await self.handle(stream_fixture_id(key), [decode_entry(entry_id, fields) for entry_id, fields in entries])
+        # Acquittement après traitement : un échec laisse les messages en attente (rejoués)
+        await self.redis.xack(key, self.group, *[entry_id for entry_id, _ in entries])
+        return len(entries)
+
+    async def claim_stale(self, key: str) -> int:
+        _, entries, *_ = await self.redis.xautoclaim(
+            key, self.group, self.consumer, self.claim_idle_ms, start_id="0-0", count=self.count
+        )
+        return await self._process(key, entries)
+
+    async def poll(self) -> int:
+        streams = await self.log.active_streams()
+        if not streams:
+            await asyncio.sleep(self.block_ms / 1000)
+            return 0
+
+        handled = 0
+        for key in streams:
+            if key not in self._grouped:
+                await self._ensure_group(key)
+                handled += await self.claim_stale(key)
+
+        response = await self.redis.xreadgroup(
+            self.group, self.consumer, {key: ">" for key in streams},
+            count=self.count, block=self.block_ms,
+        )
+        for key, entries in response or []:
+            handled += await self._process(key, entries)
+        return handled
+
+    async def run(self):
+        print(f"[{self.group}] consommateur {self.consumer} démarré")
+        last_claim = time.monotonic()
+        while True:
+            try:
+                await self.poll()
+                if time.monotonic() - last_claim > self.claim_idle_ms / 1000:
+                    for key in await self.log.active_streams():
+                        await self.claim_stale(key)
+                    last_claim = time.monotonic()
+            except Exception as e:
+                print(f"[{self.group}] erreur : {e}")
+                await asyncio.sleep(5)
+
+
+class MatchPersister(LiveEventConsumer):
+    # Incidents enregistrés en base au fil du match ; statistiques, indicateurs et
+    # agrégats joueurs au coup de sifflet final
+
+    group = "persister"
+
+    def __init__(self, service, **options):
+        super().__init__(service.redis, **options)
+        self.service = service
+
+    async def handle(self, fixture_id: int, records: List[Dict]):
+        incidents = [record["incident"] for record in records if record["type"] == "incident"]
+        finished = [record for record in records if record["type"] == "status" and record["status"] == "finished"]
+        if incidents or finished:
+            await self.service.persist_match_data(
+                fixture_id, incidents=incidents, final=bool(finished),
+                stats=finished[-1].get("stats") if finished else None
+            )
+
+
+class LiveEventFanout:
+    # Diffusion aux clients WebSocket d'un processus API. Chaque processus doit recevoir tous
+    # les événements : lecture XREAD (pas de groupe), une seule lecture bloquante pour tous
+    # les clients connectés.
+
+    def __init__(self, redis, block_ms: int = 1000, queue_size: int = 1000):
+        self.redis = redis
+        self.block_ms = block_ms
+        self.queue_size = queue_size
+        self.subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._last_ids: Dict[int, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def subscribe(self, fixture_id: int) -> asyncio.Queue:
+        if fixture_id not in self.subscribers:
+            last = await self.redis.xrevrange(stream_key(fixture_id), count=1)
+            # Un autre client du même match a pu s'abonner pendant l'attente : on garde sa position
+            self._last_ids.setdefault(fixture_id, last[0][0] if last else "0-0")
+            self.subscribers.setdefault(fixture_id, set())
+        queue = asyncio.Queue(self.queue_size)
+        self.subscribers[fixture_id].add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, fixture_id: int, queue: asyncio.Queue):
+        queues = self.subscribers.get(fixture_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[fixture_id]
+            self._last_ids.pop(fixture_id, None)
+        if not self.subscribers and self._task is not None:
+            # Plus aucun client : la lecture bloquante est abandonnée tout de suite
+            self._task.cancel()
+            self._task = None
+
+    def _publish(self, fixture_id: int, record: Dict):
+        for queue in self.subscribers.get(fixture_id, ()):
+            if queue.full():
+                # Client trop lent : l'événement le plus ancien est perdu, il peut se resynchroniser avec ?since=
+                queue.get_nowait()
+            queue.put_nowait(record)
+
+    async def _run(self):
+        while self.subscribers:
+            try:
+                streams = {stream_key(fixture_id): self._last_ids[fixture_id] for fixture_id in list(self.subscribers)}
+                response = await self.redis.xread(streams, count=100, block=self.block_ms)
+                for key, entries in response or []:
+                    fixture_id = stream_fixture_id(key)
+                    for entry_id, fields in entries:
+                        if fixture_id in self._last_ids:
+                            self._last_ids[fixture_id] = entry_id
+                        self._publish(fixture_id, decode_entry(entry_id, fields))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[fanout] erreur : {e}")
+                await asyncio.sleep(1)
@@ -0,0 +1,105 @@
+import json
+import time
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import LIVE_LAG_SECONDS
+
+# Étapes d'une donnée live, chacune mesurée depuis le changement côté Sofascore
+# (event.changes.changeTimestamp) : lue par le tracker, écrite au journal et au cache,
+# servie par l'API, poussée en WebSocket
+STAGES = ("fetched", "streamed", "cached", "api", "websocket")
+
+LAG_BOARD_KEY = "live:lag"
+
+
+def upstream_changed_at(match_details: Dict) -> Optional[float]:
+    return match_details.get("event", {}).get("changes", {}).get("changeTimestamp")
+
+
+def observe(stage: str, fixture_id: int, changed_at: Optional[float], at: Optional[float] = None):
+    if changed_at is None:
+        return
+    lag = (at or time.time()) - changed_at
+    LIVE_LAG_SECONDS.labels(stage, str(fixture_id)).observe(max(lag, 0.0))
+
+
+def forget(fixture_id: int):
+    # Match terminé : séries retirées, le label fixture ne s'accumule pas
+    for stage in STAGES:
+        try:
+            LIVE_LAG_SECONDS.remove(stage, str(fixture_id))
+        except KeyError:
+            pass
+
+
+class DeliveryLag:
+    # Une mesure par changement et par processus : un changement servi cent fois
+    # par l'API ne compte qu'à sa première livraison. Les processus API n'ont pas le
+    # forget() du tracker : séries retirées ici à la livraison d'un statut final.
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._last: Dict[int, float] = {}
+
+    def delivered(self, fixture_id: int, latency: Optional[Dict], final: bool = False):
+        if final:
+            self.evict(fixture_id)
+            return
+        changed_at = (latency or {}).get("upstream_changed_at")
+        if changed_at is None or self._last.get(fixture_id, 0) >= changed_at:
+            return
+        self._last[fixture_id] = changed_at
+        observe(self.stage, fixture_id, changed_at)
+        self._prune()
+
+    def evict(self, fixture_id: int):
+        self._last.pop(fixture_id, None)
+        try:
+            LIVE_LAG_SECONDS.remove(self.stage, str(fixture_id))
+        except KeyError:
+            pass
+
+    def _prune(self):
+        # Match abandonné sans statut final : oublié après la durée maximale d'un match
+        cutoff = time.time() - settings.LIVE_MATCH_MAX_MINUTES * 60
+        for fixture_id in [f for f, changed_at in self._last.items() if changed_at < cutoff]:
+            self.evict(fixture_id)
+
+
+class LagBoard:
+    # Derniers horodatages de chaque match suivi (HASH live:lag : match -> JSON),
+    # lus par GET /live/debug/lag
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def update(self, fixture_id: int, status: str, latency: Dict):
+        await self.redis.hset(LAG_BOARD_KEY, str(fixture_id), json.dumps({"status": status, **latency}))
+
+    async def forget(self, fixture_id: int):
+        await self.redis.hdel(LAG_BOARD_KEY, str(fixture_id))
+
+    async def snapshot(self, now: Optional[float] = None) -> List[Dict]:
+        now = now or time.time()
+        rows = []
+        for fixture_id, data in (await self.redis.hgetall(LAG_BOARD_KEY)).items():
+            stamps = json.loads(data)
+            changed_at, fetched_at = stamps.get("upstream_changed_at"), stamps.get("fetched_at")
+            if fetched_at and now - fetched_at > settings.LIVE_MATCH_MAX_MINUTES * 60:
+                # Match abandonné par le tracker sans statut final
+                await self.forget(int(fixture_id))
+                continue
+            # Âge de la dernière lecture et délai de prise en compte du dernier changement
+            data_age = round(now - fetched_at, 1) if fetched_at else None
+            change_lag = round(stamps["cached_at"] - changed_at, 1) if changed_at and stamps.get("cached_at") else None
+            rows.append({
+                "sofascore_id": int(fixture_id),
+                **stamps,
+                "data_age_seconds": data_age,
+                "last_change_lag_seconds": change_lag,
+                "slo_breached": any(
+                    lag is not None and lag > settings.LIVE_FRESHNESS_SLO_SECONDS for lag in (data_age, change_lag)
+                ),
+            })
+        return sorted(rows, key=lambda row: row["data_age_seconds"] or 0, reverse=True)
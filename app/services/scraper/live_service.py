@@ -1,30 +1,59 @@
 import json
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 import asyncio
 
-import redis.asyncio as redis
-from sofascore_wrapper.api import SofascoreAPI
 from sofascore_wrapper.match import Match
 
+from app.core.config import settings
+from app.core.metrics import InstrumentedRedis, LIVE_TRACKER_OWNED_FIXTURES, record_cache_lookups
+from app.core.tracing import traced
 from app.db.database import AsyncSessionLocal
+from app.services.scraper.kickoff_index import KickoffIndex
+from app.services.scraper import live_clock, live_latency
+from app.services.scraper.live_events import LiveEventLog
+from app.services.scraper.live_latency import LagBoard
+from app.services.scraper.metered_api import MeteredSofascoreAPI
+from app.services.scraper.stat_timeline import StatTimeline
+from app.services.scraper.tracker_cluster import TrackerCluster
 from app.services.scraper.match_event_service import ingest_match_events
 from app.services.scraper.statistics_service import ingest_match_statistics
-from app.db.models import Fixture
+from app.services.player_aggregate_service import refresh_player_season_aggregates
+from app.services.standings_engine import compute_season_standings, recompute_standings
+from app.db.models import Fixture, MatchStatus
 from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+LIVE_STANDINGS_TTL = 300
+# Durée minimale du cache live ; prolongée pendant les phases calmes (pas de relecture prévue)
+LIVE_CACHE_TTL = 120
+
+# Statuts Sofascore après lesquels un match n'est plus suivi
+FINAL_STATUSES = ("finished", "canceled", "cancelled", "postponed", "abandoned")
+# Statuts Sofascore reportés en base ; les autres (interrupted, delayed...) n'y sont pas écrits
+DB_STATUSES = {**{status.value: status for status in MatchStatus}, "canceled": MatchStatus.CANCELLED}
+
 
 class LiveMatchService:
 
     def __init__(self, redis_url: str = "redis://localhost:6379"):
-        self.redis = redis.from_url(redis_url, decode_responses=True)
-        self.api = SofascoreAPI()
+        self.redis = InstrumentedRedis.from_url(redis_url, decode_responses=True)
+        self.api = MeteredSofascoreAPI()
+        self.events = LiveEventLog(self.redis)
+        self.timeline = StatTimeline(InstrumentedRedis.from_url(redis_url))
+        self.lag_board = LagBoard(self.redis)
+        # Dernier changeTimestamp vu par match : le retard n'est mesuré qu'une fois par changement
+        self._last_changes: Dict[int, float] = {}
+        # Tracker : prochaine lecture prévue par match, début de la mi-temps observé
+        self._next_polls: Dict[int, float] = {}
+        self._halftime_since: Dict[int, float] = {}
         self.active_matches = set()
 
     async def close(self):
         await self.redis.close()
+        await self.timeline.redis.close()
         await self.api.close()
 
     # DÉTECTION DES MATCHS LIVE
@@ -35,15 +64,13 @@ class LiveMatchService:
 
         fixture_ids = set()
         if db:
-            # Utilise la session FastAPI existante
+            # Utilise la session FastAPI existante (identifiants uniquement)
             result = await db.execute(
-                select(Fixture).options(
-                    selectinload(Fixture.home_team),
-                    selectinload(Fixture.away_team),
-                    selectinload(Fixture.league),
-                ).where(Fixture.date.between(one_hour_before, three_hours_after))
+                select(Fixture.sofascore_id).where(
+                    Fixture.date.between(one_hour_before, three_hours_after)
+                )
             )
-            fixture_ids.update([row[0] for row in result.all()])
+            fixture_ids.update(result.scalars().all())
 
         # Sofascore live_games
         try:
@@ -65,15 +92,6 @@ class LiveMatchService:
         home_score = event.get("homeScore", {})
         away_score = event.get("awayScore", {})
 
-        minute = None
-        time_info = event.get("time", {})
-        period_start = time_info.get("currentPeriodStartTimestamp")
-        initial = time_info.get("initial", 0)
-
-        if period_start:
-            elapsed = int((datetime.utcnow().timestamp() - period_start))
-            minute = int((initial + elapsed) / 60)
-
         return {
             "home_team": {
                 "id": event.get("homeTeam", {}).get("id"),
@@ -93,7 +111,8 @@ class LiveMatchService:
                 "home_period2": home_score.get("period2"),
                 "away_period2": away_score.get("period2"),
             },
-            "minute": minute,
+            # Minute et temps additionnel calculés à la lecture (live_clock.match_clock)
+            "clock": live_clock.clock_info(event),
             "status_description": event.get("status", {}).get("description"),
             "tournament": event.get("tournament", {}).get("name"),
             "start_timestamp": event.get("startTimestamp"),
@@ -219,9 +238,12 @@ class LiveMatchService:
                 "fixture_id": fixture_id,
                 "timestamp": datetime.utcnow().isoformat(),
                 "status": status,
+                "latency": {"upstream_changed_at": live_latency.upstream_changed_at(match_details)},
                 "match_info": self._parse_match_info(match_details),
                 "incidents": None,
+                "raw_incidents": [],
                 "stats": None,
+                "raw_stats": None,
                 "lineups": None,
             }
 
@@ -230,12 +252,14 @@ class LiveMatchService:
                 try:
                     raw_incidents = await match.incidents()
                     live_data["incidents"] = self._parse_incidents(raw_incidents)
+                    live_data["raw_incidents"] = (raw_incidents or {}).get("incidents", [])
                 except Exception:
                     live_data["incidents"] = None
 
                 try:
                     raw_stats = await match.stats()
                     live_data["stats"] = self._parse_stats(raw_stats)
+                    live_data["raw_stats"] = raw_stats
                 except Exception:
                     live_data["stats"] = None
 
@@ -251,6 +275,7 @@ class LiveMatchService:
             except Exception:
                 live_data["lineups"] = None
 
+            live_data["latency"]["fetched_at"] = time.time()
             return live_data
 
         except Exception:
@@ -258,84 +283,282 @@ class LiveMatchService:
 
     # CACHE REDIS
     async def cache_live_data(self, fixture_id: int, data: Dict):
-        key = f"live:fixture:{fixture_id}"
-        await self.redis.setex(key, 120, json.dumps(data))
+        payload = json.dumps(data)
+        ttl = max(LIVE_CACHE_TTL, int(data.get("next_poll_at", 0) - time.time()) + settings.LIVE_POLL_SECONDS)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.setex(f"live:fixture:{fixture_id}", ttl, payload)
+            # Copie longue durée, servie si Sofascore est indisponible
+            pipe.setex(f"live:stale:{fixture_id}", settings.LIVE_STALE_TTL_SECONDS, payload)
+            await pipe.execute()
 
     async def get_cached_live_data(self, fixture_id: int) -> Optional[Dict]:
         key = f"live:fixture:{fixture_id}"
         data = await self.redis.get(key)
+        record_cache_lookups(hits=int(bool(data)), misses=int(not data))
+        return json.loads(data) if data else None
+
+    async def get_stale_live_data(self, fixture_id: int) -> Optional[Dict]:
+        data = await self.redis.get(f"live:stale:{fixture_id}")
         return json.loads(data) if data else None
 
+    async def get_cached_live_data_many(self, fixture_ids: List[int]) -> Dict[int, Dict]:
+        # Un seul aller-retour Redis (MGET) pour tous les matchs demandés
+        if not fixture_ids:
+            return {}
+        keys = [f"live:fixture:{fixture_id}" for fixture_id in fixture_ids]
+        values = await self.redis.mget(keys)
+        hits = sum(1 for data in values if data)
+        record_cache_lookups(hits=hits, misses=len(values) - hits)
+        return {
+            fixture_id: json.loads(data)
+            for fixture_id, data in zip(fixture_ids, values)
+            if data
+        }
+
     # UPDATE & PERSISTANCE
+    @traced("live.update_live_match")
     async def update_live_match(self, fixture_id: int) -> Optional[Dict]:
         try:
             live_data = await self.fetch_live_data(fixture_id)
             if not live_data:
                 return None
+            # Incidents et statistiques bruts : journal durable (persistance, diffusion), pas le cache
+            raw_incidents = live_data.pop("raw_incidents")
+            raw_stats = live_data.pop("raw_stats")
+            latency = live_data["latency"]
+            await self.events.append(
+                fixture_id, live_data["status"], live_data["match_info"]["score"], raw_incidents, latency,
+                stats=raw_stats
+            )
+            latency["streamed_at"] = time.time()
+            now = time.time()
+            if live_data["status"] == "inprogress" and live_data["stats"]:
+                position = live_clock.timeline_position(live_data["match_info"].get("clock"), now)
+                await self.timeline.record(fixture_id, position, live_data["stats"])
+            live_data["next_poll_at"] = self._quiet_until(fixture_id, live_data, now)
+            latency["cached_at"] = time.time()
             await self.cache_live_data(fixture_id, live_data)
-            await self.update_fixture_status(fixture_id, live_data["status"])
+            await self._record_latency(fixture_id, live_data["status"], latency)
+            try:
+                await self.update_fixture_status(
+                    fixture_id, live_data["status"], live_data["match_info"]["score"]
+                )
+            except Exception as e:
+                # Données live publiées : le tracker doit voir le statut final même si la base refuse
+                print(f"[live] {fixture_id} : statut {live_data['status']} non enregistré ({e})")
             return live_data
         except Exception:
             return None
 
-    async def update_fixture_status(self, sofascore_id: int, status: str):
+    def _quiet_until(self, fixture_id: int, live_data: Dict, now: float) -> float:
+        if live_data["match_info"]["clock"]["status_code"] == live_clock.HALFTIME:
+            self._halftime_since.setdefault(fixture_id, now)
+        else:
+            self._halftime_since.pop(fixture_id, None)
+        return live_clock.quiet_until(
+            live_data["status"], live_data["match_info"], now, self._halftime_since.get(fixture_id)
+        )
+
+    async def _record_latency(self, fixture_id: int, status: str, latency: Dict):
+        changed_at = latency.get("upstream_changed_at")
+        if changed_at and self._last_changes.get(fixture_id) != changed_at:
+            self._last_changes[fixture_id] = changed_at
+            for stage in ("fetched", "streamed", "cached"):
+                live_latency.observe(stage, fixture_id, changed_at, latency[f"{stage}_at"])
+        if status in FINAL_STATUSES:
+            self._last_changes.pop(fixture_id, None)
+            live_latency.forget(fixture_id)
+            await self.lag_board.forget(fixture_id)
+        else:
+            await self.lag_board.update(fixture_id, status, latency)
+
+    async def update_fixture_status(self, sofascore_id: int, status: str, score: Optional[Dict] = None):
+        table_changed = False
+
         async with AsyncSessionLocal() as session:
             async with session.begin():
                 query = select(Fixture).where(Fixture.sofascore_id == sofascore_id)
                 result = await session.execute(query)
                 fixture = result.scalar_one_or_none()
 
-                if fixture and fixture.status != status:
-                    fixture.status = status
+                if not fixture:
+                    return
+
+                # Score courant reporté en base pendant le match
+                if score and status in ["inprogress", "finished"]:
+                    if (fixture.home_score, fixture.away_score) != (score.get("home"), score.get("away")):
+                        fixture.home_score = score.get("home")
+                        fixture.away_score = score.get("away")
+                        table_changed = True
+
+                db_status = DB_STATUSES.get(status)
+                if db_status is not None and fixture.status != db_status:
+                    fixture.status = db_status
+                    table_changed = True
+                    # Événements et statistiques : MatchPersister (groupe "persister" du journal)
                     if status == "finished":
-                        await self.persist_match_data(sofascore_id)
-            await session.commit()
+                        if fixture.group_name:
+                            await recompute_standings(session, fixture.season_id)
+
+                season_id = fixture.season_id
+                group_name = fixture.group_name
+
+        if table_changed and group_name:
+            await self.refresh_live_standings(season_id)
 
-    async def persist_match_data(self, fixture_id: int):
-        cached_data = await self.get_cached_live_data(fixture_id)
-        if not cached_data:
-            return
+    # CLASSEMENT LIVE
+    @traced("live.refresh_live_standings")
+    async def refresh_live_standings(self, season_id: int) -> Dict:
+        # Matchs terminés + scores en cours, recalculé à chaque but ou fin de match
+        async with AsyncSessionLocal() as session:
+            standings = await compute_season_standings(session, season_id, include_live=True)
+
+        data = {
+            "season_id": season_id,
+            "timestamp": datetime.utcnow().isoformat(),
+            "standings": standings,
+        }
+        await self.redis.setex(f"live:standings:{season_id}", LIVE_STANDINGS_TTL, json.dumps(data))
+        return data
+
+    async def get_live_standings(self, season_id: int) -> Dict:
+        data = await self.redis.get(f"live:standings:{season_id}")
+        if data:
+            return json.loads(data)
+        return await self.refresh_live_standings(season_id)
+
+    @traced("live.persist_match_data")
+    async def persist_match_data(self, fixture_id: int, incidents: Optional[List[Dict]] = None, final: bool = True,
+                                 stats: Optional[Dict] = None):
+        # incidents : bruts, tels que dans le journal live:events (tout le journal par défaut).
+        # final : statistiques (brutes, portées par le statut "finished" du journal), indicateurs
+        # et agrégats joueurs du match terminé.
+        if incidents is None:
+            incidents = await self.events.incidents(fixture_id)
+        if final and stats is None:
+            stats = await self.events.final_stats(fixture_id)
 
         async with AsyncSessionLocal() as session:
             async with session.begin():
-                fixture_query = select(Fixture).where(Fixture.sofascore_id == fixture_id)
+                fixture_query = select(Fixture).options(
+                    joinedload(Fixture.home_team), joinedload(Fixture.away_team)
+                ).where(Fixture.sofascore_id == fixture_id)
                 result = await session.execute(fixture_query)
                 fixture = result.scalar_one_or_none()
 
                 if not fixture:
                     return
 
-                if cached_data.get("incidents"):
+                if incidents:
                     await ingest_match_events(
                         session,
-                        cached_data["incidents"],
+                        {"incidents": incidents},
                         fixture.id,
                         fixture.home_team_id,
-                        fixture.away_team_id
+                        fixture.away_team_id,
+                        season_id=fixture.season_id
                     )
 
-                if cached_data.get("stats"):
+                if not final:
+                    return
+
+                if stats:
                     await ingest_match_statistics(
                         session,
                         fixture.id,
                         fixture.home_team.sofascore_id,
                         fixture.away_team.sofascore_id,
-                        cached_data["stats"]
+                        stats,
+                        season_id=fixture.season_id
                     )
 
+                await self.timeline.flush(session, fixture.id, fixture_id)
+
                 fixture.has_events = True
                 fixture.has_statistics = True
-            await session.commit()
 
-        await self.redis.delete(f"live:fixture:{fixture_id}")
+                await refresh_player_season_aggregates(session, fixture.id)
+
+        # live:fixture laissé à son TTL : le tracker l'écrit après le statut "finished"
+        await self.timeline.discard(fixture_id)
+
+    # TRACKER
+    async def track_due_fixtures(self, index: KickoffIndex, now: datetime, cluster: Optional[TrackerCluster] = None) -> float:
+        # Un passage sur les matchs dont la fenêtre est ouverte ; renvoie l'attente avant le suivant.
+        # Avec un cluster, seuls les matchs dont cette instance détient le bail sont interrogés.
+        due = index.due(now)
+        for fixture_id, kickoff in due:
+            if index.is_over(kickoff, now):
+                print(f"[tracker] {fixture_id} : fenêtre de suivi dépassée, abandon")
+                index.discard(fixture_id)
+                self._next_polls.pop(fixture_id, None)
+        due = [(fixture_id, kickoff) for fixture_id, kickoff in due if fixture_id in index]
+
+        owned = {fixture_id for fixture_id, _ in due}
+        if cluster is not None:
+            instances = await cluster.heartbeat()
+            owned = await cluster.claim([fixture_id for fixture_id, _ in due], instances)
+            LIVE_TRACKER_OWNED_FIXTURES.set(len(owned))
+
+        started = time.perf_counter()
+        polled = 0
+        for fixture_id, _ in due:
+            # Phase calme : le cache reste valable, l'API recalcule la minute
+            if fixture_id not in owned or self._next_polls.get(fixture_id, 0) > time.time():
+                continue
+            if cluster is not None and fixture_id not in await cluster.keep_alive():
+                # Bail perdu pendant le passage : le match est suivi ailleurs
+                continue
+            live_data = await self.update_live_match(fixture_id)
+            polled += 1
+            if live_data:
+                self._next_polls[fixture_id] = live_data["next_poll_at"]
+            if live_data and live_data["status"] in FINAL_STATUSES:
+                self._next_polls.pop(fixture_id, None)
+                self._halftime_since.pop(fixture_id, None)
+                index.discard(fixture_id)
+                if cluster is not None:
+                    await cluster.release(fixture_id)
+            await asyncio.sleep(settings.LIVE_POLL_SPACING_SECONDS)
+
+        if cluster is not None:
+            await cluster.heartbeat(due=len(due), polled=polled, pass_seconds=round(time.perf_counter() - started, 2))
+
+        if due:
+            return settings.LIVE_POLL_SECONDS
+        next_wake = index.next_wake()
+        if next_wake is None:
+            return float("inf")
+        return max((next_wake - datetime.utcnow()).total_seconds(), 0)
 
     async def run_live_tracker(self):
-        while True:
-            try:
-                live_fixtures = await self.get_live_fixtures()
-                for fixture_id in live_fixtures:
-                    await self.update_live_match(fixture_id)
-                    await asyncio.sleep(1)
-                await asyncio.sleep(30)
-            except Exception:
-                await asyncio.sleep(60)
\ No newline at end of file
+        # Processus permanent : dort jusqu'au prochain coup d'envoi (moins le délai des
+        # compositions), suit les matchs jusqu'au coup de sifflet final ; l'index est
+        # rechargé périodiquement pour voir les matchs ajoutés ou déplacés par l'ingestion.
+        # Plusieurs processus se partagent les matchs en cours (TrackerCluster).
+        index = KickoffIndex(
+            lead=timedelta(minutes=settings.LIVE_LINEUP_LEAD_MINUTES),
+            max_duration=timedelta(minutes=settings.LIVE_MATCH_MAX_MINUTES),
+        )
+        cluster = TrackerCluster(self.redis, settings.LIVE_TRACKER_INSTANCE_ID or None, settings.LIVE_TRACKER_LEASE_SECONDS)
+        print(f"[tracker] instance {cluster.instance_id}")
+        next_refresh = 0.0
+        try:
+            while True:
+                try:
+                    if time.monotonic() >= next_refresh:
+                        async with AsyncSessionLocal() as session:
+                            changes = await index.refresh(session, datetime.utcnow())
+                        next_refresh = time.monotonic() + settings.LIVE_INDEX_REFRESH_SECONDS
+                        if any(changes.values()):
+                            print(f"[tracker] index : {changes}, {len(index)} match(s), réveil {index.next_wake()}")
+
+                    delay = await self.track_due_fixtures(index, datetime.utcnow(), cluster)
+                    # Sommeil borné par le bail : l'instance doit rester visible et garder ses matchs
+                    delay = min(delay, cluster.lease_ms / 1000 / 3)
+                    await asyncio.sleep(min(delay, max(next_refresh - time.monotonic(), 0)))
+                except Exception as e:
+                    print(f"[tracker] erreur : {e}")
+                    await asyncio.sleep(60)
+        finally:
+            await cluster.leave()
@@ -2,10 +2,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db.models import Manager, TeamManager, Team
 from app.utils.db_helpers import get_or_create
+from app.core.tracing import traced
 from datetime import datetime, date
 from typing import Optional
 
 
+@traced()
 async def ingest_manager(session: AsyncSession, manager_data: dict) -> Manager:
     
     sofascore_id = manager_data['id']
@@ -54,6 +56,7 @@ async def ingest_manager(session: AsyncSession, manager_data: dict) -> Manager:
     return manager
 
 
+@traced()
 async def ingest_manager_basic(session: AsyncSession, manager_basic_data: dict) -> int:
     
     sofascore_id = manager_basic_data['id']
@@ -76,6 +79,7 @@ async def ingest_manager_basic(session: AsyncSession, manager_basic_data: dict)
     return manager.sofascore_id
 
 
+@traced()
 async def link_manager_to_team(
     session: AsyncSession,
     team_sofascore_id: int,
@@ -119,6 +123,7 @@ async def link_manager_to_team(
     return team_manager
 
 
+@traced()
 async def ingest_match_managers(
     session: AsyncSession,
     match_id: int,
@@ -140,6 +145,7 @@ async def ingest_match_managers(
     
     return manager_ids
 
+@traced()
 async def ingest_managers_for_fixture(
     session: AsyncSession,
     api,
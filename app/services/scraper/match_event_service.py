@@ -1,9 +1,41 @@
 from sqlalchemy import select
 from app.db.models import MatchEvent, Player, Team, EventType
 from app.utils import get_or_create
+from app.core.tracing import traced
 
-async def ingest_match_events(session, incidents_data, fixture_id, home_team_id, away_team_id):
-    
+def incident_values(incident: dict, event_type: EventType) -> dict:
+    # Colonnes d'un événement (hors match, équipe et joueurs)
+    return {
+        "sofascore_id": incident.get("id"),
+        "type": event_type,
+        "minute": incident.get("time", 0),
+        "extra_minute": incident.get("addedTime"),
+        "is_home": incident.get("isHome", True),
+        "home_score": incident.get("homeScore"),
+        "away_score": incident.get("awayScore"),
+        "incident_class": incident.get("incidentClass"),
+        "reason": incident.get("reason"),
+        "detail": _build_event_detail(incident),
+        "comments": incident.get("description"),
+    }
+
+
+def incident_players(incident: dict):
+    # sofascore_id (joueur, passeur, joueur sortant) ; sur un changement, le joueur est l'entrant
+    player = incident.get("player", {}).get("id")
+    assist = incident.get("assist1", {}).get("id")
+    player_out = None
+
+    if incident.get("incidentType") == "substitution" and "playerOut" in incident:
+        player_out = incident["playerOut"]["id"]
+        if "playerIn" in incident:
+            player = incident["playerIn"]["id"]
+
+    return player, assist, player_out
+
+
+def match_incidents(incidents_data):
+    # (incident, type) des incidents retenus
     for incident in incidents_data.get("incidents", []):
         incident_type = incident.get("incidentType")
         
@@ -14,59 +46,37 @@ async def ingest_match_events(session, incidents_data, fixture_id, home_team_id,
         if not event_type:
             print(f"Type d'incident inconnu: {incident_type}")
             continue
+
+        yield incident, event_type
+
+
+@traced()
+async def ingest_match_events(session, incidents_data, fixture_id, home_team_id, away_team_id, season_id=None):
+    
+    for incident, event_type in match_incidents(incidents_data):
+        event_defaults = incident_values(incident, event_type)
         
-        is_home = incident.get("isHome", True)
-        team_id = home_team_id if is_home else away_team_id
-        
-        # Récupérer le joueur principal
-        player_id = None
-        if "player" in incident:
-            player_id = await _get_player_id(session, incident["player"]["id"])
-           
-        # Récupérer le passeur
-        assist_player_id = None
-        if "assist1" in incident:
-            assist_player_id = await _get_player_id(session, incident["assist1"]["id"])
-        
-        # Récupérer le joueur sortant
-        player_out_id = None
-        if incident_type == "substitution" and "playerOut" in incident:
-            player_out_id = await _get_player_id(session, incident["playerOut"]["id"])
+        if not event_defaults["sofascore_id"]:
+            print(f"Event sans ID Sofascore, ignoré: {incident.get('incidentType')}")
+            continue
 
-            if "playerIn" in incident:
-                player_id = await _get_player_id(session, incident["playerIn"]["id"])
+        player, assist, player_out = incident_players(incident)
         
         # Construire l'objet event
-        event_defaults = {
-            "sofascore_id": incident.get("id"),
+        event_defaults.update({
             "fixture_id": fixture_id,
-            "team_id": team_id,
-            "player_id": player_id,
-            "assist_player_id": assist_player_id,
-            "player_out_id": player_out_id,
-            "type": event_type,
-            "minute": incident.get("time", 0),
-            "extra_minute": incident.get("addedTime"),
-            "is_home": is_home,
-            "home_score": incident.get("homeScore"),
-            "away_score": incident.get("awayScore"),
-            "incident_class": incident.get("incidentClass"),
-            "reason": incident.get("reason"),
-            "detail": _build_event_detail(incident),
-            "comments": incident.get("description"),
-        }
-        
-        if not event_defaults["sofascore_id"]:
-            print(f"Event sans ID Sofascore, ignoré: {incident_type}")
-            continue
+            "team_id": home_team_id if event_defaults["is_home"] else away_team_id,
+            "player_id": await _get_player_id(session, player) if player else None,
+            "assist_player_id": await _get_player_id(session, assist) if assist else None,
+            "player_out_id": await _get_player_id(session, player_out) if player_out else None,
+        })
+        if season_id is not None:
+            event_defaults["season_id"] = season_id
         
         await get_or_create(
             session, MatchEvent, "sofascore_id",
             event_defaults["sofascore_id"], event_defaults
         )
-        
-        player_name = incident.get("player", {}).get("name", "N/A") if "player" in incident else "N/A"
-        # print(f"  Event {event_type.value} - {incident.get('time', 0)}' - {player_name}")
 
 def _map_incident_to_event_type(incident_type: str, incident: dict) -> EventType:
     
@@ -0,0 +1,44 @@
+import time
+from typing import Optional
+
+from opentelemetry.trace import SpanKind
+from sofascore_wrapper.api import SofascoreAPI
+
+from app.core.metrics import SOFASCORE_REQUEST_DURATION, SOFASCORE_REQUEST_ERRORS, endpoint_label
+from app.core.tracing import tracer
+from app.services.scraper.replay_api import _endpoint
+from app.services.scraper.transport import create_sofascore_client
+
+
+class MeteredSofascoreAPI(SofascoreAPI):
+    # Mesure durée et échecs de chaque appel, par gabarit d'endpoint (/event/{id}/lineups),
+    # et un span client par appel
+
+    def __init__(self, upstream: Optional[SofascoreAPI] = None):
+        super().__init__()
+        self.upstream = upstream or create_sofascore_client()
+
+    async def _get(self, endpoint):
+        label = endpoint_label(endpoint)
+        started = time.perf_counter()
+        with tracer.start_as_current_span(f"sofascore {label}", kind=SpanKind.CLIENT) as span:
+            span.set_attribute("sofascore.endpoint", endpoint)
+            try:
+                return await self.upstream._get(endpoint)
+            except Exception:
+                SOFASCORE_REQUEST_ERRORS.labels(label).inc()
+                raise
+            finally:
+                SOFASCORE_REQUEST_DURATION.labels(label).observe(time.perf_counter() - started)
+
+    def __getattr__(self, name):
+        # Attributs propres au transport (calls, missing du rejeu)
+        if name == "upstream":
+            raise AttributeError(name)
+        return getattr(self.upstream, name)
+
+    async def _raw_get(self, url):
+        return await self._get(_endpoint(url))
+
+    async def close(self):
+        await self.upstream.close()
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import random
+import re
+from pathlib import Path
+from typing import List, Optional
+
+from sofascore_wrapper.api import SofascoreAPI, BASE_URL
+
+from app.services.scraper.transport import create_sofascore_client
+
+
+def cassette_path(cassette_dir, endpoint: str) -> Path:
+    # Un fichier JSON par endpoint : /event/123/lineups -> event_123_lineups.json
+    name = re.sub(r"[^A-Za-z0-9._-]+", "_", endpoint.strip("/")).strip("_")
+    return Path(cassette_dir) / f"{name}.json"
+
+
+def _endpoint(url: str) -> str:
+    return url[len(BASE_URL):] if url.startswith(BASE_URL) else url
+
+
+class RecordingSofascoreAPI(SofascoreAPI):
+    # Passe les appels à l'API réelle et enregistre chaque réponse (erreurs comprises)
+
+    def __init__(self, cassette_dir, upstream: Optional[SofascoreAPI] = None):
+        super().__init__()
+        self.cassette_dir = Path(cassette_dir)
+        self.cassette_dir.mkdir(parents=True, exist_ok=True)
+        self.upstream = upstream or create_sofascore_client()
+        self.calls = 0
+
+    def _save(self, endpoint: str, payload: dict):
+        with open(cassette_path(self.cassette_dir, endpoint), "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+    async def _get(self, endpoint):
+        self.calls += 1
+        try:
+            data = await self.upstream._get(endpoint)
+        except Exception as e:
+            self._save(endpoint, {"__error__": str(e)})
+            raise
+        self._save(endpoint, data)
+        return data
+
+    async def _raw_get(self, url):
+        return await self._get(_endpoint(url))
+
+    async def close(self):
+        await self.upstream.close()
+
+
+class ReplaySofascoreAPI(SofascoreAPI):
+    # Rejoue les réponses enregistrées, avec une latence simulée par appel
+
+    def __init__(self, cassette_dir, latency: float = 0.0, jitter: float = 0.0):
+        super().__init__()
+        self.cassette_dir = Path(cassette_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self.missing: List[str] = []
+
+    async def _get(self, endpoint):
+        self.calls += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+
+        path = cassette_path(self.cassette_dir, endpoint)
+        if not path.exists():
+            # Même message que l'API réelle : les services le traitent comme un 404
+            self.missing.append(endpoint)
+            raise Exception(f"Failed to fetch {endpoint}: 404")
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        if isinstance(data, dict) and "__error__" in data:
+            raise Exception(data["__error__"])
+        return data
+
+    async def _raw_get(self, url):
+        return await self._get(_endpoint(url))
+
+    async def close(self):
+        pass
@@ -1,8 +1,10 @@
 from sqlalchemy import select
 from app.db.models import Standing, Team
 from app.utils import get_or_create
+from app.core.tracing import traced
 
 
+@traced()
 async def ingest_standings(session, standings_data, season_id):
 
     for standing_table in standings_data.get("standings", []):
@@ -18,17 +20,6 @@ async def ingest_standings(session, standings_data, season_id):
                 print(f"Team {row['team']['name']} (ID: {row['team']['id']}) non trouvée")
                 continue
 
-             # Vérifier si standing existe déjà
-            standing_query = select(Standing).where(
-                Standing.season_id == season_id,
-                Standing.team_id == team.id
-            )
-            standing_result = await session.execute(standing_query)
-            existing = standing_result.scalar_one_or_none()
-                
-            if existing:
-                continue
-
             standing_defaults = {
                 "sofascore_id": row["id"],
                 "season_id": season_id,
@@ -44,7 +35,21 @@ async def ingest_standings(session, standings_data, season_id):
                 "goal_difference": row["scoresFor"] - row["scoresAgainst"],
                 "points": row["points"],
             }
-            
+
+            # Mise à jour si la ligne existe déjà (éventuellement calculée par le moteur de classement)
+            standing_query = select(Standing).where(
+                Standing.season_id == season_id,
+                Standing.team_id == team.id,
+                Standing.group == group_name
+            )
+            standing_result = await session.execute(standing_query)
+            existing = standing_result.scalar_one_or_none()
+
+            if existing:
+                for field, value in standing_defaults.items():
+                    setattr(existing, field, value)
+                continue
+
             await get_or_create(
                 session, Standing, "sofascore_id",
                 standing_defaults["sofascore_id"], standing_defaults
@@ -0,0 +1,154 @@
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import MatchStatTimeline
+from app.services.scraper.live_clock import position_minute
+
+# Un échantillon = (position int16, delta domicile int32, delta extérieur int32), valeurs x100.
+# Position : minute de début de la période x 100 + minutes jouées (live_clock.timeline_position)
+SAMPLE = struct.Struct("<hii")
+SCALE = 100
+
+# Écart domicile - extérieur de ces stats (pondérées), minute par minute
+MOMENTUM_WEIGHTS = {
+    "expectedGoals": 4.0,
+    "bigChanceCreated": 1.5,
+    "shotsOnGoal": 1.0,
+    "totalShotsOnGoal": 0.5,
+    "cornerKicks": 0.3,
+    "touchesInOppBox": 0.1,
+}
+
+# Ajout des échantillons qui ont changé depuis le précédent (delta calculé côté Redis :
+# deux trackers successifs sur le même match gardent une série cohérente)
+#   KEYS : échantillons (HASH stat -> octets), dernières valeurs (HASH stat -> "dom:ext")
+#   ARGV : position, ttl, puis (stat, domicile, extérieur) par stat
+APPEND_SAMPLES = """
+local position = tonumber(ARGV[1])
+local written = 0
+for i = 3, #ARGV, 3 do
+  local stat, home, away = ARGV[i], tonumber(ARGV[i + 1]), tonumber(ARGV[i + 2])
+  local last = redis.call('hget', KEYS[2], stat)
+  local last_home, last_away = 0, 0
+  if last then
+    local sep = string.find(last, ':')
+    last_home, last_away = tonumber(string.sub(last, 1, sep - 1)), tonumber(string.sub(last, sep + 1))
+  end
+  if not last or home ~= last_home or away ~= last_away then
+    local samples = redis.call('hget', KEYS[1], stat) or ''
+    redis.call('hset', KEYS[1], stat, samples .. struct.pack('<hii', position, home - last_home, away - last_away))
+    redis.call('hset', KEYS[2], stat, ARGV[i + 1] .. ':' .. ARGV[i + 2])
+    written = written + 1
+  end
+end
+for _, key in ipairs(KEYS) do redis.call('expire', key, ARGV[2]) end
+return written
+"""
+
+
+def timeline_key(fixture_id: int) -> str:
+    return f"live:timeline:{fixture_id}"
+
+
+def stat_values(stats: Dict) -> Dict[str, Tuple[int, int]]:
+    # stat -> (domicile, extérieur) x100, depuis la période "all" de _parse_stats
+    values = {}
+    for group in (stats or {}).get("all", {}).values():
+        for key, item in group.items():
+            home, away = item.get("home"), item.get("away")
+            if isinstance(home, (int, float)) and isinstance(away, (int, float)):
+                values[key] = (round(home * SCALE), round(away * SCALE))
+    return values
+
+
+def decode_samples(data: bytes) -> List[Tuple[int, float, float]]:
+    # (position, domicile, extérieur) cumulés, un point par changement
+    series = []
+    home = away = 0
+    for position, home_delta, away_delta in SAMPLE.iter_unpack(data):
+        home += home_delta
+        away += away_delta
+        series.append((position, home / SCALE, away / SCALE))
+    return series
+
+
+def momentum(samples: Dict[str, bytes]) -> List[Tuple[int, float]]:
+    # (position, pression) : somme pondérée des gains domicile - extérieur dans la minute
+    by_position: Dict[int, float] = {}
+    for stat, weight in MOMENTUM_WEIGHTS.items():
+        if stat not in samples:
+            continue
+        for position, home_delta, away_delta in SAMPLE.iter_unpack(samples[stat]):
+            by_position[position] = by_position.get(position, 0.0) + weight * (home_delta - away_delta) / SCALE
+    return [(position, round(value, 2)) for position, value in sorted(by_position.items())]
+
+
+class StatTimeline:
+    # Historique des statistiques d'un match : en Redis pendant le match
+    # (live:timeline:<sofascore_id>), copié dans match_stat_timelines au coup de sifflet final
+
+    def __init__(self, redis):
+        # Client sans decode_responses : les échantillons sont binaires
+        self.redis = redis
+        self._append = redis.register_script(APPEND_SAMPLES)
+
+    async def record(self, fixture_id: int, position: Optional[int], stats: Dict) -> int:
+        values = stat_values(stats)
+        if position is None or not values:
+            return 0
+        args = [position, settings.LIVE_TIMELINE_TTL_SECONDS]
+        for stat, (home, away) in values.items():
+            args += [stat, home, away]
+        key = timeline_key(fixture_id)
+        return await self._append(keys=[key, f"{key}:last"], args=args)
+
+    async def load(self, fixture_id: int, session: Optional[AsyncSession] = None) -> Dict[str, bytes]:
+        # Redis pendant le match, sinon la copie en base
+        samples = await self.redis.hgetall(timeline_key(fixture_id))
+        if samples:
+            return {stat.decode(): data for stat, data in samples.items()}
+        if session is None:
+            return {}
+        result = await session.execute(
+            select(MatchStatTimeline.stat_key, MatchStatTimeline.samples)
+            .where(MatchStatTimeline.sofascore_id == fixture_id)
+        )
+        return dict(result.all())
+
+    async def flush(self, session: AsyncSession, fixture_id: int, sofascore_id: int):
+        # Dans la transaction de persistance du match ; clés Redis supprimées par discard()
+        samples = await self.redis.hgetall(timeline_key(sofascore_id))
+        if not samples:
+            return
+        await session.execute(delete(MatchStatTimeline).where(MatchStatTimeline.sofascore_id == sofascore_id))
+        session.add_all(
+            MatchStatTimeline(
+                fixture_id=fixture_id, sofascore_id=sofascore_id, stat_key=stat.decode(),
+                samples=data, sample_count=len(data) // SAMPLE.size,
+            )
+            for stat, data in samples.items()
+        )
+
+    async def discard(self, sofascore_id: int):
+        key = timeline_key(sofascore_id)
+        await self.redis.delete(key, f"{key}:last")
+
+
+def _point(position: int, **values) -> Dict:
+    minute, added_time = position_minute(position)
+    return {"minute": minute, "added_time": added_time, **values}
+
+
+def timeline_series(samples: Dict[str, bytes], stat_keys: Optional[Iterable[str]] = None) -> Dict:
+    keys = sorted(samples) if stat_keys is None else [key for key in stat_keys if key in samples]
+    return {
+        "stats": {
+            key: [_point(p, home=h, away=a) for p, h, a in decode_samples(samples[key])]
+            for key in keys
+        },
+        "momentum": [_point(p, value=v) for p, v in momentum(samples)],
+    }
@@ -2,6 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db.models import MatchStatistics, PlayerStatistics, TeamStatistics, Team, Player
 from app.utils import get_or_create, get_team_by_sofascore_id
+from app.core.tracing import traced
 
 
 # ==================== MATCH STATISTICS ====================
@@ -30,8 +31,9 @@ STATS_MAPPING = {
 }
 
 
+@traced()
 async def ingest_match_statistics(session, fixture_id, home_team_sofascore_id, 
-                                  away_team_sofascore_id, stats_data):
+                                  away_team_sofascore_id, stats_data, season_id=None):
     
     if not stats_data or 'statistics' not in stats_data:
         return
@@ -43,18 +45,26 @@ async def ingest_match_statistics(session, fixture_id, home_team_sofascore_id,
         print(f"Équipes introuvables pour le match {fixture_id}")
         return
     
-    all_period_stats = next(
-        (s for s in stats_data['statistics'] if s['period'] == 'ALL'), None
-    )
+    values = match_statistics_values(stats_data)
     
-    if not all_period_stats:
+    if not values:
         print(f"Pas de stats 'ALL' pour le match {fixture_id}")
         return
     
-    home_stats, away_stats = _extract_statistics(all_period_stats)
+    home_stats, away_stats = values
     
-    await _save_team_statistics(session, fixture_id, home_team_db_id, home_stats)
-    await _save_team_statistics(session, fixture_id, away_team_db_id, away_stats)
+    await _save_team_statistics(session, fixture_id, home_team_db_id, home_stats, season_id)
+    await _save_team_statistics(session, fixture_id, away_team_db_id, away_stats, season_id)
+
+
+def match_statistics_values(stats_data):
+    # (stats domicile, stats extérieur) sur le match entier, None si absentes
+    all_period_stats = next(
+        (s for s in stats_data.get('statistics', []) if s['period'] == 'ALL'), None
+    )
+    if not all_period_stats:
+        return None
+    return _extract_statistics(all_period_stats)
 
 
 def _extract_statistics(all_period_stats):
@@ -140,7 +150,7 @@ def _process_percentage_stats(key, stat_item, home_stats, away_stats):
         away_stats['aerials_lost'] = away_total - away_stats['aerials_won']
 
 
-async def _save_team_statistics(session, fixture_id, team_db_id, stats):
+async def _save_team_statistics(session, fixture_id, team_db_id, stats, season_id=None):
     
     existing = await session.execute(
         MatchStatistics.__table__.select().where(
@@ -150,6 +160,8 @@ async def _save_team_statistics(session, fixture_id, team_db_id, stats):
     )
     
     if not existing.first():
+        if season_id is not None:
+            stats = {**stats, "season_id": season_id}
         stats_obj = MatchStatistics(
             fixture_id=fixture_id,
             team_id=team_db_id,
@@ -161,6 +173,7 @@ async def _save_team_statistics(session, fixture_id, team_db_id, stats):
 
 # ==================== PLAYER STATISTICS ====================
 
+@traced()
 async def ingest_player_season_statistics(
     session: AsyncSession,
     player_id: int,
@@ -248,6 +261,7 @@ async def ingest_player_season_statistics(
     return player_stats
 
 
+@traced()
 async def ingest_all_players_statistics(
     session: AsyncSession,
     api,
@@ -291,6 +305,7 @@ async def ingest_all_players_statistics(
 
 # ==================== TEAM STATISTICS ====================
 
+@traced()
 async def ingest_team_season_statistics(
     session: AsyncSession,
     team_id: int,
@@ -379,6 +394,7 @@ async def ingest_team_season_statistics(
     return team_stats
 
 
+@traced()
 async def ingest_all_teams_statistics(
     session: AsyncSession,
     api,
@@ -3,27 +3,21 @@ from datetime import datetime
 from sofascore_wrapper.team import Team as TeamWrapper
 from app.db.models import Team, Player
 from app.utils import get_or_create
+from app.core.tracing import traced
 
 
-async def ingest_team(session, api, team_data):
-    
-    team_id = team_data["id"]
+PLACEHOLDER_TEAM_KEYWORDS = ["play-off", "winner", "tbd", "to be determined", "qualifier"]
+
 
+def is_placeholder_team(team_data) -> bool:
+    # Équipe pas encore connue (vainqueur de..., TBD)
     team_name = team_data.get("name", "")
-    skip_keywords = ["play-off", "winner", "tbd", "to be determined", "qualifier"]
-    if any(keyword in team_name.lower() for keyword in skip_keywords):
-        print(f"  Team '{team_name}' (future/TBD) skip")
-        return None
-    
-    team_flag_url = None
-    try:
-        team_wrapper = TeamWrapper(api, team_id)
-        team_flag_url = await team_wrapper.image()
-    except Exception as e:
-        print(f"Erreur récupération drapeau {team_data['name']}: {str(e)}")
-    
-    team_defaults = {
-        "sofascore_id": team_id,
+    return any(keyword in team_name.lower() for keyword in PLACEHOLDER_TEAM_KEYWORDS)
+
+
+def team_values(team_data, logo_url=None):
+    return {
+        "sofascore_id": team_data["id"],
         "name": team_data["name"],
         "slug": team_data["slug"],
         "short_name": team_data.get("shortName"),
@@ -31,12 +25,31 @@ async def ingest_team(session, api, team_data):
         # "country": team_data["country"]["name"],
         "country": team_data.get("country", {}).get("name"),
         "national": team_data.get("national", True),
-        "logo_url": team_flag_url,
+        "logo_url": logo_url,
         # "primary_color": team_data["teamColors"]["primary"],
         # "secondary_color": team_data["teamColors"]["secondary"],
         "primary_color": team_data.get("teamColors", {}).get("primary"),
         "secondary_color": team_data.get("teamColors", {}).get("secondary"),
     }
+
+
+@traced()
+async def ingest_team(session, api, team_data):
+    
+    team_id = team_data["id"]
+
+    if is_placeholder_team(team_data):
+        print(f"  Team '{team_data.get('name', '')}' (future/TBD) skip")
+        return None
+    
+    team_flag_url = None
+    try:
+        team_wrapper = TeamWrapper(api, team_id)
+        team_flag_url = await team_wrapper.image()
+    except Exception as e:
+        print(f"Erreur récupération drapeau {team_data['name']}: {str(e)}")
+    
+    team_defaults = team_values(team_data, team_flag_url)
     
     return await get_or_create(
         session, Team, "sofascore_id",
@@ -65,6 +78,7 @@ async def ingest_team(session, api, team_data):
 #     except Exception as e:
 #         print(f"Erreur ingestion joueurs équipe {team_sofascore_id}: {str(e)}")
 
+@traced()
 async def ingest_players_for_team(session, api, team_sofascore_id, team_db_id):
     
     try:
@@ -108,6 +122,7 @@ async def ingest_players_for_team(session, api, team_sofascore_id, team_db_id):
             print(f"  Erreur joueurs équipe {team_sofascore_id}: {str(e)}")
 
 
+@traced()
 async def ingest_player(session, player_data, team_db_id=None):
     
     sofascore_id = player_data.get('id')
@@ -0,0 +1,132 @@
+import math
+import os
+import socket
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+# Renouvellement / libération d'un bail seulement par son propriétaire
+RENEW_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+  return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+  return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+INSTANCES_KEY = "tracker:instances"
+
+
+def default_instance_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class TrackerCluster:
+    # Répartition des matchs entre processus live_tracker, coordonnée par Redis :
+    #   tracker:instances        ZSET instance -> expiration du heartbeat (ms)
+    #   tracker:load:<instance>  HASH charge déclarée (matchs détenus, appels du dernier passage...)
+    #   tracker:lease:<match>    propriétaire du match (SET NX PX), renouvelé à chaque passage
+    #                            et pendant le passage (keep_alive), qui peut durer plus qu'un bail
+    # Un tracker arrêté ou planté perd ses baux à expiration : les autres reprennent ses matchs.
+
+    def __init__(self, redis, instance_id: Optional[str] = None, lease_seconds: float = 90):
+        self.redis = redis
+        self.instance_id = instance_id or default_instance_id()
+        self.lease_ms = int(lease_seconds * 1000)
+        self.owned: Set[int] = set()
+        self._renewed_at = 0.0
+        self._renew = redis.register_script(RENEW_LEASE)
+        self._release = redis.register_script(RELEASE_LEASE)
+
+    def _lease_key(self, fixture_id: int) -> str:
+        return f"tracker:lease:{fixture_id}"
+
+    def _load_key(self, instance_id: str) -> str:
+        return f"tracker:load:{instance_id}"
+
+    async def heartbeat(self, **load) -> int:
+        # Enregistre l'instance et sa charge ; renvoie le nombre d'instances vivantes
+        now_ms = int(time.time() * 1000)
+        load_key = self._load_key(self.instance_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(INSTANCES_KEY, {self.instance_id: now_ms + self.lease_ms})
+            pipe.zremrangebyscore(INSTANCES_KEY, "-inf", now_ms)
+            pipe.hset(load_key, mapping={"owned": len(self.owned), "heartbeat_ms": now_ms, **load})
+            pipe.pexpire(load_key, self.lease_ms)
+            pipe.zcard(INSTANCES_KEY)
+            results = await pipe.execute()
+        return results[-1]
+
+    async def instances(self) -> List[Dict]:
+        await self.redis.zremrangebyscore(INSTANCES_KEY, "-inf", int(time.time() * 1000))
+        instance_ids = await self.redis.zrange(INSTANCES_KEY, 0, -1)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for instance_id in instance_ids:
+                pipe.hgetall(self._load_key(instance_id))
+            loads = await pipe.execute()
+        return [{"instance": instance_id, **load} for instance_id, load in zip(instance_ids, loads)]
+
+    async def renew(self) -> Set[int]:
+        # Baux détenus prolongés d'une durée complète ; ceux perdus entre-temps sont oubliés
+        owned = sorted(self.owned)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for fixture_id in owned:
+                await self._renew(keys=[self._lease_key(fixture_id)], args=[self.instance_id, self.lease_ms], client=pipe)
+            results = await pipe.execute()
+        for fixture_id, renewed in zip(owned, results):
+            if not renewed:
+                # Bail expiré puis repris ailleurs (pause GC, coupure Redis...)
+                self.owned.discard(fixture_id)
+        self._renewed_at = time.monotonic()
+        return set(self.owned)
+
+    async def keep_alive(self) -> Set[int]:
+        # Appelé entre deux matchs d'un passage : baux et heartbeat renouvelés dès qu'un
+        # tiers du bail s'est écoulé, un passage lent ne laisse pas expirer les premiers matchs
+        if time.monotonic() - self._renewed_at >= self.lease_ms / 3000:
+            await self.heartbeat()
+            await self.renew()
+        return set(self.owned)
+
+    async def owner(self, fixture_id: int) -> Optional[str]:
+        return await self.redis.get(self._lease_key(fixture_id))
+
+    async def claim(self, fixture_ids: Iterable[int], instances: int) -> Set[int]:
+        # Part équitable : ceil(matchs / instances). Baux renouvelés, surplus rendu
+        # (une instance vient d'arriver), matchs libres pris jusqu'à la part.
+        fixture_ids = list(fixture_ids)
+        share = math.ceil(len(fixture_ids) / max(instances, 1))
+
+        for fixture_id in list(self.owned):
+            if fixture_id not in fixture_ids:
+                await self.release(fixture_id)
+        await self.renew()
+
+        for fixture_id in sorted(self.owned)[share:]:
+            await self.release(fixture_id)
+
+        for fixture_id in fixture_ids:
+            if len(self.owned) >= share:
+                break
+            if fixture_id in self.owned:
+                continue
+            if await self.redis.set(self._lease_key(fixture_id), self.instance_id, nx=True, px=self.lease_ms):
+                self.owned.add(fixture_id)
+        return set(self.owned)
+
+    async def release(self, fixture_id: int):
+        self.owned.discard(fixture_id)
+        await self._release(keys=[self._lease_key(fixture_id)], args=[self.instance_id])
+
+    async def leave(self):
+        # Arrêt propre : matchs rendus tout de suite plutôt qu'à expiration des baux
+        for fixture_id in list(self.owned):
+            await self.release(fixture_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrem(INSTANCES_KEY, self.instance_id)
+            pipe.delete(self._load_key(self.instance_id))
+            await pipe.execute()
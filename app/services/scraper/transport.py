@@ -0,0 +1,164 @@
+import asyncio
+import importlib.util
+import time
+from typing import Optional, Tuple
+
+import httpx
+from sofascore_wrapper.api import SofascoreAPI, BASE_URL
+
+from app.core.config import settings
+
+SOFASCORE_TRANSPORTS = ("http", "browser")
+
+# En-têtes d'un navigateur : sans eux, Sofascore refuse les clients HTTP
+BROWSER_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8",
+    "Origin": "https://www.sofascore.com",
+    "Referer": "https://www.sofascore.com/",
+}
+
+# Réponses de l'anti-bot plutôt que de l'API : à retenter via le navigateur
+CHALLENGE_STATUSES = {403, 429, 503}
+
+
+class TransportChallenged(Exception):
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"Challenge {status} sur {url}")
+        self.status = status
+
+
+class HttpxTransport:
+    # Client HTTP poolé : connexions keep-alive réutilisées, HTTP/2 si h2 est installé
+
+    def __init__(self, max_connections: int = 10, timeout: float = 10.0, client: Optional[httpx.AsyncClient] = None):
+        self.client = client or httpx.AsyncClient(
+            headers=BROWSER_HEADERS,
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+            follow_redirects=True,
+        )
+
+    async def get_json(self, url: str) -> Tuple[int, Optional[dict]]:
+        response = await self.client.get(url)
+        if response.status_code in CHALLENGE_STATUSES:
+            raise TransportChallenged(response.status_code, url)
+        if response.status_code != 200:
+            return response.status_code, None
+        # Page HTML de vérification servie en 200
+        if "json" not in response.headers.get("content-type", ""):
+            raise TransportChallenged(response.status_code, url)
+        return 200, response.json()
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class BrowserPoolTransport:
+    # Quelques pages d'un même contexte Chromium, lancées au premier appel puis réutilisées
+
+    def __init__(self, size: int = 2):
+        self.size = size
+        self.playwright = None
+        self.browser = None
+        self._pages: Optional[asyncio.Queue] = None
+        self._lock = asyncio.Lock()
+
+    async def _start(self):
+        async with self._lock:
+            if self._pages is not None:
+                return
+            from playwright.async_api import async_playwright
+
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=True)
+            context = await self.browser.new_context()
+            pages = asyncio.Queue()
+            for _ in range(self.size):
+                pages.put_nowait(await context.new_page())
+            self._pages = pages
+
+    async def get_json(self, url: str) -> Tuple[int, Optional[dict]]:
+        await self._start()
+        page = await self._pages.get()
+        try:
+            response = await page.goto(url)
+            if response.status != 200:
+                return response.status, None
+            return 200, await response.json()
+        finally:
+            self._pages.put_nowait(page)
+
+    async def close(self):
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        self.browser = self.playwright = self._pages = None
+
+
+class SofascoreClient(SofascoreAPI):
+    # Remplace le navigateur de sofascore_wrapper : même interface (_get, _raw_get, close),
+    # mêmes erreurs "Failed to fetch <endpoint>: <status>"
+
+    def __init__(self, primary, fallback=None, challenge_cooldown: float = 300.0):
+        super().__init__()
+        self.primary = primary
+        self.fallback = fallback
+        self.challenge_cooldown = challenge_cooldown
+        self.fallbacks = 0
+        self._challenged_until = 0.0
+
+    async def _get(self, endpoint):
+        return await self._fetch(f"{BASE_URL}{endpoint}", endpoint)
+
+    async def _raw_get(self, url):
+        return await self._fetch(url, url)
+
+    async def _fetch(self, url: str, label: str):
+        # Après un challenge, le navigateur est utilisé directement pendant challenge_cooldown
+        if self.fallback is not None and time.monotonic() < self._challenged_until:
+            status, data = await self._from_fallback(url)
+        else:
+            try:
+                status, data = await self.primary.get_json(url)
+            except TransportChallenged as e:
+                if self.fallback is None:
+                    raise Exception(f"Failed to fetch {label}: {e.status}")
+                self._challenged_until = time.monotonic() + self.challenge_cooldown
+                print(f"[sofascore] {e} : repli navigateur pendant {self.challenge_cooldown:.0f}s")
+                status, data = await self._from_fallback(url)
+        if status != 200:
+            raise Exception(f"Failed to fetch {label}: {status}")
+        return data
+
+    async def _from_fallback(self, url: str):
+        self.fallbacks += 1
+        return await self.fallback.get_json(url)
+
+    async def close(self):
+        await self.primary.close()
+        if self.fallback is not None:
+            await self.fallback.close()
+
+
+def create_sofascore_client(transport: Optional[str] = None) -> SofascoreClient:
+    transport = transport or settings.SOFASCORE_TRANSPORT
+    if transport not in SOFASCORE_TRANSPORTS:
+        raise ValueError(f"Transport Sofascore inconnu : {transport} (attendu : {', '.join(SOFASCORE_TRANSPORTS)})")
+
+    if transport == "browser":
+        return SofascoreClient(BrowserPoolTransport(settings.SOFASCORE_BROWSER_POOL_SIZE))
+
+    fallback = BrowserPoolTransport(settings.SOFASCORE_BROWSER_POOL_SIZE) if settings.SOFASCORE_BROWSER_FALLBACK else None
+    return SofascoreClient(
+        HttpxTransport(settings.SOFASCORE_HTTP_MAX_CONNECTIONS, settings.SOFASCORE_HTTP_TIMEOUT_SECONDS),
+        fallback,
+        settings.SOFASCORE_CHALLENGE_COOLDOWN_SECONDS,
+    )
@@ -0,0 +1,352 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import random
+import secrets
+import socket
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+import httpcore
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.core.metrics import WEBHOOK_DELIVERIES, WEBHOOK_DELIVERY_DURATION
+from app.db.database import AsyncSessionLocal
+from app.db.models import Fixture, Team, WebhookSubscription
+from app.services.scraper.live_events import LiveEventConsumer
+
+# Types d'événement filtrables : incidents du journal, changements de score et de statut
+EVENT_TYPES = (
+    "goal", "card", "substitution", "varDecision", "inGamePenalty", "period",
+    "score", "kickoff", "full_time", "status",
+)
+DEFAULT_EVENT_TYPES = ("goal", "card", "full_time")
+
+# File d'envois par abonnement (premier envoi ou nouvelle tentative) :
+# JSON (tentative, contenu) -> heure prévue, repoussée pendant un envoi en cours
+QUEUE_KEY = "webhooks:queue:{}"
+
+# Prise d'un envoi échu par un seul dispatcher ; sans réponse avant l'échéance
+# (dispatcher arrêté en plein envoi), il redevient échu et est renvoyé, même X-Webhook-Id
+CLAIM_DELIVERY = """
+local due = redis.call('zscore', KEYS[1], ARGV[1])
+if due and tonumber(due) <= tonumber(ARGV[2]) then
+  return redis.call('zadd', KEYS[1], 'XX', 'CH', ARGV[3], ARGV[1])
+end
+return 0
+"""
+
+
+def queue_key(subscription_id: int) -> str:
+    return QUEUE_KEY.format(subscription_id)
+
+
+def delivery_id(subscription_id: int, fixture_id: int, events: List[Dict]) -> str:
+    # Dérivé des ids du journal : un lot rejoué (consommateur planté avant XACK) garde son id
+    return f"{subscription_id}:{fixture_id}:{events[0]['id']}:{events[-1]['id']}"
+
+
+class UnsafeWebhookURL(ValueError):
+    pass
+
+
+async def resolve_host(host: str, port: int) -> List[str]:
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return sorted({info[4][0] for info in infos})
+
+
+async def public_addresses(host: str, port: int) -> List[str]:
+    # Adresses de l'hôte, toutes publiques (pas de loopback, RFC 1918, lien local
+    # 169.254.169.254, service docker compose...). Hôte introuvable : socket.gaierror.
+    addresses = await resolve_host(host, port)
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%")[0])
+        if ip.version == 6 and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            raise UnsafeWebhookURL(f"Adresse non publique : {host} -> {address}")
+    return addresses
+
+
+async def check_webhook_url(url: str) -> List[str]:
+    # Garde SSRF à l'enregistrement et avant chaque envoi : https hors DEBUG, hôte public.
+    # À l'envoi, la connexion elle-même passe par PublicNetworkBackend.
+    parsed = urlparse(url)
+    schemes = ("http", "https") if settings.DEBUG else ("https",)
+    if parsed.scheme not in schemes or not parsed.hostname:
+        raise UnsafeWebhookURL(f"URL invalide ({' ou '.join(schemes)} requis)")
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    except ValueError:
+        raise UnsafeWebhookURL("Port invalide")
+    return await public_addresses(parsed.hostname, port)
+
+
+class PublicNetworkBackend(httpcore.AsyncNetworkBackend):
+    # Résout l'hôte au moment de la connexion et ne se connecte qu'aux adresses vérifiées :
+    # pas de seconde résolution entre la vérification et la connexion (DNS rebinding,
+    # TTL 0). Le pool reste indexé par nom d'hôte, Host et SNI sont inchangés.
+
+    def __init__(self, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        error = None
+        for address in await public_addresses(host, port):
+            try:
+                return await self.backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except httpcore.ConnectError as e:
+                error = e
+        raise error
+
+    async def sleep(self, seconds: float):
+        await self.backend.sleep(seconds)
+
+
+class PublicOnlyTransport(httpx.AsyncHTTPTransport):
+    # Transport httpx des webhooks : sans proxy ni variables d'environnement, connexions
+    # ouvertes par PublicNetworkBackend
+
+    def __init__(self, network_backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        super().__init__(trust_env=False)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(trust_env=False),
+            # Limites par défaut d'un client httpx
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=5.0,
+            network_backend=PublicNetworkBackend(network_backend),
+        )
+
+
+def generate_webhook_secret() -> str:
+    return f"whsec_{secrets.token_urlsafe(32)}"
+
+
+def event_type(record: Dict) -> str:
+    if record["type"] == "incident":
+        return record["kind"]
+    if record["type"] == "status":
+        return {"inprogress": "kickoff", "finished": "full_time"}.get(record["status"], "status")
+    return record["type"]
+
+
+def sign(secret: str, timestamp: int, body: bytes) -> str:
+    # HMAC-SHA256 de "<timestamp>.<corps>" : le partenaire refuse une signature trop ancienne (rejeu)
+    return hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, timestamp: str, body: bytes, signature: str, tolerance: int = 300) -> bool:
+    if abs(time.time() - int(timestamp)) > tolerance:
+        return False
+    return hmac.compare_digest(f"sha256={sign(secret, int(timestamp), body)}", signature)
+
+
+def retry_delay(attempt: int) -> float:
+    # Attente exponentielle plafonnée, avec jitter (les abonnés en panne ne sont pas relancés en rafale)
+    delay = min(settings.WEBHOOK_RETRY_BASE_SECONDS * 2 ** (attempt - 1), settings.WEBHOOK_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def matches(subscription: WebhookSubscription, fixture_id: int, teams: Set[int], kind: str) -> bool:
+    if subscription.fixture_ids and fixture_id not in subscription.fixture_ids:
+        return False
+    if subscription.team_ids and not teams.intersection(subscription.team_ids):
+        return False
+    return kind in (subscription.event_types or DEFAULT_EVENT_TYPES)
+
+
+class WebhookDispatcher(LiveEventConsumer):
+    # Événements du journal poussés aux abonnements des partenaires : un envoi signé par
+    # abonnement et par lot de messages lus. handle() ne fait que remplir la file Redis de
+    # chaque abonnement (XACK sans attendre les partenaires) ; les envois partent en tâches
+    # de fond, au plus max_concurrency par abonnement : un partenaire lent ne retarde que
+    # sa propre file. Un échec (réseau, 429, 5xx) y est replacé plus tard ; le partenaire
+    # dédoublonne sur X-Webhook-Id.
+
+    group = "webhooks"
+
+    def __init__(self, service, client: Optional[httpx.AsyncClient] = None, **options):
+        super().__init__(service.redis, **options)
+        self.client = client or httpx.AsyncClient(
+            transport=PublicOnlyTransport(), timeout=settings.WEBHOOK_TIMEOUT_SECONDS, trust_env=False
+        )
+        self._subscriptions: List[WebhookSubscription] = []
+        self._loaded_at = None
+        self._teams: Dict[int, Set[int]] = {}
+        self._limits: Dict[int, asyncio.Semaphore] = {}
+        self._in_flight: Dict[int, Set[asyncio.Task]] = {}
+        self._claim = self.redis.register_script(CLAIM_DELIVERY)
+
+    async def subscriptions(self) -> List[WebhookSubscription]:
+        # Rechargées toutes les WEBHOOK_REFRESH_SECONDS : un nouvel abonnement reçoit les
+        # événements suivants, pas l'historique du match
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > settings.WEBHOOK_REFRESH_SECONDS:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(WebhookSubscription).where(WebhookSubscription.is_active == True)
+                )
+                self._subscriptions = list(result.scalars().all())
+            self._loaded_at = time.monotonic()
+        return self._subscriptions
+
+    async def fixture_teams(self, fixture_id: int) -> Set[int]:
+        # Identifiants Sofascore des deux équipes, pour le filtre par équipe
+        if fixture_id not in self._teams:
+            home, away = aliased(Team), aliased(Team)
+            async with AsyncSessionLocal() as session:
+                row = (await session.execute(
+                    select(home.sofascore_id, away.sofascore_id)
+                    .join(Fixture, Fixture.home_team_id == home.id)
+                    .join(away, Fixture.away_team_id == away.id)
+                    .where(Fixture.sofascore_id == fixture_id)
+                )).first()
+            self._teams[fixture_id] = set(row) if row else set()
+        return self._teams[fixture_id]
+
+    async def handle(self, fixture_id: int, records: List[Dict]):
+        subscriptions = await self.subscriptions()
+        if not subscriptions:
+            return
+        teams = await self.fixture_teams(fixture_id)
+
+        now = time.time()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for subscription in subscriptions:
+                events = [
+                    {"event": kind, **record}
+                    for record, kind in ((record, event_type(record)) for record in records)
+                    if matches(subscription, fixture_id, teams, kind)
+                ]
+                for start in range(0, len(events), settings.WEBHOOK_BATCH_SIZE):
+                    batch = events[start:start + settings.WEBHOOK_BATCH_SIZE]
+                    payload = {
+                        "delivery_id": delivery_id(subscription.id, fixture_id, batch),
+                        "subscription_id": subscription.id,
+                        "fixture_id": fixture_id,
+                        "events": batch,
+                    }
+                    pipe.zadd(queue_key(subscription.id), {json.dumps({"attempt": 1, "payload": payload}): now})
+                    # File bornée par la durée de vie du journal
+                    pipe.expire(queue_key(subscription.id), settings.LIVE_EVENTS_TTL_SECONDS)
+            await pipe.execute()
+
+    def _limit(self, subscription: WebhookSubscription) -> asyncio.Semaphore:
+        if subscription.id not in self._limits:
+            self._limits[subscription.id] = asyncio.Semaphore(
+                subscription.max_concurrency or settings.WEBHOOK_MAX_CONCURRENCY
+            )
+        return self._limits[subscription.id]
+
+    async def deliver(self, subscription: WebhookSubscription, payload: Dict, attempt: int = 1) -> bool:
+        body = json.dumps(payload).encode()
+        timestamp = int(time.time())
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Id": payload["delivery_id"],
+            "X-Webhook-Timestamp": str(timestamp),
+            "X-Webhook-Signature": f"sha256={sign(subscription.secret, timestamp, body)}",
+            "X-Webhook-Attempt": str(attempt),
+        }
+
+        retry_after, error = None, None
+        async with self._limit(subscription):
+            started = time.perf_counter()
+            try:
+                # Redirections non suivies (défaut httpx) : la cible vérifiée est celle appelée
+                await check_webhook_url(subscription.url)
+                response = await self.client.post(subscription.url, content=body, headers=headers)
+                if response.is_success:
+                    WEBHOOK_DELIVERIES.labels("delivered").inc()
+                    return True
+                error = f"HTTP {response.status_code}"
+                if response.status_code != 429 and response.status_code < 500:
+                    # Refus définitif (URL supprimée, signature rejetée...) : pas de nouvelle tentative
+                    attempt = settings.WEBHOOK_MAX_ATTEMPTS
+                elif response.headers.get("Retry-After", "").isdigit():
+                    retry_after = float(response.headers["Retry-After"])
+            except UnsafeWebhookURL as e:
+                error = str(e)
+                attempt = settings.WEBHOOK_MAX_ATTEMPTS
+            except (httpx.HTTPError, OSError) as e:
+                # OSError : résolution DNS en échec, retentée comme une erreur réseau
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                WEBHOOK_DELIVERY_DURATION.observe(time.perf_counter() - started)
+
+        if attempt < settings.WEBHOOK_MAX_ATTEMPTS:
+            delay = max(retry_after or 0, retry_delay(attempt))
+            entry = json.dumps({"attempt": attempt + 1, "payload": payload})
+            await self.redis.zadd(queue_key(subscription.id), {entry: time.time() + delay})
+            WEBHOOK_DELIVERIES.labels("retried").inc()
+        else:
+            print(f"[webhooks] abonnement {subscription.id} : envoi {payload['delivery_id']} abandonné ({error})")
+            WEBHOOK_DELIVERIES.labels("dropped").inc()
+            await self._record_failure(subscription.id, error)
+        return False
+
+    async def _record_failure(self, subscription_id: int, error: str):
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                await session.execute(
+                    update(WebhookSubscription)
+                    .where(WebhookSubscription.id == subscription_id)
+                    .values(
+                        failure_count=WebhookSubscription.failure_count + 1,
+                        last_failure_at=datetime.utcnow(),
+                        last_error=error,
+                    )
+                )
+
+    async def dispatch_due(self) -> int:
+        # Envois échus lancés en tâches de fond, dans la limite des places libres de chaque
+        # abonnement : le reste attend dans sa file (et ne retient pas celles des autres)
+        now = time.time()
+        claim_until = now + 4 * settings.WEBHOOK_TIMEOUT_SECONDS + 10
+        started = 0
+        for subscription in await self.subscriptions():
+            in_flight = self._in_flight.setdefault(subscription.id, set())
+            free = (subscription.max_concurrency or settings.WEBHOOK_MAX_CONCURRENCY) - len(in_flight)
+            if free <= 0:
+                continue
+            key = queue_key(subscription.id)
+            for entry in await self.redis.zrangebyscore(key, "-inf", now, start=0, num=free):
+                # Plusieurs dispatchers : l'envoi revient à celui qui repousse l'échéance
+                if not await self._claim(keys=[key], args=[entry, now, claim_until]):
+                    continue
+                task = asyncio.create_task(self._send(subscription, entry))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                started += 1
+        return started
+
+    async def _send(self, subscription: WebhookSubscription, entry: str):
+        queued = json.loads(entry)
+        try:
+            await self.deliver(subscription, queued["payload"], queued["attempt"])
+        except Exception as e:
+            # Laissé dans la file : renvoyé à l'échéance de la prise
+            print(f"[webhooks] abonnement {subscription.id} : erreur d'envoi ({e})")
+            return
+        # Envoyé, abandonné ou replacé sous une nouvelle tentative
+        await self.redis.zrem(queue_key(subscription.id), entry)
+
+    async def drain(self):
+        # Attente des envois en cours (arrêt propre, tests)
+        tasks = [task for in_flight in self._in_flight.values() for task in in_flight]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def poll(self) -> int:
+        handled = await super().poll()
+        await self.dispatch_due()
+        return handled
@@ -0,0 +1,191 @@
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload
+
+from app.core.tracing import traced
+from app.db.models import Fixture, Standing, MatchStatus
+
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+# (home_team_id, away_team_id, home_score, away_score)
+Result = Tuple[int, int, int, int]
+
+
+def _empty_row(team_id: int) -> Dict:
+    return {
+        "team_id": team_id,
+        "total_matches": 0,
+        "wins": 0,
+        "draws": 0,
+        "losses": 0,
+        "goals_for": 0,
+        "goals_against": 0,
+        "goal_difference": 0,
+        "points": 0,
+    }
+
+
+def _build_table(team_ids: Iterable[int], results: Iterable[Result]) -> Dict[int, Dict]:
+    table = {team_id: _empty_row(team_id) for team_id in team_ids}
+
+    for home_id, away_id, home_score, away_score in results:
+        for team_id, scored, conceded in (
+            (home_id, home_score, away_score),
+            (away_id, away_score, home_score),
+        ):
+            row = table.setdefault(team_id, _empty_row(team_id))
+            row["total_matches"] += 1
+            row["goals_for"] += scored
+            row["goals_against"] += conceded
+            row["goal_difference"] = row["goals_for"] - row["goals_against"]
+
+            if scored > conceded:
+                row["wins"] += 1
+                row["points"] += POINTS_WIN
+            elif scored == conceded:
+                row["draws"] += 1
+                row["points"] += POINTS_DRAW
+            else:
+                row["losses"] += 1
+
+    return table
+
+
+def _overall_key(row: Dict):
+    return (-row["points"], -row["goal_difference"], -row["goals_for"])
+
+
+def compute_group_table(team_ids: Iterable[int], results: List[Result],
+                        team_names: Optional[Dict[int, str]] = None) -> List[Dict]:
+    # Départage : points, différence, buts marqués, puis confrontations directes
+    team_names = team_names or {}
+    rows = sorted(_build_table(team_ids, results).values(), key=_overall_key)
+
+    ranked = []
+    for _, tied in groupby(rows, key=_overall_key):
+        tied = list(tied)
+
+        if len(tied) > 1:
+            tied_ids = {row["team_id"] for row in tied}
+            head_to_head = _build_table(
+                tied_ids,
+                [r for r in results if r[0] in tied_ids and r[1] in tied_ids]
+            )
+            tied.sort(key=lambda row: (
+                *_overall_key(head_to_head[row["team_id"]]),
+                team_names.get(row["team_id"]) or "",
+                row["team_id"],
+            ))
+
+        ranked.extend(tied)
+
+    for rank, row in enumerate(ranked, start=1):
+        row["rank"] = rank
+
+    return ranked
+
+
+async def compute_season_standings(session, season_id: int, include_live: bool = False) -> Dict[str, List[Dict]]:
+    # Tous les matchs de groupe : les équipes sans match joué apparaissent aussi
+    query = select(Fixture).options(
+        joinedload(Fixture.home_team),
+        joinedload(Fixture.away_team),
+    ).where(
+        Fixture.season_id == season_id,
+        Fixture.group_name.is_not(None)
+    )
+    fixtures = (await session.execute(query)).scalars().all()
+
+    counted_statuses = {MatchStatus.FINISHED}
+    if include_live:
+        counted_statuses.add(MatchStatus.IN_PROGRESS)
+
+    groups: Dict[str, Dict] = {}
+    teams: Dict[int, object] = {}
+
+    for fixture in fixtures:
+        group = groups.setdefault(fixture.group_name, {"team_ids": set(), "results": []})
+        group["team_ids"].update([fixture.home_team_id, fixture.away_team_id])
+        teams[fixture.home_team_id] = fixture.home_team
+        teams[fixture.away_team_id] = fixture.away_team
+
+        if (
+            fixture.status in counted_statuses
+            and fixture.home_score is not None
+            and fixture.away_score is not None
+        ):
+            group["results"].append((
+                fixture.home_team_id, fixture.away_team_id,
+                fixture.home_score, fixture.away_score
+            ))
+
+    team_names = {team_id: team.name for team_id, team in teams.items() if team}
+
+    standings = {}
+    for group_name, group in sorted(groups.items()):
+        rows = compute_group_table(group["team_ids"], group["results"], team_names)
+        for row in rows:
+            team = teams.get(row["team_id"])
+            row["group"] = group_name
+            row["team"] = {
+                "id": row["team_id"],
+                "name": team.name if team else None,
+                "code": team.code if team else None,
+                "country": team.country if team else None,
+                "logo_url": team.logo_url if team else None,
+            }
+        standings[group_name] = rows
+
+    return standings
+
+
+async def save_standings(session, season_id: int, standings: Dict[str, List[Dict]]):
+
+    rows = [
+        {
+            "season_id": season_id,
+            "team_id": row["team_id"],
+            "group": row["group"],
+            "rank": row["rank"],
+            "total_matches": row["total_matches"],
+            "wins": row["wins"],
+            "draws": row["draws"],
+            "losses": row["losses"],
+            "goals_for": row["goals_for"],
+            "goals_against": row["goals_against"],
+            "goal_difference": row["goal_difference"],
+            "points": row["points"],
+        }
+        for group_rows in standings.values()
+        for row in group_rows
+    ]
+    if not rows:
+        return
+
+    stmt = insert(Standing).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_standing_season_team_group",
+        set_={
+            **{
+                field: stmt.excluded[field]
+                for field in (
+                    "rank", "total_matches", "wins", "draws", "losses",
+                    "goals_for", "goals_against", "goal_difference", "points",
+                )
+            },
+            "updated_at": func.now(),
+        },
+    )
+    await session.execute(stmt)
+
+
+@traced()
+async def recompute_standings(session, season_id: int) -> Dict[str, List[Dict]]:
+    # Classement officiel : matchs terminés uniquement, persisté en base
+    standings = await compute_season_standings(session, season_id)
+    await save_standings(session, season_id, standings)
+    return standings
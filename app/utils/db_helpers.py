@@ -1,6 +1,8 @@
 from typing import Type, TypeVar, Any, Dict, Tuple, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.tracing import tracer
+
 T = TypeVar('T')
 
 
@@ -11,19 +13,20 @@ async def get_or_create(
     value: Any,
     defaults: Dict[str, Any]
 ) -> T:
-   
-    result = await session.execute(
-        model.__table__.select().where(getattr(model, unique_field) == value)
-    )
-    row = result.first()
-    
-    if row:
-        return await session.get(model, row[0])
-    
-    obj = model(**defaults)
-    session.add(obj)
-    await session.flush()
-    return obj
+
+    with tracer.start_as_current_span(f"get_or_create {model.__name__}"):
+        result = await session.execute(
+            model.__table__.select().where(getattr(model, unique_field) == value)
+        )
+        row = result.first()
+
+        if row:
+            return await session.get(model, row[0])
+
+        obj = model(**defaults)
+        session.add(obj)
+        await session.flush()
+        return obj
 
 
 async def get_team_by_sofascore_id(
@@ -0,0 +1,93 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app.db.models import Fixture, Team, League, Season
+from app.schemas import FixtureDetailed
+
+
+class ORJSONAPIResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def fast_api_response(data=None, meta: Optional[Dict] = None) -> ORJSONAPIResponse:
+    # Même enveloppe que APIResponse, sans repasser par la validation Pydantic
+    return ORJSONAPIResponse({
+        "success": True,
+        "data": data,
+        "errors": None,
+        "meta": meta,
+    })
+
+
+@lru_cache(maxsize=None)
+def _row_plan(schema: Type[BaseModel], prefix: str, nested: Tuple[str, ...]):
+    # (clé JSON, label SQL ou sous-plan) dans l'ordre des champs du schéma
+    plan = []
+    for name, field in schema.model_fields.items():
+        if name in nested:
+            plan.append((name, _row_plan(field.annotation, f"{prefix}{name}__", ())))
+        else:
+            plan.append((name, f"{prefix}{name}"))
+    return tuple(plan)
+
+
+def schema_columns(schema: Type[BaseModel], entity, nested: Optional[Dict[str, Any]] = None, prefix: str = ""):
+    # Colonnes labellisées correspondant aux champs du schéma (sous-schémas via `nested`)
+    nested = nested or {}
+    columns = []
+    for name, field in schema.model_fields.items():
+        if name in nested:
+            columns.extend(schema_columns(field.annotation, nested[name], prefix=f"{prefix}{name}__"))
+        else:
+            columns.append(getattr(entity, name).label(f"{prefix}{name}"))
+    return columns
+
+
+def _apply_plan(plan, row) -> Dict:
+    return {
+        name: _apply_plan(key, row) if isinstance(key, tuple) else row[key]
+        for name, key in plan
+    }
+
+
+def schema_rows(schema: Type[BaseModel], rows: Iterable, nested: Iterable[str] = ()) -> list:
+    plan = _row_plan(schema, "", tuple(sorted(nested)))
+    return [_apply_plan(plan, row) for row in rows]
+
+
+# ================= FIXTURES =================
+HomeTeam = aliased(Team, name="home_team")
+AwayTeam = aliased(Team, name="away_team")
+
+FIXTURE_NESTED = {
+    "home_team": HomeTeam,
+    "away_team": AwayTeam,
+    "league": League,
+    "season": Season,
+}
+
+
+def select_fixtures_detailed():
+    # Équivalent Core de select(Fixture) + joinedload, sans identity map
+    return select(*schema_columns(FixtureDetailed, Fixture, FIXTURE_NESTED)).select_from(Fixture).join(
+        HomeTeam, Fixture.home_team_id == HomeTeam.id
+    ).join(
+        AwayTeam, Fixture.away_team_id == AwayTeam.id
+    ).join(
+        League, Fixture.league_id == League.id
+    ).join(
+        Season, Fixture.season_id == Season.id
+    )
+
+
+def fixture_detailed_rows(rows: Iterable) -> list:
+    return schema_rows(FixtureDetailed, rows, FIXTURE_NESTED)
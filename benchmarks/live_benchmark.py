@@ -0,0 +1,236 @@
+# benchmarks/live_benchmark.py
+#
+# Montée en charge du tracker live : N matchs simulés en parallèle
+# (benchmarks/match_simulator.py, temps accéléré), suivis par un ou plusieurs
+# trackers (baux Redis, comme en production). Pour chaque N : fraîcheur
+# (délai entre un changement et sa lecture), CPU, commandes Redis et
+# écritures SQL.
+#
+#   python -m benchmarks.live_benchmark --matches 10,50,100 --trackers 2
+#   python -m benchmarks.live_benchmark --cassettes cassettes/ --matches 20
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.db.database import engine, AsyncSessionLocal
+from app.db.instrumentation import count_queries, install_query_counter
+from app.db.models import (
+    League, Season, Team, Player, Fixture, Standing, MatchEvent, MatchStatistics, MatchStatTimeline,
+    Lineup, PlayerSeasonAggregate,
+)
+from app.db.partitions import drop_season_partitions
+from app.services.bulk_loader import StagedBatch, stage_events, load_batch
+from app.services.scraper.kickoff_index import KickoffIndex
+from app.services.scraper.live_events import ACTIVE_STREAMS_KEY, MatchPersister, stream_key
+from app.services.scraper.live_latency import LAG_BOARD_KEY
+from app.services.scraper.live_service import LiveMatchService
+from app.services.scraper.stat_timeline import timeline_key
+from app.services.scraper.tracker_cluster import TrackerCluster
+from benchmarks.load_test import percentile
+from benchmarks.match_simulator import MatchSimulator, SimulatedMatch
+
+# Plage de sofascore_id réservée aux matchs simulés
+SIM_BASE_ID = 960_000
+
+
+# ================= DONNÉES =================
+def build_events(count: int, kickoff: float) -> List[Dict]:
+    def team(index):
+        return {"id": SIM_BASE_ID + index, "name": f"Sim Team {index}", "slug": f"sim-team-{index}"}
+
+    return [{
+        "id": SIM_BASE_ID + 5000 + n,
+        "tournament": {"name": "Sim Cup", "uniqueTournament": {
+            "id": SIM_BASE_ID, "name": "Sim Cup", "slug": "sim-cup", "category": {"name": "Africa"}}},
+        "season": {"id": SIM_BASE_ID, "year": "2095", "name": "Sim Cup 2095"},
+        "roundInfo": {"round": 1},
+        "homeTeam": team(2 * n),
+        "awayTeam": team(2 * n + 1),
+        "startTimestamp": int(kickoff),
+        "status": {"type": "notstarted", "description": "Not started"},
+        "homeScore": {},
+        "awayScore": {},
+    } for n in range(count)]
+
+
+def build_simulator(events: List[Dict], kickoff: float, speed: float, cassettes: List[Path]) -> MatchSimulator:
+    # Cassettes enregistrées réparties sur les matchs, sinon timelines générées
+    matches = []
+    for n, event in enumerate(events):
+        if cassettes:
+            source = cassettes[n % len(cassettes)]
+            match = SimulatedMatch.from_cassette(source.parent, int(source.stem.split("_")[1]), kickoff, speed)
+            match.event_id, match.home, match.away = event["id"], event["homeTeam"], event["awayTeam"]
+        else:
+            match = SimulatedMatch.generate(event["id"], event["homeTeam"], event["awayTeam"], kickoff, speed, seed=n)
+        matches.append(match)
+    return MatchSimulator(matches)
+
+
+async def seed_matches(events: List[Dict]) -> Dict:
+    batch = StagedBatch()
+    stage_events(batch, events)
+    await load_batch(batch, recompute=False)
+    async with AsyncSessionLocal() as session:
+        return {
+            "league_id": await session.scalar(select(League.id).where(League.sofascore_id == SIM_BASE_ID)),
+            "season_id": await session.scalar(select(Season.id).where(Season.sofascore_id == SIM_BASE_ID)),
+            "event_ids": [event["id"] for event in events],
+        }
+
+
+async def cleanup_matches(seed: Dict, service: LiveMatchService):
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            season_id = seed["season_id"]
+            fixture_ids = select(Fixture.id).where(Fixture.season_id == season_id)
+            await session.execute(delete(MatchStatTimeline).where(MatchStatTimeline.fixture_id.in_(fixture_ids)))
+            for model in (Standing, PlayerSeasonAggregate, MatchStatistics, MatchEvent, Lineup, Fixture):
+                await session.execute(delete(model).where(model.season_id == season_id))
+            team_ids = select(Team.id).where(Team.sofascore_id.between(SIM_BASE_ID, SIM_BASE_ID + 4999))
+            await session.execute(delete(Player).where(Player.team_id.in_(team_ids)))
+            await session.execute(delete(Team).where(Team.id.in_(team_ids)))
+            await session.execute(delete(Season).where(Season.id == season_id))
+            await session.execute(delete(League).where(League.id == seed["league_id"]))
+    await drop_season_partitions(seed["season_id"])
+
+    keys = []
+    for event_id in seed["event_ids"]:
+        events, timeline = stream_key(event_id), timeline_key(event_id)
+        keys += [f"live:fixture:{event_id}", f"live:stale:{event_id}", f"tracker:lease:{event_id}",
+                 events, f"{events}:seen", f"{events}:state"]
+        await service.timeline.discard(event_id)
+    await service.redis.delete(*keys)
+    await service.redis.hdel(LAG_BOARD_KEY, *[str(event_id) for event_id in seed["event_ids"]])
+    await service.redis.zrem(ACTIVE_STREAMS_KEY, *[stream_key(event_id) for event_id in seed["event_ids"]])
+
+
+# ================= TRACKERS =================
+async def run_tracker(service: LiveMatchService, cluster: TrackerCluster, deadline: float):
+    # Boucle de run_live_tracker, bornée dans le temps
+    index = KickoffIndex(
+        lead=timedelta(minutes=settings.LIVE_LINEUP_LEAD_MINUTES),
+        max_duration=timedelta(minutes=settings.LIVE_MATCH_MAX_MINUTES),
+    )
+    async with AsyncSessionLocal() as session:
+        await index.refresh(session, datetime.utcnow())
+    try:
+        while time.monotonic() < deadline and len(index):
+            delay = await service.track_due_fixtures(index, datetime.utcnow(), cluster)
+            await asyncio.sleep(max(min(delay, deadline - time.monotonic()), 0))
+    finally:
+        await cluster.leave()
+
+
+async def redis_commands(service: LiveMatchService) -> int:
+    return (await service.redis.info("stats"))["total_commands_processed"]
+
+
+async def run_scenario(matches: int, trackers: int, speed: float, duration: float,
+                       cassettes: List[Path], persister: bool) -> Dict:
+    kickoff = time.time()
+    events = build_events(matches, kickoff)
+    simulator = build_simulator(events, kickoff, speed, cassettes)
+    services = [LiveMatchService() for _ in range(trackers)]
+    for service in services:
+        service.api = simulator
+
+    seed = await seed_matches(events)
+    tasks = []
+    try:
+        redis_before = await redis_commands(services[0])
+        cpu_before, started = time.process_time(), time.perf_counter()
+        deadline = time.monotonic() + duration
+
+        with count_queries() as queries:
+            if persister:
+                tasks.append(asyncio.create_task(MatchPersister(services[0], consumer="bench", block_ms=200).run()))
+            await asyncio.gather(*(
+                run_tracker(service, TrackerCluster(service.redis, f"bench-{k}"), deadline)
+                for k, service in enumerate(services)
+            ))
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_before
+        redis_ops = await redis_commands(services[0]) - redis_before
+    finally:
+        for task in tasks:
+            task.cancel()
+        await cleanup_matches(seed, services[0])
+        for service in services:
+            await service.close()
+        await engine.dispose()
+
+    lags = simulator.detection_lags
+    writes = sum(1 for s in queries.statements if s.lstrip().split(" ", 1)[0].upper() in ("INSERT", "UPDATE", "DELETE"))
+    return {
+        "matches": matches,
+        "trackers": trackers,
+        "seconds": round(elapsed, 1),
+        "sofascore_calls": simulator.calls,
+        "changes_seen": len(lags),
+        "freshness_p50_s": round(percentile(lags, 50), 2),
+        "freshness_p95_s": round(percentile(lags, 95), 2),
+        "freshness_max_s": round(max(lags, default=0.0), 2),
+        "cpu_percent": round(100 * cpu / elapsed, 1),
+        "redis_ops_per_s": round(redis_ops / elapsed, 1),
+        "db_writes_per_s": round(writes / elapsed, 1),
+        "db_statements": queries.count,
+    }
+
+
+def print_report(rows: List[Dict]):
+    columns = ["matches", "trackers", "sofascore_calls", "freshness_p50_s", "freshness_p95_s",
+               "freshness_max_s", "cpu_percent", "redis_ops_per_s", "db_writes_per_s"]
+    print("\n" + " ".join(f"{c:>16}" for c in columns))
+    for row in rows:
+        print(" ".join(f"{row[c]:>16}" for c in columns))
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Montée en charge du tracker live sur matchs simulés")
+    parser.add_argument("--matches", default="10,50,100", help="Nombres de matchs simultanés (liste)")
+    parser.add_argument("--trackers", type=int, default=1, help="Instances du tracker (même process, baux Redis)")
+    parser.add_argument("--speed", type=float, default=90.0, help="Minutes simulées par minute réelle")
+    parser.add_argument("--duration", type=float, default=60.0, help="Durée de chaque scénario (s)")
+    parser.add_argument("--poll", type=float, default=1.0, help="LIVE_POLL_SECONDS pendant le test (s réelles)")
+    parser.add_argument("--spacing", type=float, default=0.0, help="LIVE_POLL_SPACING_SECONDS pendant le test")
+    parser.add_argument("--cassettes", help="Dossier de cassettes (event_<id>.json) de matchs terminés à rejouer")
+    parser.add_argument("--no-persister", action="store_true", help="Sans persistance des événements en base")
+    parser.add_argument("--output", help="Rapport JSON")
+    args = parser.parse_args(argv)
+
+    cassettes = sorted(Path(args.cassettes).glob("event_[0-9]*.json")) if args.cassettes else []
+    cassettes = [path for path in cassettes if path.stem.count("_") == 1]
+
+    install_query_counter(engine)
+    overrides = {"LIVE_POLL_SECONDS": args.poll, "LIVE_POLL_SPACING_SECONDS": args.spacing}
+    previous = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    try:
+        rows = []
+        for count in [int(n) for n in args.matches.split(",")]:
+            row = await run_scenario(count, args.trackers, args.speed, args.duration, cassettes, not args.no_persister)
+            print(f"[bench] {count} matchs : fraîcheur p95 {row['freshness_p95_s']}s, CPU {row['cpu_percent']}%")
+            rows.append(row)
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+    print_report(rows)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
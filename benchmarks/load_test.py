@@ -0,0 +1,345 @@
+# benchmarks/load_test.py
+#
+# Charge "jour de match" sur l'API : mélange de requêtes réaliste, latences
+# p50 / p95 / p99 et débit par endpoint, comparés au budget versionné
+# (benchmarks/load_budget.json). Code de sortie 1 si le budget est dépassé.
+#
+#   python -m benchmarks.load_test                      # API en process, données seedées
+#   python -m benchmarks.load_test --base-url http://localhost:8000 --duration 60
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import delete, select
+
+from app.auth import generate_api_key
+from app.db.database import engine, AsyncSessionLocal
+from app.db.models import (
+    League, Season, Team, Player, Fixture, Standing, MatchEvent, Lineup, MatchStatistics,
+    PlayerSeasonAggregate, APIKey
+)
+from app.db.partitions import drop_season_partitions
+from app.services.bulk_loader import StagedBatch, stage_events, stage_match_details, load_batch
+from app.services.scraper.circuit_breaker import GuardedSofascoreAPI
+from app.services.scraper.live_service import LiveMatchService
+from app.services.scraper.metered_api import MeteredSofascoreAPI
+from app.services.scraper.replay_api import ReplaySofascoreAPI
+
+BUDGET_PATH = Path(__file__).parent / "load_budget.json"
+
+# Plage de sofascore_id réservée au jeu de données de charge
+LOAD_BASE_ID = 970_000
+
+GROUPS = "ABCDEF"
+TEAMS_PER_GROUP = 4
+SQUAD_SIZE = 16
+SURNAMES = [
+    "Diallo", "Ndiaye", "Sarr", "Gueye", "Diop", "Faye", "Sow", "Ba",
+    "Cissé", "Kouyaté", "Mendy", "Diatta", "Camara", "Touré", "Koné", "Traoré",
+]
+
+# (nom, poids, requête) : répartition observée un soir de match
+TRAFFIC_MIX = [
+    ("fixtures_by_date", 25, lambda seed: ("/fixtures", {"date": seed["today"]})),
+    ("live_matches", 20, lambda seed: ("/live/matches", None)),
+    ("live_match", 25, lambda seed: (f"/live/match/{random.choice(seed['live_ids'])}", None)),
+    ("standings", 10, lambda seed: ("/standings", {"league_id": seed["league_id"], "season_id": seed["season_id"]})),
+    ("top_scorers", 10, lambda seed: ("/events/top-scorers", {"season_id": seed["season_id"]})),
+    ("players_search", 10, lambda seed: ("/players", {"search": random.choice(SURNAMES)})),
+]
+
+
+# ================= DONNÉES =================
+def _team(index: int) -> Dict:
+    return {"id": LOAD_BASE_ID + index, "name": f"Load Team {index}", "slug": f"load-team-{index}"}
+
+
+def _player(team: int, number: int) -> Dict:
+    surname = SURNAMES[(team + number) % len(SURNAMES)]
+    return {
+        "id": LOAD_BASE_ID + 1000 + team * SQUAD_SIZE + number,
+        "name": f"Player{number} {surname}", "lastName": surname, "jerseyNumber": str(number + 1),
+    }
+
+
+def _lineup(team: int) -> Dict:
+    return {
+        "formation": "4-3-3",
+        "starters": [{"player": _player(team, n), "statistics": {"minutesPlayed": 90}} for n in range(11)],
+        "substitutes": [{"player": _player(team, n)} for n in range(11, SQUAD_SIZE)],
+    }
+
+
+def build_match_day(now: datetime):
+    # Poules de 4 : journées 1 et 2 jouées, journée 3 aujourd'hui (moitié en cours)
+    events, details = [], {}
+    n = 0
+    for g, group in enumerate(GROUPS):
+        teams = [g * TEAMS_PER_GROUP + i for i in range(TEAMS_PER_GROUP)]
+        rounds = [[(0, 1), (2, 3)], [(0, 2), (1, 3)], [(0, 3), (1, 2)]]
+        for r, pairs in enumerate(rounds, start=1):
+            for home, away in pairs:
+                home, away = teams[home], teams[away]
+                if r < 3:
+                    kickoff, status = now - timedelta(days=2 * (3 - r)), "finished"
+                elif g < len(GROUPS) // 2:
+                    kickoff, status = now - timedelta(minutes=30), "inprogress"
+                else:
+                    kickoff, status = now + timedelta(minutes=90), "notstarted"
+
+                played = status != "notstarted"
+                home_goals, away_goals = (n % 3, n % 2) if played else (None, None)
+                event_id = LOAD_BASE_ID + 5000 + n
+                events.append({
+                    "id": event_id,
+                    "tournament": {"name": f"Load Cup, Group {group}", "groupName": f"Group {group}",
+                                   "uniqueTournament": {"id": LOAD_BASE_ID, "name": "Load Cup",
+                                                        "slug": "load-cup", "category": {"name": "Africa"}}},
+                    "season": {"id": LOAD_BASE_ID, "year": "2096", "name": "Load Cup 2096"},
+                    "roundInfo": {"round": r},
+                    "homeTeam": _team(home),
+                    "awayTeam": _team(away),
+                    "startTimestamp": int(kickoff.timestamp()),
+                    "status": {"type": status, "description": status},
+                    "homeScore": {"current": home_goals, "period1": home_goals},
+                    "awayScore": {"current": away_goals, "period1": away_goals},
+                    "time": {"currentPeriodStartTimestamp": int(kickoff.timestamp())} if status == "inprogress" else {},
+                })
+
+                if played:
+                    goals = [(True, home, k) for k in range(home_goals)] + [(False, away, k) for k in range(away_goals)]
+                    details[event_id] = {
+                        "lineups": {"home": _lineup(home), "away": _lineup(away)},
+                        "incidents": {"incidents": [
+                            {"id": LOAD_BASE_ID + 10000 + n * 10 + i, "incidentType": "goal",
+                             "incidentClass": "regular", "time": 10 + 15 * i, "isHome": is_home,
+                             "player": _player(team, 9 + k % 2)}
+                            for i, (is_home, team, k) in enumerate(goals)
+                        ]},
+                    }
+                n += 1
+    return events, details
+
+
+async def seed_load_data(ttl: int) -> Dict:
+    now = datetime.now()
+    events, details = build_match_day(now)
+
+    batch = StagedBatch()
+    stage_events(batch, events)
+    for event in events:
+        if event["id"] in details:
+            stage_match_details(batch, event["id"], event["homeTeam"]["id"], event["awayTeam"]["id"], details[event["id"]])
+    await load_batch(batch)
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            league_id = await session.scalar(select(League.id).where(League.sofascore_id == LOAD_BASE_ID))
+            season_id = await session.scalar(select(Season.id).where(Season.sofascore_id == LOAD_BASE_ID))
+            api_key = APIKey(key=generate_api_key(), name="load-test", rate_limit=10**9)
+            session.add(api_key)
+
+    # Cache live des matchs du jour, valable toute la durée du test
+    live_service = LiveMatchService()
+    today = [event for event in events if event["status"]["type"] != "finished"]
+    for event in today:
+        await live_service.cache_live_data(event["id"], {
+            "fixture_id": event["id"],
+            "timestamp": datetime.utcnow().isoformat(),
+            "status": event["status"]["type"],
+            "match_info": live_service._parse_match_info({"event": event}),
+            "incidents": {"periods": []},
+            "stats": None,
+            "lineups": None,
+        })
+        await live_service.redis.expire(f"live:fixture:{event['id']}", ttl)
+    await live_service.redis.aclose()
+
+    return {
+        "league_id": league_id,
+        "season_id": season_id,
+        "api_key": api_key.key,
+        "today": now.date().isoformat(),
+        "live_ids": [event["id"] for event in today],
+    }
+
+
+async def cleanup_load_data(seed: Dict):
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            season_id = seed["season_id"]
+            for model in (Standing, PlayerSeasonAggregate, MatchStatistics, MatchEvent, Lineup, Fixture):
+                await session.execute(delete(model).where(model.season_id == season_id))
+            team_ids = select(Team.id).where(Team.sofascore_id.between(LOAD_BASE_ID, LOAD_BASE_ID + 999))
+            await session.execute(delete(Player).where(Player.team_id.in_(team_ids)))
+            await session.execute(delete(Team).where(Team.id.in_(team_ids)))
+            await session.execute(delete(Season).where(Season.id == season_id))
+            await session.execute(delete(League).where(League.id == seed["league_id"]))
+            await session.execute(delete(APIKey).where(APIKey.key == seed["api_key"]))
+    await drop_season_partitions(seed["season_id"])
+
+    live_service = LiveMatchService()
+    await live_service.redis.delete(
+        *[f"live:{kind}:{i}" for i in seed["live_ids"] for kind in ("fixture", "stale")]
+    )
+    await live_service.redis.aclose()
+
+
+# ================= CHARGE =================
+async def run_load(client: httpx.AsyncClient, seed: Dict, duration: float, concurrency: int,
+                   max_requests: int = None) -> Dict:
+    names = [name for name, _, _ in TRAFFIC_MIX]
+    weights = [weight for _, weight, _ in TRAFFIC_MIX]
+    requests = {name: build for name, _, build in TRAFFIC_MIX}
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    issued = 0
+
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def worker():
+        nonlocal issued
+        while time.perf_counter() < deadline and (max_requests is None or issued < max_requests):
+            issued += 1
+            name = random.choices(names, weights)[0]
+            path, params = requests[name](seed)
+            t0 = time.perf_counter()
+            try:
+                response = await client.get(path, params=params)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append((time.perf_counter() - t0) * 1000)
+            if failed:
+                errors[name] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return build_report(latencies, errors, time.perf_counter() - started)
+
+
+def percentile(values: List[float], q: float) -> float:
+    # Rang le plus proche
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def build_report(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> Dict:
+    report = {}
+    everything = [v for values in latencies.values() for v in values]
+    for name, values in {**latencies, "total": everything}.items():
+        failed = sum(errors.values()) if name == "total" else errors[name]
+        report[name] = {
+            "requests": len(values),
+            "errors": failed,
+            "error_rate": round(failed / len(values), 4) if values else 0.0,
+            "rps": round(len(values) / elapsed, 1),
+            "p50_ms": round(percentile(values, 50), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "p99_ms": round(percentile(values, 99), 1),
+        }
+    return report
+
+
+def check_budget(report: Dict, budget: Dict) -> List[str]:
+    # Dépassements du budget versionné (latences max, taux d'erreur max, débit min)
+    violations = []
+    for name, limits in budget.get("endpoints", {}).items():
+        measured = report.get(name)
+        if not measured or not measured["requests"]:
+            violations.append(f"{name}: aucune requête mesurée")
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if metric in limits and measured[metric] > limits[metric]:
+                violations.append(f"{name}: {metric} {measured[metric]} > {limits[metric]}")
+        max_error_rate = limits.get("max_error_rate", budget.get("max_error_rate", 0.0))
+        if measured["error_rate"] > max_error_rate:
+            violations.append(f"{name}: error_rate {measured['error_rate']} > {max_error_rate}")
+
+    min_rps = budget.get("min_total_rps")
+    if min_rps and report["total"]["rps"] < min_rps:
+        violations.append(f"total: rps {report['total']['rps']} < {min_rps}")
+    return violations
+
+
+def print_report(report: Dict):
+    print(f"\n{'endpoint':<18} {'req':>6} {'err':>5} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, r in report.items():
+        print(
+            f"{name:<18} {r['requests']:>6} {r['errors']:>5} {r['rps']:>7} "
+            f"{r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8}"
+        )
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge de l'API (mélange jour de match)")
+    parser.add_argument("--base-url", help="API déjà lancée ; par défaut l'application tourne dans ce process")
+    parser.add_argument("--duration", type=float, default=30.0, help="Durée du test (s)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Clients simultanés")
+    parser.add_argument("--requests", type=int, help="Nombre max de requêtes")
+    parser.add_argument("--budget", default=str(BUDGET_PATH), help="Budget de latence versionné")
+    parser.add_argument("--no-budget", action="store_true", help="Mesure sans vérification du budget")
+    parser.add_argument("--keep-data", action="store_true", help="Conserve le jeu de données après le test")
+    parser.add_argument("--output", help="Rapport JSON")
+    args = parser.parse_args(argv)
+
+    seed = await seed_load_data(ttl=int(args.duration) + 120)
+    headers = {"X-API-Key": seed["api_key"]}
+    live_service, sofascore_api = None, None
+
+    try:
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=30)
+        else:
+            # Sans réseau : la détection live Sofascore est rejouée (404) au lieu d'ouvrir un navigateur
+            from app.main import app
+            from app.api.live_routes import live_service
+            sofascore_api = live_service.api
+            live_service.api = GuardedSofascoreAPI(
+                MeteredSofascoreAPI(ReplaySofascoreAPI(tempfile.mkdtemp())), live_service.redis
+            )
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://loadtest", headers=headers
+            )
+
+        async with client:
+            report = await run_load(client, seed, args.duration, args.concurrency, args.requests)
+    finally:
+        if live_service:
+            # Connexions Redis liées à cette boucle d'événements
+            live_service.api = sofascore_api
+            await live_service.redis.connection_pool.disconnect()
+        if not args.keep_data:
+            await cleanup_load_data(seed)
+        await engine.dispose()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    violations = []
+    if not args.no_budget:
+        with open(args.budget, encoding="utf-8") as f:
+            violations = check_budget(report, json.load(f))
+        for violation in violations:
+            print(f"BUDGET DÉPASSÉ {violation}")
+
+    return report, violations
+
+
+if __name__ == "__main__":
+    _, violations = asyncio.run(main())
+    sys.exit(1 if violations else 0)
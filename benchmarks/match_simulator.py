@@ -0,0 +1,228 @@
+# benchmarks/match_simulator.py
+#
+# Matchs simulés servis à la place de Sofascore (même interface que
+# ReplaySofascoreAPI) : /event/{id}, /incidents, /statistics et /lineups
+# évoluent minute par minute, en temps accéléré. Timelines générées
+# (graine fixe) ou rejouées depuis une cassette enregistrée d'un match terminé.
+
+import json
+import math
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sofascore_wrapper.api import SofascoreAPI
+
+from app.services.scraper.replay_api import _endpoint, cassette_path
+
+MATCH_MINUTES = 90
+# event.status.code Sofascore ; pas de pause simulée à la mi-temps
+STATUS_CODES = {"notstarted": 0, "inprogress": 6, "finished": 100}
+SECOND_HALF_CODE = 7
+
+
+class SimulatedMatch:
+
+    def __init__(self, event_id: int, home: Dict, away: Dict, kickoff: float, speed: float,
+                 incidents: List[Dict], shots: List[Dict], lineups: Optional[Dict] = None, seed: int = 0):
+        # kickoff : heure réelle du coup d'envoi ; speed : minutes simulées par minute réelle
+        self.event_id = event_id
+        self.home, self.away = home, away
+        self.kickoff = kickoff
+        self.speed = speed
+        self.incidents = sorted(incidents, key=lambda inc: inc["time"])
+        self.shots = shots
+        self.lineups = lineups or {"confirmed": True, "home": _lineup_side(home), "away": _lineup_side(away)}
+        self.phase = random.Random(seed).uniform(0, 2 * math.pi)
+
+    # ----- génération -----
+    @classmethod
+    def generate(cls, event_id: int, home: Dict, away: Dict, kickoff: float, speed: float, seed: int) -> "SimulatedMatch":
+        rng = random.Random(seed)
+        incidents, shots = [], []
+        score = [0, 0]
+        for minute in range(1, MATCH_MINUTES + 1):
+            for _ in range(2):
+                if rng.random() < 26 / MATCH_MINUTES / 2:
+                    is_home = rng.random() < 0.55
+                    xg = round(rng.uniform(0.02, 0.45), 2)
+                    on_target = rng.random() < 0.35
+                    shots.append({"time": minute, "isHome": is_home, "xg": xg, "onTarget": on_target})
+                    if on_target and rng.random() < xg * 1.8:
+                        score[0 if is_home else 1] += 1
+                        incidents.append({
+                            "incidentType": "goal", "incidentClass": "regular", "time": minute,
+                            "isHome": is_home, "homeScore": score[0], "awayScore": score[1],
+                        })
+            if rng.random() < 4 / MATCH_MINUTES:
+                incidents.append({
+                    "incidentType": "card", "incidentClass": "yellow", "time": minute,
+                    "isHome": rng.random() < 0.5, "reason": "Foul",
+                })
+        for is_home in (True, False):
+            for minute in sorted(rng.sample(range(55, 86), 5)):
+                incidents.append({"incidentType": "substitution", "time": minute, "isHome": is_home})
+        for i, incident in enumerate(incidents):
+            incident["id"] = event_id * 100 + i
+        return cls(event_id, home, away, kickoff, speed, incidents, shots, seed=seed)
+
+    @classmethod
+    def from_cassette(cls, cassette_dir, event_id: int, kickoff: float, speed: float) -> "SimulatedMatch":
+        # Match terminé enregistré par RecordingSofascoreAPI : incidents rejoués à leur minute ;
+        # les tirs ne sont pas minutés dans les cassettes, on les répartit sur le match
+        def load(endpoint):
+            path = cassette_path(cassette_dir, endpoint)
+            return json.loads(Path(path).read_text(encoding="utf-8")) if path.exists() else {}
+
+        event = load(f"/event/{event_id}").get("event", {})
+        incidents = [inc for inc in load(f"/event/{event_id}/incidents").get("incidents", []) if "time" in inc]
+        shots = []
+        for item in _overview(load(f"/event/{event_id}/statistics")):
+            if item.get("key") == "totalShotsOnGoal":
+                for is_home, count in ((True, item.get("homeValue", 0)), (False, item.get("awayValue", 0))):
+                    shots += [
+                        {"time": int((k + 1) * MATCH_MINUTES / (count + 1)), "isHome": is_home, "xg": 0.1, "onTarget": k % 3 == 0}
+                        for k in range(int(count))
+                    ]
+        return cls(
+            event_id, event.get("homeTeam", {}), event.get("awayTeam", {}), kickoff, speed,
+            incidents, shots, load(f"/event/{event_id}/lineups") or None, seed=event_id,
+        )
+
+    # ----- horloge -----
+    def minute(self, now: float) -> float:
+        return (now - self.kickoff) * self.speed / 60
+
+    def wall_time(self, minute: float) -> float:
+        return self.kickoff + minute * 60 / self.speed
+
+    def status(self, now: float) -> str:
+        minute = self.minute(now)
+        if minute < 0:
+            return "notstarted"
+        return "inprogress" if minute < MATCH_MINUTES else "finished"
+
+    def last_change(self, now: float) -> Optional[float]:
+        # Les stats (possession) bougent chaque minute : dernier changement = dernière minute pleine
+        minute = self.minute(now)
+        if minute < 0:
+            return None
+        return self.wall_time(min(math.floor(minute), MATCH_MINUTES))
+
+    # ----- réponses Sofascore -----
+    def event(self, now: float) -> Dict:
+        minute = min(max(self.minute(now), 0), MATCH_MINUTES)
+        status = self.status(now)
+        goals = [inc for inc in self.incidents if inc["incidentType"] == "goal" and inc["time"] <= minute]
+        home_goals = sum(1 for goal in goals if goal["isHome"])
+        code = SECOND_HALF_CODE if status == "inprogress" and minute >= 45 else STATUS_CODES[status]
+        event = {
+            "id": self.event_id,
+            "homeTeam": self.home,
+            "awayTeam": self.away,
+            "startTimestamp": int(self.kickoff),
+            "status": {"type": status, "description": status, "code": code},
+            "homeScore": {"current": home_goals} if status != "notstarted" else {},
+            "awayScore": {"current": len(goals) - home_goals} if status != "notstarted" else {},
+            "changes": {"changeTimestamp": self.last_change(now)},
+            "time": {},
+        }
+        if status == "inprogress":
+            # Horloge accélérée : début de période recalé pour que le calcul de la minute tombe juste
+            initial = 0 if minute < 45 else 45 * 60
+            event["time"] = {
+                "initial": initial, "max": initial + 45 * 60,
+                "currentPeriodStartTimestamp": int(now - (minute * 60 - initial)),
+            }
+        return {"event": event}
+
+    def incidents_at(self, now: float) -> Dict:
+        minute = self.minute(now)
+        # Sofascore : plus récent en premier
+        return {"incidents": [inc for inc in reversed(self.incidents) if inc["time"] <= minute]}
+
+    def statistics_at(self, now: float) -> Dict:
+        minute = min(self.minute(now), MATCH_MINUTES)
+        played = [shot for shot in self.shots if shot["time"] <= minute]
+
+        def side(values, is_home):
+            return sum(value for shot, value in values if shot["isHome"] == is_home)
+
+        whole = math.floor(max(minute, 0))
+        possession = round(50 + 8 * math.sin(whole / 12 + self.phase))
+        items = [
+            ("Ball possession", "ballPossession", possession, 100 - possession, "%"),
+            ("Expected goals", "expectedGoals",
+             round(side(((s, s["xg"]) for s in played), True), 2),
+             round(side(((s, s["xg"]) for s in played), False), 2), ""),
+            ("Total shots", "totalShotsOnGoal", side(((s, 1) for s in played), True), side(((s, 1) for s in played), False), ""),
+            ("Shots on target", "shotsOnGoal",
+             side(((s, int(s["onTarget"])) for s in played), True), side(((s, int(s["onTarget"])) for s in played), False), ""),
+            ("Corner kicks", "cornerKicks", whole // 9, whole // 11, ""),
+        ]
+        return {"statistics": [{"period": "ALL", "groups": [{"groupName": "Match overview", "statisticsItems": [
+            {"name": name, "key": key, "home": f"{home}{unit}", "away": f"{away}{unit}", "homeValue": home, "awayValue": away}
+            for name, key, home, away, unit in items
+        ]}]}]}
+
+
+def _lineup_side(team: Dict) -> Dict:
+    # Format /event/{id}/lineups lu par Match.lineups_home / lineups_away
+    return {
+        "formation": "4-3-3", "playerColor": {}, "goalkeeperColor": {}, "missingPlayers": [],
+        "players": [
+            {"player": {"id": team.get("id", 0) * 100 + n, "name": f"{team.get('name', 'Team')} {n + 1}"},
+             "shirtNumber": n + 1, "substitute": n >= 11}
+            for n in range(16)
+        ],
+    }
+
+
+def _overview(statistics: Dict) -> List[Dict]:
+    for period in statistics.get("statistics", []):
+        if period.get("period") == "ALL":
+            return [item for group in period.get("groups", []) for item in group.get("statisticsItems", [])]
+    return []
+
+
+class MatchSimulator(SofascoreAPI):
+    # Remplace Sofascore pour le tracker : réponses calculées à l'heure de l'appel.
+    # Mesure au passage le délai de détection de chaque changement (première lecture
+    # de /event/{id} après un changement).
+
+    def __init__(self, matches: List[SimulatedMatch]):
+        super().__init__()
+        self.matches = {match.event_id: match for match in matches}
+        self.calls = 0
+        self.detection_lags: List[float] = []
+        self._seen_changes: Dict[int, float] = {}
+
+    async def _get(self, endpoint):
+        self.calls += 1
+        now = time.time()
+        parts = endpoint.split("?")[0].strip("/").split("/")
+        match = self.matches.get(int(parts[1])) if len(parts) >= 2 and parts[0] == "event" and parts[1].isdigit() else None
+        if match is None:
+            raise Exception(f"Failed to fetch {endpoint}: 404")
+
+        resource = parts[2] if len(parts) > 2 else None
+        if resource is None:
+            changed_at = match.last_change(now)
+            if changed_at is not None and self._seen_changes.get(match.event_id) != changed_at:
+                self._seen_changes[match.event_id] = changed_at
+                self.detection_lags.append(now - changed_at)
+            return match.event(now)
+        if resource == "incidents" and match.status(now) != "notstarted":
+            return match.incidents_at(now)
+        if resource == "statistics" and match.status(now) != "notstarted":
+            return match.statistics_at(now)
+        if resource == "lineups":
+            return match.lineups
+        raise Exception(f"Failed to fetch {endpoint}: 404")
+
+    async def _raw_get(self, url):
+        return await self._get(_endpoint(url))
+
+    async def close(self):
+        pass
@@ -0,0 +1,119 @@
+# benchmarks/trace_report.py
+#
+# Analyse par match d'un fichier de spans (TRACING_EXPORTER=json ou benchmark_ingestion.py --trace) :
+# temps Sofascore, SQL et Python de chaque span "fixture", puis temps propre par opération.
+#   python -m benchmarks.trace_report traces.jsonl --top 10
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def load_spans(path) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _ms(span) -> float:
+    return (span["end_ns"] - span["start_ns"]) / 1e6
+
+
+def _category(span) -> str:
+    if span["name"].startswith("sofascore "):
+        return "http"
+    if "db.system" in span.get("attributes", {}):
+        return "sql"
+    return "python"
+
+
+def _children(spans) -> Dict[str, List[dict]]:
+    children = defaultdict(list)
+    for span in spans:
+        if span["parent_id"]:
+            children[span["parent_id"]].append(span)
+    return children
+
+
+def self_times(spans, children) -> Dict[str, float]:
+    # Durée du span moins celle de ses enfants directs (code séquentiel)
+    return {
+        span["span_id"]: max(_ms(span) - sum(_ms(c) for c in children[span["span_id"]]), 0.0)
+        for span in spans
+    }
+
+
+def fixture_breakdown(spans) -> List[dict]:
+    children = _children(spans)
+    own = self_times(spans, children)
+
+    rows = []
+    for root in (s for s in spans if s["name"] == "fixture"):
+        totals = {"http": 0.0, "sql": 0.0, "python": own[root["span_id"]]}
+        counts = {"http": 0, "sql": 0}
+        stack = list(children[root["span_id"]])
+        while stack:
+            span = stack.pop()
+            category = _category(span)
+            totals[category] += own[span["span_id"]]
+            if category in counts:
+                counts[category] += 1
+            stack.extend(children[span["span_id"]])
+
+        steps = children[root["span_id"]]
+        slowest = max(steps, key=_ms) if steps else None
+        rows.append({
+            "event_id": root["attributes"].get("sofascore.event_id"),
+            "total_ms": round(_ms(root), 1),
+            "http_ms": round(totals["http"], 1),
+            "sql_ms": round(totals["sql"], 1),
+            "python_ms": round(totals["python"], 1),
+            "http_calls": counts["http"],
+            "sql_statements": counts["sql"],
+            "slowest_step": f"{slowest['name']} ({_ms(slowest):.1f} ms)" if slowest else None,
+        })
+    return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+
+def operation_breakdown(spans) -> List[dict]:
+    # Temps propre cumulé par nom de span : où part le temps, toutes fixtures confondues
+    own = self_times(spans, _children(spans))
+    ops = defaultdict(lambda: {"count": 0, "self_ms": 0.0})
+    for span in spans:
+        ops[span["name"]]["count"] += 1
+        ops[span["name"]]["self_ms"] += own[span["span_id"]]
+    rows = [{"operation": name, "count": o["count"], "self_ms": round(o["self_ms"], 1)} for name, o in ops.items()]
+    return sorted(rows, key=lambda r: r["self_ms"], reverse=True)
+
+
+def print_report(fixtures, operations, top: int):
+    print(f"\n{'match':>10} {'total ms':>9} {'HTTP ms':>8} {'SQL ms':>7} {'Python ms':>10} {'HTTP':>5} {'SQL':>5}  étape la plus lente")
+    for r in fixtures[:top]:
+        print(
+            f"{r['event_id']:>10} {r['total_ms']:>9} {r['http_ms']:>8} {r['sql_ms']:>7} {r['python_ms']:>10} "
+            f"{r['http_calls']:>5} {r['sql_statements']:>5}  {r['slowest_step']}"
+        )
+
+    print(f"\n{'opération':<45} {'appels':>7} {'temps propre ms':>16}")
+    for r in operations[:top]:
+        print(f"{r['operation'][:45]:<45} {r['count']:>7} {r['self_ms']:>16}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Temps HTTP / SQL / Python par match à partir des spans")
+    parser.add_argument("path", help="Fichier de spans (un JSON par ligne)")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    spans = load_spans(args.path)
+    fixtures, operations = fixture_breakdown(spans), operation_breakdown(spans)
+    print_report(fixtures, operations, args.top)
+    return fixtures, operations
+
+
+if __name__ == "__main__":
+    main()
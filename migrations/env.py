@@ -0,0 +1,95 @@
+import asyncio
+import re
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_engine_from_config
+
+from app.core.config import settings
+from app.db.models import Base
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Même base que l'application (surchargeable avec -x database_url=...)
+config.set_main_option(
+    "sqlalchemy.url",
+    context.get_x_argument(as_dictionary=True).get("database_url", settings.DATABASE_URL)
+)
+
+target_metadata = Base.metadata
+
+# Partitions par saison (app/db/partitions.py) : créées hors migrations
+PARTITION_NAME = re.compile(r".+_(season_\d+|default)$")
+
+
+def include_name(name, type_, parent_names) -> bool:
+    if type_ == "table":
+        return not PARTITION_NAME.match(name)
+    return True
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # Une FK vers fixtures est dupliquée par Postgres vers chacune de ses partitions
+    if type_ == "foreign_key_constraint" and reflected:
+        return not PARTITION_NAME.match(object.referred_table.name)
+    return True
+
+
+def run_migrations_offline() -> None:
+    # Génère le SQL sans connexion (alembic upgrade head --sql)
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        compare_type=True,
+        include_name=include_name,
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    # transaction_per_migration : autocommit_block() possible dans une révision
+    # (CREATE INDEX CONCURRENTLY) sans bloquer les autres
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+        include_name=include_name,
+        include_object=include_object,
+        transaction_per_migration=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    connectable = async_engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    asyncio.run(run_async_migrations())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,85 @@
+"""composite and partial indexes for hot fixture / event filters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 16:20:00.000000
+
+Index créés / supprimés CONCURRENTLY : pas de verrou bloquant les écritures
+sur une base en production. Ces opérations sont interdites dans une
+transaction, d'où autocommit_block().
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HOT_INDEXES = [
+    ('ix_fixtures_league_date', 'fixtures', ['league_id', 'date'], {}),
+    ('ix_fixtures_season_date', 'fixtures', ['season_id', 'date'], {}),
+    ('ix_fixtures_home_team_date', 'fixtures', ['home_team_id', 'date'], {}),
+    ('ix_fixtures_away_team_date', 'fixtures', ['away_team_id', 'date'], {}),
+    ('ix_fixtures_status_date', 'fixtures', ['status', 'date'], {}),
+    ('ix_fixtures_live_date', 'fixtures', ['date'], {'postgresql_where': sa.text('is_live')}),
+    ('ix_match_events_fixture_type', 'match_events', ['fixture_id', 'type'], {}),
+    ('ix_match_events_player_type', 'match_events', ['player_id', 'type'], {}),
+]
+
+# Index simples couverts par la première colonne d'un index composite
+SUPERSEDED_INDEXES = [
+    ('ix_fixtures_league_id', 'fixtures', ['league_id']),
+    ('ix_fixtures_season_id', 'fixtures', ['season_id']),
+    ('ix_fixtures_home_team_id', 'fixtures', ['home_team_id']),
+    ('ix_fixtures_away_team_id', 'fixtures', ['away_team_id']),
+    ('ix_fixtures_status', 'fixtures', ['status']),
+    ('ix_match_events_fixture_id', 'match_events', ['fixture_id']),
+    ('ix_match_events_player_id', 'match_events', ['player_id']),
+]
+
+
+def _drop_invalid(names) -> None:
+    # Un CREATE INDEX CONCURRENTLY interrompu laisse un index INVALID : on le reconstruit
+    if context.is_offline_mode():
+        return
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+    ), {"names": list(names)}).scalars().all()
+    for name in invalid:
+        op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        _drop_invalid(name for name, _, _, _ in HOT_INDEXES)
+
+        for name, table, columns, kwargs in HOT_INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True, **kwargs
+            )
+
+        for name, table, _ in SUPERSEDED_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+        op.execute("ANALYZE fixtures")
+        op.execute("ANALYZE match_events")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        _drop_invalid(name for name, _, _ in SUPERSEDED_INDEXES)
+
+        for name, table, columns in SUPERSEDED_INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+        for name, table, _, _ in reversed(HOT_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,184 @@
+"""partition fixtures, match_events, lineups and match_statistics by season
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 17:05:00.000000
+
+Une table existante ne peut pas devenir partitionnée : chaque table est
+renommée (_legacy), recréée en PARTITION BY LIST (season_id) avec une
+partition par saison existante + une partition par défaut, puis les
+lignes sont recopiées. Les tables sont verrouillées pendant la copie :
+à lancer dans une fenêtre de maintenance (API et ingestion arrêtées).
+
+Les tables filles reçoivent une colonne season_id (copie de celle du
+match) pour être partitionnées de la même façon ; leur FK vers fixtures
+devient (fixture_id, season_id).
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# fixtures d'abord : les autres tables la référencent
+TABLES = ['fixtures', 'match_events', 'lineups', 'match_statistics']
+CHILD_TABLES = TABLES[1:]
+
+# Index identiques avant / après partitionnement
+INDEXES = [
+    ('ix_fixtures_date', 'fixtures', ['date'], {}),
+    ('ix_fixtures_league_date', 'fixtures', ['league_id', 'date'], {}),
+    ('ix_fixtures_season_date', 'fixtures', ['season_id', 'date'], {}),
+    ('ix_fixtures_home_team_date', 'fixtures', ['home_team_id', 'date'], {}),
+    ('ix_fixtures_away_team_date', 'fixtures', ['away_team_id', 'date'], {}),
+    ('ix_fixtures_status_date', 'fixtures', ['status', 'date'], {}),
+    ('ix_fixtures_live_date', 'fixtures', ['date'], {'postgresql_where': sa.text('is_live')}),
+    ('ix_match_events_assist_player_id', 'match_events', ['assist_player_id'], {}),
+    ('ix_match_events_team_id', 'match_events', ['team_id'], {}),
+    ('ix_match_events_fixture_type', 'match_events', ['fixture_id', 'type'], {}),
+    ('ix_match_events_player_type', 'match_events', ['player_id', 'type'], {}),
+    ('ix_lineups_fixture_id', 'lineups', ['fixture_id'], {}),
+    ('ix_lineups_player_id', 'lineups', ['player_id'], {}),
+    ('ix_lineups_team_id', 'lineups', ['team_id'], {}),
+    ('ix_match_statistics_fixture_id', 'match_statistics', ['fixture_id'], {}),
+    ('ix_match_statistics_team_id', 'match_statistics', ['team_id'], {}),
+]
+
+# FK hors fixtures, identiques avant / après
+FOREIGN_KEYS = [
+    ('fixtures_league_id_fkey', 'fixtures', 'leagues', ['league_id']),
+    ('fixtures_season_id_fkey', 'fixtures', 'seasons', ['season_id']),
+    ('fixtures_home_team_id_fkey', 'fixtures', 'teams', ['home_team_id']),
+    ('fixtures_away_team_id_fkey', 'fixtures', 'teams', ['away_team_id']),
+    ('match_events_team_id_fkey', 'match_events', 'teams', ['team_id']),
+    ('match_events_player_id_fkey', 'match_events', 'players', ['player_id']),
+    ('match_events_assist_player_id_fkey', 'match_events', 'players', ['assist_player_id']),
+    ('match_events_player_out_id_fkey', 'match_events', 'players', ['player_out_id']),
+    ('lineups_team_id_fkey', 'lineups', 'teams', ['team_id']),
+    ('lineups_player_id_fkey', 'lineups', 'players', ['player_id']),
+    ('match_statistics_team_id_fkey', 'match_statistics', 'teams', ['team_id']),
+]
+
+# Toute contrainte d'unicité d'une table partitionnée contient season_id
+PARTITIONED_UNIQUES = [
+    ('uq_fixtures_sofascore_season', 'fixtures', ['sofascore_id', 'season_id']),
+    ('uq_match_events_sofascore_season', 'match_events', ['sofascore_id', 'season_id']),
+    ('uq_lineup_fixture_team_player', 'lineups', ['fixture_id', 'team_id', 'player_id', 'season_id']),
+    ('uq_match_stats_fixture_team', 'match_statistics', ['fixture_id', 'team_id', 'season_id']),
+]
+
+LEGACY_UNIQUES = [
+    ('uq_lineup_fixture_team_player', 'lineups', ['fixture_id', 'team_id', 'player_id']),
+    ('uq_match_stats_fixture_team', 'match_statistics', ['fixture_id', 'team_id']),
+]
+
+LEGACY_UNIQUE_INDEXES = [
+    ('ix_fixtures_sofascore_id', 'fixtures', ['sofascore_id']),
+    ('ix_match_events_sofascore_id', 'match_events', ['sofascore_id']),
+]
+
+
+def _season_ids():
+    # Hors connexion (--sql) : seule la partition par défaut est générée
+    if context.is_offline_mode():
+        return []
+    return op.get_bind().execute(sa.text("SELECT id FROM seasons ORDER BY id")).scalars().all()
+
+
+def _rebuild(table: str, partitioned: bool, season_ids) -> None:
+    # Nouvelle table (mêmes colonnes, NOT NULL et défauts) alimentée depuis l'ancienne ;
+    # la séquence de l'id est conservée
+    op.rename_table(table, f'{table}_legacy')
+
+    partition_by = ' PARTITION BY LIST (season_id)' if partitioned else ''
+    op.execute(f'CREATE TABLE {table} (LIKE {table}_legacy INCLUDING DEFAULTS){partition_by}')
+
+    if partitioned:
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+        for season_id in season_ids:
+            op.execute(f'CREATE TABLE {table}_season_{season_id} PARTITION OF {table} FOR VALUES IN ({season_id})')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {table}_legacy')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+
+
+def _create_common_constraints() -> None:
+    for name, table, columns, kwargs in INDEXES:
+        op.create_index(name, table, columns, unique=False, **kwargs)
+
+    for name, table, referred, columns in FOREIGN_KEYS:
+        op.create_foreign_key(name, table, referred, columns, ['id'])
+
+
+def upgrade() -> None:
+    season_ids = _season_ids()
+
+    for table in CHILD_TABLES:
+        op.add_column(table, sa.Column('season_id', sa.Integer(), nullable=True))
+        op.execute(
+            f'UPDATE {table} SET season_id = fixtures.season_id '
+            f'FROM fixtures WHERE fixtures.id = {table}.fixture_id'
+        )
+        op.alter_column(table, 'season_id', existing_type=sa.Integer(), nullable=False)
+        op.drop_constraint(f'{table}_fixture_id_fkey', table, type_='foreignkey')
+
+    for table in TABLES:
+        _rebuild(table, True, season_ids)
+
+    # Index, contraintes et FK des anciennes tables disparaissent avec elles
+    for table in reversed(TABLES):
+        op.drop_table(f'{table}_legacy')
+
+    for table in TABLES:
+        op.create_primary_key(f'{table}_pkey', table, ['id', 'season_id'])
+
+    for name, table, columns in PARTITIONED_UNIQUES:
+        op.create_unique_constraint(name, table, columns)
+
+    _create_common_constraints()
+
+    for table in CHILD_TABLES:
+        op.create_foreign_key(
+            f'{table}_fixture_id_fkey', table, 'fixtures',
+            ['fixture_id', 'season_id'], ['id', 'season_id']
+        )
+
+    for table in TABLES:
+        op.execute(f'ANALYZE {table}')
+
+
+def downgrade() -> None:
+    for table in CHILD_TABLES:
+        op.drop_constraint(f'{table}_fixture_id_fkey', table, type_='foreignkey')
+
+    for table in TABLES:
+        _rebuild(table, False, [])
+
+    # Supprime aussi les partitions
+    for table in reversed(TABLES):
+        op.drop_table(f'{table}_legacy')
+
+    for table in CHILD_TABLES:
+        op.drop_column(table, 'season_id')
+
+    for table in TABLES:
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
+
+    for name, table, columns in LEGACY_UNIQUES:
+        op.create_unique_constraint(name, table, columns)
+
+    for name, table, columns in LEGACY_UNIQUE_INDEXES:
+        op.create_index(name, table, columns, unique=True)
+
+    _create_common_constraints()
+
+    for table in CHILD_TABLES:
+        op.create_foreign_key(f'{table}_fixture_id_fkey', table, 'fixtures', ['fixture_id'], ['id'])
+
+    for table in TABLES:
+        op.execute(f'ANALYZE {table}')
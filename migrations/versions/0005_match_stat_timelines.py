@@ -0,0 +1,37 @@
+"""match stat timelines (live statistics history)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 18:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('match_stat_timelines',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fixture_id', sa.Integer(), nullable=False),
+    sa.Column('sofascore_id', sa.Integer(), nullable=False),
+    sa.Column('stat_key', sa.String(length=100), nullable=False),
+    sa.Column('samples', sa.LargeBinary(), nullable=False),
+    sa.Column('sample_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default='now()', nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sofascore_id', 'stat_key', name='uq_match_stat_timeline')
+    )
+    op.create_index(op.f('ix_match_stat_timelines_fixture_id'), 'match_stat_timelines', ['fixture_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_match_stat_timelines_fixture_id'), table_name='match_stat_timelines')
+    op.drop_table('match_stat_timelines')
@@ -0,0 +1,211 @@
+# pipeline/benchmark_ingestion.py
+#
+# Débit d'ingestion mesuré hors ligne, sur des réponses Sofascore enregistrées.
+#   1. Enregistrer une fois :  python pipeline/benchmark_ingestion.py --record --league 270 --season 71636 --rounds 1 2 3
+#   2. Rejouer (sans réseau) : python pipeline/benchmark_ingestion.py --league 270 --season 71636 --rounds 1 2 3 --reset
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Profil de connexion ingestion
+os.environ.setdefault("DB_PROFILE", "ingestion")
+
+from sofascore_wrapper.league import League
+from sofascore_wrapper.team import Team
+from sqlalchemy import delete, func, select
+
+from app.core.tracing import JsonFileSpanExporter, setup_tracing, shutdown_tracing, install_sql_tracing
+from app.db import AsyncSessionLocal, engine
+from app.db.instrumentation import install_query_counter, count_queries
+from app.db.models import League as LeagueModel, Season, Fixture, MatchEvent, Lineup, MatchStatistics
+from app.services.scraper import ingest_cup_tree_matches
+from app.services.scraper.metered_api import MeteredSofascoreAPI
+from app.services.scraper.replay_api import RecordingSofascoreAPI, ReplaySofascoreAPI
+from pipeline.ingest_afcon import process_round_fixtures
+from pipeline.ingest_friendlies import filter_friendly_matches, ingest_friendly_fixture
+
+DEFAULT_CASSETTES = Path(__file__).parent.parent / "benchmarks" / "cassettes"
+
+SCENARIOS = ("round", "cup_tree", "friendly")
+
+
+# ================= SCÉNARIOS =================
+# prepare : appels hors mesure (liste des matchs) ; run : la fonction d'ingestion mesurée
+
+async def _prepare_round(api, args):
+    league = League(api, args.league)
+    rounds = [await league.league_fixtures_per_round(args.season, r) for r in args.rounds]
+    event_ids = [event["id"] for match_data in rounds for event in match_data.get("events", [])]
+    return rounds, event_ids
+
+
+async def _run_round(session, api, args, rounds):
+    league_obj, season_obj = None, None
+    for match_data in rounds:
+        league_obj, season_obj = await process_round_fixtures(
+            session, api, league_obj, season_obj, match_data
+        )
+
+
+async def _prepare_cup_tree(api, args):
+    cup_tree_data = await League(api, args.league).cup_tree(args.season)
+    event_ids = [
+        block["events"][0]
+        for cup_tree in cup_tree_data.get("cupTrees", [])[:1]
+        for round_data in cup_tree.get("rounds", [])
+        for block in round_data.get("blocks", [])
+        if block.get("events")
+    ]
+    return None, event_ids
+
+
+async def _run_cup_tree(session, api, args, _):
+    # Ligue et saison créées par le scénario round
+    league_obj = await session.scalar(select(LeagueModel).where(LeagueModel.sofascore_id == args.league))
+    season_obj = await session.scalar(select(Season).where(Season.sofascore_id == args.season))
+    if not league_obj or not season_obj:
+        print("  Ligue / saison absentes : lancer le scénario round d'abord")
+        return
+    await ingest_cup_tree_matches(session, api, args.season, league_obj, season_obj)
+
+
+async def _prepare_friendly(api, args):
+    events = filter_friendly_matches(await Team(api, args.team).next_fixtures())
+    return events, [event["id"] for event in events]
+
+
+async def _run_friendly(session, api, args, events):
+    for event in events:
+        await ingest_friendly_fixture(session, api, event)
+
+
+SCENARIO_STEPS = {
+    "round": (_prepare_round, _run_round),
+    "cup_tree": (_prepare_cup_tree, _run_cup_tree),
+    "friendly": (_prepare_friendly, _run_friendly),
+}
+
+
+# ================= MESURE =================
+async def _count_fixtures(event_ids) -> int:
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(
+            select(func.count()).select_from(Fixture).where(Fixture.sofascore_id.in_(event_ids))
+        )
+
+
+async def reset_fixtures(event_ids):
+    # Supprime les matchs du scénario pour que chaque passage ingère le même volume
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            fixture_ids = select(Fixture.id).where(Fixture.sofascore_id.in_(event_ids))
+            for model in (MatchEvent, Lineup, MatchStatistics):
+                await session.execute(delete(model).where(model.fixture_id.in_(fixture_ids)))
+            await session.execute(delete(Fixture).where(Fixture.sofascore_id.in_(event_ids)))
+
+
+async def run_scenario(name: str, api, args) -> dict:
+    prepare, run = SCENARIO_STEPS[name]
+    inputs, event_ids = await prepare(api, args)
+
+    if args.reset:
+        await reset_fixtures(event_ids)
+
+    before = await _count_fixtures(event_ids)
+    calls_before = api.calls
+
+    async with AsyncSessionLocal() as session:
+        with count_queries() as counter:
+            started = time.perf_counter()
+            # Pas de session.begin() : les pipelines valident à la création d'une saison
+            await run(session, api, args, inputs)
+            await session.commit()
+            elapsed = time.perf_counter() - started
+
+    fixtures = await _count_fixtures(event_ids) - before
+
+    http_calls = api.calls - calls_before
+    per_fixture = max(fixtures, 1)
+    return {
+        "scenario": name,
+        "fixtures": fixtures,
+        "seconds": round(elapsed, 3),
+        "fixtures_per_second": round(fixtures / elapsed, 2) if elapsed else 0,
+        "http_calls": http_calls,
+        "http_calls_per_fixture": round(http_calls / per_fixture, 1),
+        "sql_statements": counter.count,
+        "sql_per_fixture": round(counter.count / per_fixture, 1),
+    }
+
+
+def print_results(results):
+    print(f"\n{'scénario':<10} {'matchs':>7} {'secondes':>9} {'matchs/s':>9} {'HTTP':>6} {'HTTP/m':>7} {'SQL':>7} {'SQL/m':>7}")
+    for r in results:
+        print(
+            f"{r['scenario']:<10} {r['fixtures']:>7} {r['seconds']:>9} {r['fixtures_per_second']:>9} "
+            f"{r['http_calls']:>6} {r['http_calls_per_fixture']:>7} {r['sql_statements']:>7} {r['sql_per_fixture']:>7}"
+        )
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark d'ingestion sur réponses Sofascore enregistrées")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--cassettes", default=str(DEFAULT_CASSETTES), help="Dossier des réponses enregistrées")
+    parser.add_argument("--record", action="store_true", help="Appelle Sofascore et enregistre les réponses")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence simulée par appel HTTP (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latence aléatoire ajoutée (s)")
+    parser.add_argument("--league", type=int, default=270, help="uniqueTournament Sofascore (270 = CAN)")
+    parser.add_argument("--season", type=int, default=71636, help="Saison Sofascore")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--team", type=int, help="Équipe Sofascore du scénario friendly")
+    parser.add_argument("--reset", action="store_true", help="Supprime les matchs du scénario avant mesure")
+    parser.add_argument("--output", help="Résultats en JSON (comparaison entre deux versions)")
+    parser.add_argument("--trace", help="Spans OpenTelemetry en JSON (analyse : benchmarks/trace_report.py)")
+    args = parser.parse_args(argv)
+
+    if "friendly" in args.scenarios and args.team is None:
+        parser.error("--team est requis pour le scénario friendly")
+
+    if args.record:
+        api = RecordingSofascoreAPI(args.cassettes)
+    else:
+        api = ReplaySofascoreAPI(args.cassettes, latency=args.latency, jitter=args.jitter)
+
+    install_query_counter(engine)
+    if args.trace and setup_tracing("ingestion", JsonFileSpanExporter(args.trace)):
+        install_sql_tracing(engine)
+
+    # Span par appel HTTP ; calls / missing lus sur le transport
+    api = MeteredSofascoreAPI(api)
+
+    results = []
+    try:
+        for name in args.scenarios:
+            print(f"\n--- {name} ---")
+            results.append(await run_scenario(name, api, args))
+    finally:
+        await api.close()
+        await engine.dispose()
+        if args.trace:
+            shutdown_tracing()
+
+    print_results(results)
+    if not args.record and api.missing:
+        print(f"\n{len(api.missing)} réponse(s) non enregistrée(s), rejouées en 404")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
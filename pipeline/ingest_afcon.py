@@ -1,4 +1,5 @@
 import asyncio
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -6,12 +7,16 @@ from datetime import datetime
 # Ajouter le répertoire parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sofascore_wrapper.api import SofascoreAPI
+# Pool du profil ingestion (voir app/db/database.py), sauf profil imposé par l'environnement
+os.environ.setdefault("DB_PROFILE", "ingestion")
+
 from sofascore_wrapper.search import Search
 from sofascore_wrapper.league import League
 from sofascore_wrapper.match import Match
 
-from app.db import AsyncSessionLocal
+from app.core.tracing import fixture_span, setup_tracing, shutdown_tracing, install_sql_tracing
+from app.db import AsyncSessionLocal, engine
+from app.db.partitions import ensure_season_partitions
 from app.db.models import League as LeagueModel, Season, Fixture
 from app.services.scraper import (
     ingest_league, ingest_season, ingest_team, ingest_players_for_team,
@@ -19,122 +24,137 @@ from app.services.scraper import (
     ingest_cup_tree_matches, ingest_standings, ingest_match_events
 )
 from app.services.scraper.manager_service import ingest_managers_for_fixture
+from app.services.scraper.metered_api import MeteredSofascoreAPI
 from app.services.scraper.statistics_service import (
     ingest_all_players_statistics,
     ingest_all_teams_statistics
 )
+from app.services.player_aggregate_service import refresh_player_season_aggregates
+from app.services.standings_engine import recompute_standings
 from app.utils import get_or_create
 from sqlalchemy import select
 
 async def process_round_fixtures(session, api, league_obj, season_obj, match_data):
     
     for event in match_data["events"]:
-        try:
-            fixture_query = select(Fixture).where(Fixture.sofascore_id == event["id"])
-            fixture_result = await session.execute(fixture_query)
-            existing_fixture = fixture_result.scalar_one_or_none()
+        with fixture_span(event["id"]):
+            try:
+                fixture_query = select(Fixture).where(Fixture.sofascore_id == event["id"])
+                fixture_result = await session.execute(fixture_query)
+                existing_fixture = fixture_result.scalar_one_or_none()
             
-            if existing_fixture:
-                print(f"  Match {event['id']} déjà ingéré, skip")
-                continue
+                if existing_fixture:
+                    print(f"  Match {event['id']} déjà ingéré, skip")
+                    continue
             
-            if not league_obj:
-                league_obj = await ingest_league(session, event)
-                season_obj = await ingest_season(session, event, league_obj.id)
+                if not league_obj:
+                    league_obj = await ingest_league(session, event)
+                    season_obj, season_created = await ingest_season(session, event, league_obj.id)
+                    if season_created:
+                        # Saison validée avant de créer ses partitions : une connexion à part
+                        # attendrait sinon la fin de la transaction (lock_timeout)
+                        await session.commit()
+                        await ensure_season_partitions(season_obj.id)
             
-            match_status = event.get("status", {}).get("type", "notstarted")
-            # print(f"  Match {event['id']} - Status: {match_status}")
+                match_status = event.get("status", {}).get("type", "notstarted")
+                # print(f"  Match {event['id']} - Status: {match_status}")
             
-            # Équipes
-            try:
-                home_team = await ingest_team(session, api, event["homeTeam"])
-                away_team = await ingest_team(session, api, event["awayTeam"])
-            except Exception as e:
-                print(f" Erreur équipes: {e}")
-                continue
+                # Équipes
+                try:
+                    home_team = await ingest_team(session, api, event["homeTeam"])
+                    away_team = await ingest_team(session, api, event["awayTeam"])
+                except Exception as e:
+                    print(f" Erreur équipes: {e}")
+                    continue
             
-            if not home_team or not away_team:
-                print(f"Équipes manquantes, skip")
-                continue
+                if not home_team or not away_team:
+                    print(f"Équipes manquantes, skip")
+                    continue
             
-            # Joueurs
-            try:
-                await ingest_players_for_team(session, api, event["homeTeam"]["id"], home_team.id)
-                await ingest_players_for_team(session, api, event["awayTeam"]["id"], away_team.id)
-            except Exception as e:
-                print(f" Erreur joueurs: {e}")
+                # Joueurs
+                try:
+                    await ingest_players_for_team(session, api, event["homeTeam"]["id"], home_team.id)
+                    await ingest_players_for_team(session, api, event["awayTeam"]["id"], away_team.id)
+                except Exception as e:
+                    print(f" Erreur joueurs: {e}")
             
-            # Managers
-            try:
-                await ingest_managers_for_fixture(
-                    session, api, event["id"],
-                    event["homeTeam"]["id"], 
-                    event["awayTeam"]["id"]
-                )
-            except Exception as e:
-                print(f"Erreur managers: {e}")
+                # Managers
+                try:
+                    await ingest_managers_for_fixture(
+                        session, api, event["id"],
+                        event["homeTeam"]["id"], 
+                        event["awayTeam"]["id"]
+                    )
+                except Exception as e:
+                    print(f"Erreur managers: {e}")
 
-            # Fixture
-            try:
-                fixture = await ingest_fixture(
-                    session, event, league_obj.id, season_obj.id,
-                    home_team.id, away_team.id
-                )
-            except Exception as e:
-                print(f"Erreur fixture: {e}")
-                continue
-            
-            # Lineups
-            if match_status in ["inprogress", "finished"]:
+                # Fixture
                 try:
-                    match_obj = Match(api, event["id"])
+                    fixture = await ingest_fixture(
+                        session, event, league_obj.id, season_obj.id,
+                        home_team.id, away_team.id
+                    )
+                except Exception as e:
+                    print(f"Erreur fixture: {e}")
+                    continue
+            
+                # Lineups
+                if match_status in ["inprogress", "finished"]:
+                    try:
+                        match_obj = Match(api, event["id"])
                     
-                    home_lineups = await match_obj.lineups_home()
-                    if home_lineups:
-                        await ingest_lineups(session, fixture.id, home_lineups, event["homeTeam"]["id"])
+                        home_lineups = await match_obj.lineups_home()
+                        if home_lineups:
+                            await ingest_lineups(session, fixture.id, home_lineups, event["homeTeam"]["id"], season_id=fixture.season_id)
                     
-                    away_lineups = await match_obj.lineups_away()
-                    if away_lineups:
-                        await ingest_lineups(session, fixture.id, away_lineups, event["awayTeam"]["id"])
+                        away_lineups = await match_obj.lineups_away()
+                        if away_lineups:
+                            await ingest_lineups(session, fixture.id, away_lineups, event["awayTeam"]["id"], season_id=fixture.season_id)
                         
-                except Exception as e:
-                    print(f" Lineups indisponibles: {e}")
+                    except Exception as e:
+                        print(f" Lineups indisponibles: {e}")
             
-            # Stats et events
-            if match_status == "finished":
-                try:
-                    match_obj = Match(api, event["id"])
+                # Stats et events
+                if match_status == "finished":
+                    try:
+                        match_obj = Match(api, event["id"])
                     
-                    match_stats = await match_obj.stats()
-                    if match_stats:
-                        await ingest_match_statistics(
-                            session, fixture.id,
-                            event["homeTeam"]["id"],
-                            event["awayTeam"]["id"],
-                            match_stats
-                        )
+                        match_stats = await match_obj.stats()
+                        if match_stats:
+                            await ingest_match_statistics(
+                                session, fixture.id,
+                                event["homeTeam"]["id"],
+                                event["awayTeam"]["id"],
+                                match_stats,
+                                season_id=fixture.season_id
+                            )
                     
-                    match_incidents = await match_obj.incidents()
-                    if match_incidents:
-                        await ingest_match_events(
-                            session, match_incidents, fixture.id,
-                            home_team.id, away_team.id
-                        )
+                        match_incidents = await match_obj.incidents()
+                        if match_incidents:
+                            await ingest_match_events(
+                                session, match_incidents, fixture.id,
+                                home_team.id, away_team.id,
+                                season_id=fixture.season_id
+                            )
+                    
+                        await refresh_player_season_aggregates(session, fixture.id)
                         
-                except Exception as e:
-                    print(f" Stats/events indisponibles: {e}")
+                    except Exception as e:
+                        print(f" Stats/events indisponibles: {e}")
             
-        except Exception as e:
-            print(f" Erreur match {event['id']}: {str(e)}")
-            continue
+            except Exception as e:
+                print(f" Erreur match {event['id']}: {str(e)}")
+                continue
     
     return league_obj, season_obj
 
 
 async def main():
-    api = SofascoreAPI()
+    if setup_tracing("ingestion"):
+        install_sql_tracing(engine)
+    api = MeteredSofascoreAPI()
 
-    async def fetch_all_competitions(api: SofascoreAPI, competition_names: list[str]) -> dict:
+    async def fetch_all_competitions(api, competition_names: list[str]) -> dict:
         
         competitions_data = {}
 
@@ -193,104 +213,110 @@ async def main():
 
     competitions_data = await fetch_all_competitions(api, competitions)
 
+    # Pas de session.begin() : process_round_fixtures valide la transaction à la création
+    # d'une saison (partitions), puis validation en fin de run. Le run n'est donc pas
+    # atomique : après une erreur, relancer le script (get_or_create / upserts idempotents)
     async with AsyncSessionLocal() as session:
         try:
-            async with session.begin():
-                for comp_name, comp_data in competitions_data.items():
-                    if not comp_data or not comp_data.get("latest_season_id"):
-                        print(f"Pas de données pour {comp_name}")
-                        continue
+            for comp_name, comp_data in competitions_data.items():
+                if not comp_data or not comp_data.get("latest_season_id"):
+                    print(f"Pas de données pour {comp_name}")
+                    continue
 
-                    league_obj = None
-                    season_obj = None
-                    latest_season_id = comp_data["latest_season_id"]
-                    rounds_list = comp_data["rounds"]
-                    league = comp_data["league_obj"]
-
-                    print("\n" + "="*50)
-                    print(f" INGESTION {comp_name.upper()}")
-                    print("="*50 + "\n")
-
-                    # PHASE DE GROUPES
-                    for round_number in rounds_list:
-                        try:
-                            await asyncio.sleep(1)
-                            print(f"\n--- Round {round_number} ---")
-                            match_data = await league.league_fixtures_per_round(
-                                latest_season_id, round_number
-                            )
-                            league_obj, season_obj = await process_round_fixtures(
-                                session, api, league_obj, season_obj, match_data
-                            )
-                        except Exception as e:
-                            print(f" Erreur round {round_number}: {str(e)}")
-                            continue
-
-                    # PHASES FINALES
-                    if league_obj and season_obj:
-                        await ingest_cup_tree_matches(
-                            session, api, latest_season_id,
-                            league_obj, season_obj
+                league_obj = None
+                season_obj = None
+                latest_season_id = comp_data["latest_season_id"]
+                rounds_list = comp_data["rounds"]
+                league = comp_data["league_obj"]
+
+                print("\n" + "="*50)
+                print(f" INGESTION {comp_name.upper()}")
+                print("="*50 + "\n")
+
+                # PHASE DE GROUPES
+                for round_number in rounds_list:
+                    try:
+                        await asyncio.sleep(1)
+                        print(f"\n--- Round {round_number} ---")
+                        match_data = await league.league_fixtures_per_round(
+                            latest_season_id, round_number
                         )
+                        league_obj, season_obj = await process_round_fixtures(
+                            session, api, league_obj, season_obj, match_data
+                        )
+                    except Exception as e:
+                        print(f" Erreur round {round_number}: {str(e)}")
+                        continue
+
+                # PHASES FINALES
+                if league_obj and season_obj:
+                    await ingest_cup_tree_matches(
+                        session, api, latest_season_id,
+                        league_obj, season_obj
+                    )
+
+                # CLASSEMENTS
+                # if not season_obj:
+                #     continue
+                # else:
+                standings_data = comp_data["standings"]
+                if standings_data:
+                        await ingest_standings(session, standings_data, season_obj.id)
+                        print("Classements ingérés avec succès")
+
+                # Classements recalculés depuis les scores des matchs terminés
+                if season_obj:
+                    await recompute_standings(session, season_obj.id)
+
+                # STATISTIQUES
+                # print("\n" + "="*50)
+                # print("STATISTIQUES")
+                # print("="*50 + "\n")
 
-                    # CLASSEMENTS
-                    # if not season_obj:
-                    #     continue
-                    # else:
-                    standings_data = comp_data["standings"]
-                    if standings_data:
-                            await ingest_standings(session, standings_data, season_obj.id)
-                            print("Classements ingérés avec succès")
-
-                    # STATISTIQUES
-                    # print("\n" + "="*50)
-                    # print("STATISTIQUES")
-                    # print("="*50 + "\n")
-
-                    # async with AsyncSessionLocal() as session:
-                    #     first_match_query = select(Fixture).where(
-                    #         Fixture.season_id == season_obj.id
-                    #     ).order_by(Fixture.date.asc()).limit(1)
+                # async with AsyncSessionLocal() as session:
+                #     first_match_query = select(Fixture).where(
+                #         Fixture.season_id == season_obj.id
+                #     ).order_by(Fixture.date.asc()).limit(1)
                         
-                    #     result = await session.execute(first_match_query)
-                    #     first_match = result.scalar_one_or_none()
+                #     result = await session.execute(first_match_query)
+                #     first_match = result.scalar_one_or_none()
                         
-                    #     finished_match_query = select(Fixture).where(
-                    #         Fixture.season_id == season_obj.id,
-                    #         Fixture.status == "finished"
-                    #     ).limit(1)
+                #     finished_match_query = select(Fixture).where(
+                #         Fixture.season_id == season_obj.id,
+                #         Fixture.status == "finished"
+                #     ).limit(1)
                         
-                    #     result = await session.execute(finished_match_query)
-                    #     has_finished_matches = result.scalar_one_or_none()
+                #     result = await session.execute(finished_match_query)
+                #     has_finished_matches = result.scalar_one_or_none()
                         
-                    #     if not first_match:
-                    #         print(f"Competition pas encore commencée")
-                    #     elif not has_finished_matches:
-                    #         print("Aucun match terminé, stats pas encore disponibles")
-                    #     else:
-                    try:
-                        await ingest_all_teams_statistics(
-                            session, api,
-                            comp_data["league_id"], latest_season_id,
-                            league_obj.id, season_obj.id
-                        )
-                    except Exception as e:
-                        print(f"Erreur stats équipes: {e}")
+                #     if not first_match:
+                #         print(f"Competition pas encore commencée")
+                #     elif not has_finished_matches:
+                #         print("Aucun match terminé, stats pas encore disponibles")
+                #     else:
+                try:
+                    await ingest_all_teams_statistics(
+                        session, api,
+                        comp_data["league_id"], latest_season_id,
+                        league_obj.id, season_obj.id
+                    )
+                except Exception as e:
+                    print(f"Erreur stats équipes: {e}")
                     
-                    try:
-                        await ingest_all_players_statistics(
-                            session, api,
-                            comp_data["league_id"], latest_season_id,
-                            league_obj.id, season_obj.id
-                        )
-                    except Exception as e:
-                        print(f"Erreur stats joueurs: {e}")
+                try:
+                    await ingest_all_players_statistics(
+                        session, api,
+                        comp_data["league_id"], latest_season_id,
+                        league_obj.id, season_obj.id
+                    )
+                except Exception as e:
+                    print(f"Erreur stats joueurs: {e}")
 
-                await session.commit()
+            await session.commit()
 
-                print("\n" + "="*50)
-                print(" INGESTION TERMINÉE AVEC SUCCÈS!")
-                print("="*50 + "\n")
+            print("\n" + "="*50)
+            print(" INGESTION TERMINÉE AVEC SUCCÈS!")
+            print("="*50 + "\n")
 
         except Exception as e:
             print(f"\n ERREUR FATALE: {str(e)}")
@@ -298,6 +324,7 @@ async def main():
             traceback.print_exc()
         finally:
             await api.close()
+            shutdown_tracing()
 
 
 if __name__ == "__main__":
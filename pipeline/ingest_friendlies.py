@@ -1,23 +1,30 @@
 # scripts/ingest_friendlies.py
 
 import asyncio
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sofascore_wrapper.api import SofascoreAPI
+# Profil de connexion ingestion
+os.environ.setdefault("DB_PROFILE", "ingestion")
+
 from sofascore_wrapper.search import Search
 from sofascore_wrapper.team import Team
 from sofascore_wrapper.match import Match
 
-from app.db import AsyncSessionLocal
+from app.core.tracing import fixture_span, setup_tracing, shutdown_tracing, install_sql_tracing
+from app.db import AsyncSessionLocal, engine
+from app.db.partitions import ensure_season_partitions
 from app.services.scraper import (
     ingest_league, ingest_season, ingest_team, ingest_players_for_team,
     ingest_fixture, ingest_lineups, ingest_match_statistics, ingest_match_events
 )
 from app.services.scraper.manager_service import ingest_managers_for_fixture
+from app.services.player_aggregate_service import refresh_player_season_aggregates
+from app.services.scraper.metered_api import MeteredSofascoreAPI
 from sqlalchemy import select
 from app.db.models import Fixture
 
@@ -40,6 +47,11 @@ def filter_friendly_matches(matches: list[dict]) -> list[dict]:
 
 
 async def ingest_friendly_fixture(session, api, event: dict):
+    with fixture_span(event["id"]):
+        await _ingest_friendly_fixture(session, api, event)
+
+
+async def _ingest_friendly_fixture(session, api, event: dict):
 
     # Skip si déjà en base
     existing = await session.execute(
@@ -54,7 +66,12 @@ async def ingest_friendly_fixture(session, api, event: dict):
 
     # League & Season
     league_obj = await ingest_league(session, event)
-    season_obj = await ingest_season(session, event, league_obj.id)
+    season_obj, season_created = await ingest_season(session, event, league_obj.id)
+    if season_created:
+        # Saison validée avant de créer ses partitions : une connexion à part
+        # attendrait sinon la fin de la transaction (lock_timeout)
+        await session.commit()
+        await ensure_season_partitions(season_obj.id)
 
     # Équipes
     try:
@@ -103,11 +120,11 @@ async def ingest_friendly_fixture(session, api, event: dict):
         try:
             home_lineups = await match_obj.lineups_home()
             if home_lineups:
-                await ingest_lineups(session, fixture.id, home_lineups, event["homeTeam"]["id"])
+                await ingest_lineups(session, fixture.id, home_lineups, event["homeTeam"]["id"], season_id=fixture.season_id)
 
             away_lineups = await match_obj.lineups_away()
             if away_lineups:
-                await ingest_lineups(session, fixture.id, away_lineups, event["awayTeam"]["id"])
+                await ingest_lineups(session, fixture.id, away_lineups, event["awayTeam"]["id"], season_id=fixture.season_id)
         except Exception as e:
             print(f"    Lineups indisponibles: {e}")
 
@@ -119,21 +136,27 @@ async def ingest_friendly_fixture(session, api, event: dict):
                     session, fixture.id,
                     event["homeTeam"]["id"],
                     event["awayTeam"]["id"],
-                    match_stats
+                    match_stats,
+                    season_id=fixture.season_id
                 )
 
             incidents = await match_obj.incidents()
             if incidents:
                 await ingest_match_events(
                     session, incidents, fixture.id,
-                    home_team.id, away_team.id
+                    home_team.id, away_team.id,
+                    season_id=fixture.season_id
                 )
+
+            await refresh_player_season_aggregates(session, fixture.id)
         except Exception as e:
             print(f"    Stats/events indisponibles: {e}")
 
 
 async def main():
-    api = SofascoreAPI()
+    if setup_tracing("ingestion"):
+        install_sql_tracing(engine)
+    api = MeteredSofascoreAPI()
 
     try:
         search = Search(api, search_string=TEAM_NAME)
@@ -146,13 +169,14 @@ async def main():
         friendly_matches = filter_friendly_matches(next_matches)
         print(f"\n{len(friendly_matches)} match(s) amicaux trouvés\n")
 
+        # Transaction validée par ingest_friendly_fixture à la création d'une saison (partitions),
+        # puis en fin de boucle : pas de session.begin(), un run interrompu se relance tel quel
         async with AsyncSessionLocal() as session:
-            async with session.begin():
-                for event in friendly_matches:
-                    await asyncio.sleep(1)
-                    await ingest_friendly_fixture(session, api, event)
+            for event in friendly_matches:
+                await asyncio.sleep(1)
+                await ingest_friendly_fixture(session, api, event)
 
-                await session.commit()
+            await session.commit()
 
         print("\nIngestion matchs amicaux terminée ✓")
 
@@ -162,6 +186,7 @@ async def main():
         traceback.print_exc()
     finally:
         await api.close()
+        shutdown_tracing()
 
 
 if __name__ == "__main__":
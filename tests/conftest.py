@@ -0,0 +1,127 @@
+import pytest
+from datetime import datetime, timedelta
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+
+from app.main import app
+from app.api import live_routes
+from app.auth import verify_api_key
+from app.db.database import engine, AsyncSessionLocal
+from app.db.instrumentation import install_query_counter
+from app.db.partitions import ensure_season_partitions, drop_season_partitions
+from app.db.models import (
+    League, Season, Team, Player, Fixture, Standing, MatchEvent, MatchStatTimeline, Lineup,
+    MatchStatistics, PlayerSeasonAggregate, TournamentType, MatchStatus
+)
+
+# Les tests de performance comptent les requêtes SQL de chaque appel
+install_query_counter(engine)
+
+# Plage de sofascore_id réservée aux données de test
+SEED_BASE_ID = 990_000
+
+
+@pytest.fixture
+async def client():
+    # L'authentification fait elle-même des requêtes : on la neutralise
+    app.dependency_overrides[verify_api_key] = lambda: None
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.pop(verify_api_key, None)
+    await engine.dispose()
+    # Comme l'engine : connexions Redis des routes /live liées à la boucle du test
+    await live_routes.live_service.redis.connection_pool.disconnect()
+    await live_routes.live_service.timeline.redis.connection_pool.disconnect()
+
+
+async def _seed(team_count: int) -> dict:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            league = League(
+                sofascore_id=SEED_BASE_ID, name="Test League", slug="test-league",
+                type=TournamentType.OTHER, country="Test"
+            )
+            session.add(league)
+            await session.flush()
+
+            season = Season(
+                sofascore_id=SEED_BASE_ID, league_id=league.id,
+                year="2099", name="Test League 2099", current=True
+            )
+            session.add(season)
+
+        # Partitions de la saison créées avant d'y insérer des matchs
+        await ensure_season_partitions(season.id)
+
+        async with session.begin():
+            teams = []
+            for i in range(team_count):
+                team = Team(
+                    sofascore_id=SEED_BASE_ID + i, name=f"Test Team {i}",
+                    slug=f"test-team-{i}", national=True
+                )
+                session.add(team)
+                teams.append(team)
+            await session.flush()
+
+            kickoff = datetime.utcnow() + timedelta(minutes=30)
+            fixtures = []
+            for i in range(0, team_count - 1, 2):
+                fixture = Fixture(
+                    sofascore_id=SEED_BASE_ID + i, league_id=league.id, season_id=season.id,
+                    home_team_id=teams[i].id, away_team_id=teams[i + 1].id,
+                    date=kickoff, status=MatchStatus.FINISHED,
+                    home_score=i % 3, away_score=1, group_name="Group A"
+                )
+                session.add(fixture)
+                fixtures.append(fixture)
+
+            for rank, team in enumerate(teams, start=1):
+                session.add(Standing(
+                    sofascore_id=SEED_BASE_ID + rank, season_id=season.id, team_id=team.id,
+                    group="Group A", rank=rank, total_matches=1, wins=0, draws=0, losses=0,
+                    goals_for=0, goals_against=0, goal_difference=0, points=team_count - rank
+                ))
+            await session.flush()
+
+            return {
+                "league_id": league.id,
+                "season_id": season.id,
+                "team_ids": [t.id for t in teams],
+                "fixture_ids": [f.id for f in fixtures],
+            }
+
+
+async def _cleanup(seed: dict):
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(delete(Standing).where(Standing.season_id == seed["season_id"]))
+            await session.execute(delete(PlayerSeasonAggregate).where(PlayerSeasonAggregate.season_id == seed["season_id"]))
+            await session.execute(delete(MatchEvent).where(MatchEvent.fixture_id.in_(seed["fixture_ids"])))
+            await session.execute(delete(MatchStatTimeline).where(MatchStatTimeline.fixture_id.in_(seed["fixture_ids"])))
+            await session.execute(delete(MatchStatistics).where(MatchStatistics.fixture_id.in_(seed["fixture_ids"])))
+            await session.execute(delete(Lineup).where(Lineup.fixture_id.in_(seed["fixture_ids"])))
+            await session.execute(delete(Fixture).where(Fixture.season_id == seed["season_id"]))
+            await session.execute(delete(Player).where(Player.team_id.in_(seed["team_ids"])))
+            await session.execute(delete(Team).where(Team.id.in_(seed["team_ids"])))
+            await session.execute(delete(Season).where(Season.id == seed["season_id"]))
+            await session.execute(delete(League).where(League.id == seed["league_id"]))
+    await drop_season_partitions(seed["season_id"])
+    await engine.dispose()
+
+
+@pytest.fixture
+async def seed_data():
+    # Fabrique : chaque test choisit la taille du jeu de données
+    seeds = []
+
+    async def factory(team_count: int = 4) -> dict:
+        seed = await _seed(team_count)
+        seeds.append(seed)
+        return seed
+
+    yield factory
+
+    for seed in seeds:
+        await _cleanup(seed)
@@ -0,0 +1,76 @@
+import pytest
+
+from app.db.database import AsyncSessionLocal
+from app.db.instrumentation import assert_max_queries
+from app.db.models import Player, Lineup, MatchEvent, EventType
+from app.services.player_aggregate_service import refresh_player_season_aggregates
+from tests.conftest import SEED_BASE_ID
+
+
+async def _add_match_data(seed):
+    fixture_id = seed["fixture_ids"][0]
+    home_team_id = seed["team_ids"][0]
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            scorer = Player(sofascore_id=SEED_BASE_ID + 100, name="Scorer", team_id=home_team_id)
+            passer = Player(sofascore_id=SEED_BASE_ID + 101, name="Passer", team_id=home_team_id)
+            session.add_all([scorer, passer])
+            await session.flush()
+
+            session.add_all([
+                Lineup(fixture_id=fixture_id, team_id=home_team_id, player_id=scorer.id,
+                       starter=True, minutes_played=90, rating=8.0),
+                Lineup(fixture_id=fixture_id, team_id=home_team_id, player_id=passer.id,
+                       starter=False, substitute=True, minutes_played=20, rating=7.0),
+            ])
+            session.add_all([
+                MatchEvent(fixture_id=fixture_id, team_id=home_team_id, player_id=scorer.id,
+                           assist_player_id=passer.id, type=EventType.GOAL, minute=10, is_home=True),
+                MatchEvent(fixture_id=fixture_id, team_id=home_team_id, player_id=scorer.id,
+                           type=EventType.GOAL, minute=55, is_home=True),
+                MatchEvent(fixture_id=fixture_id, team_id=home_team_id, player_id=passer.id,
+                           type=EventType.GOAL, incident_class="ownGoal", minute=70, is_home=True),
+                MatchEvent(fixture_id=fixture_id, team_id=home_team_id, player_id=passer.id,
+                           type=EventType.YELLOW_CARD, minute=80, is_home=True),
+            ])
+            await session.flush()
+
+            await refresh_player_season_aggregates(session, fixture_id)
+
+            # Idempotent : une ré-ingestion ne double pas les compteurs
+            await refresh_player_season_aggregates(session, fixture_id)
+
+    return scorer.id, passer.id
+
+
+@pytest.mark.asyncio
+async def test_top_scorers_read_from_aggregates(client, seed_data):
+    seed = await seed_data(2)
+    scorer_id, passer_id = await _add_match_data(seed)
+
+    with assert_max_queries(1):
+        response = await client.get("/events/top-scorers", params={"season_id": seed["season_id"]})
+
+    assert response.status_code == 200
+    top_scorers = response.json()["data"]["top_scorers"]
+    assert [s["player"]["id"] for s in top_scorers] == [scorer_id]
+    assert top_scorers[0]["goals"] == 2
+
+
+@pytest.mark.asyncio
+async def test_player_season_statistics_from_aggregates(client, seed_data):
+    seed = await seed_data(2)
+    scorer_id, passer_id = await _add_match_data(seed)
+
+    with assert_max_queries(1):
+        response = await client.get(f"/statistics/player/{passer_id}/season/{seed['season_id']}")
+
+    assert response.status_code == 200
+    statistics = response.json()["data"]["statistics"]
+    assert statistics["matches_played"] == 1
+    assert statistics["minutes_played"] == 20
+    assert statistics["goals"] == 0
+    assert statistics["assists"] == 1
+    assert statistics["yellow_cards"] == 1
+    assert statistics["average_rating"] == 7.0
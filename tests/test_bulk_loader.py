@@ -0,0 +1,129 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from app.db.database import engine, AsyncSessionLocal
+from app.db.partitions import drop_season_partitions
+from app.db.models import (
+    League, Season, Team, Player, Fixture, Standing, MatchEvent, Lineup, MatchStatistics,
+    PlayerSeasonAggregate, MatchStatus
+)
+from app.services.bulk_loader import StagedBatch, build_batch, load_batch, stage_events, stage_match_details
+from tests.conftest import SEED_BASE_ID
+
+NOTEBOOKS = Path(__file__).resolve().parent.parent / "notebooks"
+
+BASE_ID = SEED_BASE_ID + 500
+
+
+def test_parse_staged_notebooks():
+    batch = build_batch(NOTEBOOKS / "all_can_matches_complete.json", NOTEBOOKS / "can_cup_tree.json")
+
+    assert len(batch.rows["leagues"]) == 1
+    assert len(batch.rows["seasons"]) == 1
+    # Matchs de poule + phases finales, sans équipes "vainqueur de..."
+    assert len(batch.rows["fixtures"]) == 51
+    assert len(batch.rows["teams"]) == 24
+
+    columns = batch.columns("fixtures")
+    statuses = {dict(zip(columns, row))["status"] for row in batch.records("fixtures")}
+    assert statuses <= {status.name for status in MatchStatus}
+
+
+def _team(offset: int):
+    return {"id": BASE_ID + offset, "name": f"Backfill Team {offset}", "slug": f"backfill-team-{offset}"}
+
+
+def _event(offset: int, home: int, away: int):
+    return {
+        "id": BASE_ID + offset,
+        "tournament": {"uniqueTournament": {
+            "id": BASE_ID, "name": "Backfill Cup", "slug": "backfill-cup", "category": {"name": "Test"},
+        }, "groupName": "Group A"},
+        "season": {"id": BASE_ID, "year": "2098", "name": "Backfill Cup 2098"},
+        "homeTeam": _team(home),
+        "awayTeam": _team(away),
+        "startTimestamp": 1_900_000_000 + offset * 3600,
+        "status": {"type": "finished"},
+        "homeScore": {"current": 2},
+        "awayScore": {"current": 1},
+    }
+
+
+def _details(offset: int, home: int, away: int):
+    def side(team: int):
+        return {"formation": "4-3-3", "starters": [
+            {"player": {"id": BASE_ID + team * 100 + n, "name": f"Player {team}-{n}"}, "position": "M",
+             "statistics": {"rating": 7, "minutesPlayed": 90}}
+            for n in range(11)
+        ], "substitutes": []}
+
+    return {
+        "lineups": {"home": side(home), "away": side(away)},
+        "incidents": {"incidents": [
+            {"id": BASE_ID + offset * 10, "incidentType": "goal", "incidentClass": "regular", "time": 12,
+             "isHome": True, "player": {"id": BASE_ID + home * 100}, "homeScore": 1, "awayScore": 0},
+            {"id": BASE_ID + offset * 10 + 1, "incidentType": "card", "incidentClass": "yellow", "time": 40,
+             "isHome": False, "player": {"id": BASE_ID + away * 100 + 3}},
+            {"incidentType": "period", "text": "HT"},
+        ]},
+        "statistics": {"statistics": [{"period": "ALL", "groups": [{"statisticsItems": [
+            {"key": "fouls", "homeValue": 10, "awayValue": 14},
+            {"key": "ballPossession", "homeValue": 55, "awayValue": 45},
+        ]}]}]},
+    }
+
+
+@pytest.fixture
+async def backfill_batch():
+    batch = StagedBatch()
+    pairs = [(0, 1), (2, 3), (0, 2), (1, 3)]
+    stage_events(batch, [_event(i, home, away) for i, (home, away) in enumerate(pairs)])
+    for i, (home, away) in enumerate(pairs):
+        stage_match_details(batch, BASE_ID + i, BASE_ID + home, BASE_ID + away, _details(i, home, away))
+
+    yield batch
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            season_id = await session.scalar(select(Season.id).where(Season.sofascore_id == BASE_ID))
+            if season_id:
+                for model in (Standing, PlayerSeasonAggregate, MatchStatistics, MatchEvent, Lineup, Fixture):
+                    await session.execute(delete(model).where(model.season_id == season_id))
+                team_ids = select(Team.id).where(Team.sofascore_id.between(BASE_ID, BASE_ID + 3))
+                await session.execute(delete(Player).where(Player.team_id.in_(team_ids)))
+                await session.execute(delete(Team).where(Team.id.in_(team_ids)))
+                await session.execute(delete(Season).where(Season.id == season_id))
+                await session.execute(delete(League).where(League.sofascore_id == BASE_ID))
+    if season_id:
+        await drop_season_partitions(season_id)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_load_batch_merges_and_is_idempotent(backfill_batch):
+    inserted = await load_batch(backfill_batch)
+
+    assert inserted["fixtures"] == 4
+    assert inserted["teams"] == 4
+    assert inserted["players"] == 44
+    assert inserted["lineups"] == 88
+    assert inserted["match_events"] == 8
+    assert inserted["match_statistics"] == 8
+
+    async with AsyncSessionLocal() as session:
+        season_id = await session.scalar(select(Season.id).where(Season.sofascore_id == BASE_ID))
+        goals = await session.scalar(
+            select(func.count()).select_from(MatchEvent)
+            .where(MatchEvent.season_id == season_id, MatchEvent.player_id.is_not(None))
+        )
+        standings = await session.scalar(
+            select(func.count()).select_from(Standing).where(Standing.season_id == season_id)
+        )
+    assert goals == 8
+    assert standings == 4
+
+    # Second passage : tout existe déjà
+    again = await load_batch(backfill_batch)
+    assert sum(again.values()) == 0
@@ -0,0 +1,123 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+import redis.asyncio as redis
+
+from app.api import live_routes
+from app.core.config import settings
+from app.services.scraper.circuit_breaker import (
+    CircuitBreaker, CircuitOpen, BudgetExceeded, GuardedSofascoreAPI, upstream_budget
+)
+from tests.conftest import SEED_BASE_ID
+
+
+class _Upstream:
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def _get(self, endpoint):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise Exception(f"Failed to fetch {endpoint}: {self.error}")
+        return {"endpoint": endpoint}
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+async def redis_client():
+    client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+def _breakers(redis_client, **options):
+    # Deux workers, même nom de circuit : état partagé par Redis
+    name = f"test:{uuid.uuid4().hex}"
+    return [CircuitBreaker(redis_client, name, **options) for _ in range(2)]
+
+
+@pytest.mark.asyncio
+async def test_trips_across_workers_then_probes(redis_client):
+    worker_a, worker_b = _breakers(redis_client, failure_threshold=3, open_seconds=1)
+    failing, healthy = _Upstream(error=503), _Upstream()
+
+    try:
+        # 404 : réponse normale, ne compte pas
+        with pytest.raises(Exception, match="404"):
+            await worker_a.call(_Upstream(error=404)._get, "/event/1")
+        for worker in (worker_a, worker_b, worker_a):
+            with pytest.raises(Exception, match="503"):
+                await worker.call(failing._get, "/event/1")
+
+        # Ouvert pour les deux workers, sans appel amont
+        with pytest.raises(CircuitOpen):
+            await worker_b.call(failing._get, "/event/1")
+        assert failing.calls == 3
+        assert await worker_a.state() == "open"
+
+        await asyncio.sleep(1.1)
+        assert await worker_a.state() == "half_open"
+        assert await worker_b.call(healthy._get, "/event/1") == {"endpoint": "/event/1"}
+        assert await worker_a.state() == "closed"
+    finally:
+        await worker_a._reset()
+
+
+@pytest.mark.asyncio
+async def test_call_timeout_and_request_budget(redis_client):
+    breaker, _ = _breakers(redis_client, failure_threshold=2, call_timeout=0.05)
+    slow = _Upstream(delay=1.0)
+
+    try:
+        started = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(slow._get, "/event/1")
+        assert time.perf_counter() - started < 0.5
+
+        with upstream_budget(0.0):
+            with pytest.raises(BudgetExceeded):
+                await breaker.call(_Upstream()._get, "/event/1")
+        assert await breaker.state() == "closed"
+
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(slow._get, "/event/1")
+        assert await breaker.state() == "open"
+    finally:
+        await breaker._reset()
+
+
+@pytest.mark.asyncio
+async def test_live_route_serves_stale_when_upstream_down(client):
+    service = live_routes.live_service
+    original_api = service.api
+    service.api = GuardedSofascoreAPI(_Upstream(error=503), service.redis)
+    stale_id, missing_id = SEED_BASE_ID + 910, SEED_BASE_ID + 911
+    breaker = service.api.breaker("/event/{id}")
+
+    try:
+        await service.cache_live_data(stale_id, {"status": "inprogress", "match_info": {}, "timestamp": "t0"})
+        await service.redis.delete(f"live:fixture:{stale_id}")
+        await breaker.trip()
+
+        response = await client.get(f"/live/match/{stale_id}")
+        assert response.status_code == 200
+        assert response.json()["data"]["last_updated"] == "t0"
+
+        # Rien en cache : échec rapide
+        started = time.perf_counter()
+        response = await client.get(f"/live/match/{missing_id}")
+        assert response.status_code == 503
+        assert time.perf_counter() - started < settings.SOFASCORE_CALL_TIMEOUT_SECONDS
+    finally:
+        await breaker._reset()
+        await service.redis.delete(f"live:stale:{stale_id}")
+        service.api = original_api
+        await service.redis.connection_pool.disconnect()
@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.database import ENGINE_PROFILES, engine_options, create_engine_for
+
+
+def test_each_profile_reads_its_settings():
+    for profile in ENGINE_PROFILES:
+        options = engine_options(profile)
+        prefix = f"DB_{profile.upper()}_"
+        assert options["pool_size"] == getattr(settings, f"{prefix}POOL_SIZE")
+        assert options["max_overflow"] == getattr(settings, f"{prefix}MAX_OVERFLOW")
+        assert options["connect_args"]["prepared_statement_cache_size"] == \
+            getattr(settings, f"{prefix}PREPARED_STATEMENT_CACHE_SIZE")
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        engine_options("batch")
+
+
+@pytest.mark.asyncio
+async def test_profile_timeouts_applied_by_server():
+    engine = create_engine_for("live_tracker")
+    try:
+        async with engine.connect() as conn:
+            timeout = await conn.scalar(text("SELECT current_setting('statement_timeout')"))
+            name = await conn.scalar(text("SELECT current_setting('application_name')"))
+    finally:
+        await engine.dispose()
+
+    assert timeout == f"{settings.DB_LIVE_TRACKER_STATEMENT_TIMEOUT_MS // 1000}s"
+    assert name == f"{settings.APP_NAME}-live_tracker"
@@ -0,0 +1,48 @@
+import pytest
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.db.database import AsyncSessionLocal
+from app.db.models import Fixture
+from app.schemas import APIResponse, FixtureDetailed
+
+
+async def _pydantic_fixtures(season_id: int) -> list:
+    # Chemin historique : ORM + FixtureDetailed, sérialisé comme le ferait FastAPI
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Fixture).options(
+                joinedload(Fixture.home_team),
+                joinedload(Fixture.away_team),
+                joinedload(Fixture.league),
+                joinedload(Fixture.season)
+            ).where(Fixture.season_id == season_id).order_by(Fixture.date, Fixture.id)
+        )
+        fixtures = [FixtureDetailed.model_validate(f).model_dump() for f in result.scalars().all()]
+    return jsonable_encoder(APIResponse(success=True, data={"fixtures": fixtures}))
+
+
+@pytest.mark.asyncio
+async def test_fixtures_fast_path_matches_pydantic_output(client, seed_data):
+    seed = await seed_data(6)
+
+    response = await client.get("/fixtures", params={"season_id": seed["season_id"]})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == await _pydantic_fixtures(seed["season_id"])
+
+
+@pytest.mark.asyncio
+async def test_fixture_detail_fast_path(client, seed_data):
+    seed = await seed_data(2)
+    fixture_id = seed["fixture_ids"][0]
+
+    response = await client.get(f"/fixtures/{fixture_id}")
+    assert response.status_code == 200
+    expected = (await _pydantic_fixtures(seed["season_id"]))["data"]["fixtures"][0]
+    assert response.json()["data"]["fixture"] == expected
+
+    response = await client.get("/fixtures/0")
+    assert response.status_code == 404
@@ -0,0 +1,140 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.db.models import Fixture, MatchStatus
+from app.services.scraper.kickoff_index import KickoffIndex
+from app.services.scraper.live_events import stream_key
+from app.services.scraper.live_latency import LAG_BOARD_KEY
+from app.services.scraper.live_service import LiveMatchService
+from app.services.scraper.replay_api import ReplaySofascoreAPI, cassette_path
+from tests.conftest import SEED_BASE_ID
+
+LEAD, MAX_DURATION = timedelta(minutes=60), timedelta(minutes=180)
+
+
+def test_index_orders_kickoffs_and_applies_diffs():
+    now = datetime(2099, 6, 1, 12, 0)
+    index = KickoffIndex(LEAD, MAX_DURATION)
+
+    changes = index.apply([(3, now + timedelta(hours=5)), (1, now + timedelta(minutes=30)), (2, now + timedelta(hours=2))])
+    assert changes == {"added": 3, "moved": 0, "removed": 0}
+    assert index.due(now) == [(1, now + timedelta(minutes=30))]
+    assert index.next_wake() == now - timedelta(minutes=30)
+
+    # Match 2 avancé, match 1 terminé (sorti de la requête)
+    changes = index.apply([(2, now + timedelta(minutes=45)), (3, now + timedelta(hours=5))])
+    assert changes == {"added": 0, "moved": 1, "removed": 1}
+    assert [fixture_id for fixture_id, _ in index.due(now)] == [2]
+
+
+class _Tracker:
+    # update_live_match simulé : le match 1 se termine
+
+    def __init__(self):
+        self.polled = []
+        self._next_polls, self._halftime_since = {}, {}
+
+    async def update_live_match(self, fixture_id):
+        self.polled.append(fixture_id)
+        return {"status": "finished", "next_poll_at": 0} if fixture_id == 1 else None
+
+
+@pytest.mark.asyncio
+async def test_tracker_polls_due_fixtures_then_sleeps_until_next_kickoff():
+    now = datetime.utcnow()
+    index = KickoffIndex(LEAD, MAX_DURATION)
+    index.apply([
+        (1, now - timedelta(minutes=10)),
+        (2, now - timedelta(hours=4)),      # jamais "finished" côté Sofascore
+        (3, now + timedelta(hours=5)),
+    ])
+    tracker = _Tracker()
+
+    delay = await LiveMatchService.track_due_fixtures(tracker, index, now)
+    assert tracker.polled == [1]
+    assert delay == settings.LIVE_POLL_SECONDS
+    assert 3 in index and len(index) == 1
+
+    # Plus rien d'ouvert : sommeil jusqu'à coup d'envoi - lead
+    delay = await LiveMatchService.track_due_fixtures(tracker, index, now)
+    assert tracker.polled == [1]
+    assert abs(delay - (timedelta(hours=4).total_seconds())) < 5
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_ingestion_changes(seed_data):
+    await seed_data(4)
+    fixture_id = SEED_BASE_ID
+    index = KickoffIndex(LEAD, MAX_DURATION)
+
+    async def refresh():
+        async with AsyncSessionLocal() as session:
+            return await index.refresh(session, datetime.utcnow())
+
+    async def set_fixture(**values):
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                await session.execute(update(Fixture).where(Fixture.sofascore_id == fixture_id).values(**values))
+
+    # Matchs du jeu de test terminés : hors index
+    await refresh()
+    assert fixture_id not in index
+
+    await set_fixture(status=MatchStatus.NOT_STARTED)
+    await refresh()
+    assert fixture_id in [f for f, _ in index.due(datetime.utcnow())]
+
+    await set_fixture(date=datetime.utcnow() + timedelta(days=1))
+    assert (await refresh())["moved"] >= 1
+    assert fixture_id in index
+    assert fixture_id not in [f for f, _ in index.due(datetime.utcnow())]
+
+
+def _record_status(cassette_dir, fixture_id, status):
+    event = {"event": {"status": {"type": status}, "homeScore": {"current": 0}, "awayScore": {"current": 1}}}
+    with open(cassette_path(cassette_dir, f"/event/{fixture_id}"), "w") as f:
+        json.dump(event, f)
+
+
+async def _db_status(fixture_id):
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(select(Fixture.status).where(Fixture.sofascore_id == fixture_id))
+
+
+@pytest.mark.asyncio
+async def test_tracker_releases_canceled_match(seed_data, tmp_path, monkeypatch):
+    seed = await seed_data(4)
+    fixture_id = SEED_BASE_ID + 2
+    service = LiveMatchService()
+    service.api = ReplaySofascoreAPI(tmp_path)
+    monkeypatch.setattr(settings, "LIVE_POLL_SPACING_SECONDS", 0)
+    index = KickoffIndex(LEAD, MAX_DURATION)
+    index.add(fixture_id, datetime.utcnow() - timedelta(minutes=10))
+
+    try:
+        # Statut hors MatchStatus : base inchangée, match toujours suivi
+        _record_status(tmp_path, fixture_id, "interrupted")
+        await service.track_due_fixtures(index, datetime.utcnow())
+        assert fixture_id in index
+        assert await _db_status(fixture_id) == MatchStatus.FINISHED
+
+        # "canceled" (orthographe Sofascore) : CANCELLED en base, match libéré
+        _record_status(tmp_path, fixture_id, "canceled")
+        service._next_polls.pop(fixture_id, None)
+        await service.track_due_fixtures(index, datetime.utcnow())
+        assert fixture_id not in index
+        assert await _db_status(fixture_id) == MatchStatus.CANCELLED
+    finally:
+        key = stream_key(fixture_id)
+        await service.redis.delete(
+            f"live:fixture:{fixture_id}", f"live:stale:{fixture_id}", f"live:standings:{seed['season_id']}",
+            key, f"{key}:seen", f"{key}:state",
+        )
+        await service.redis.hdel(LAG_BOARD_KEY, str(fixture_id))
+        await service.redis.zrem("live:events:active", key)
+        await service.close()
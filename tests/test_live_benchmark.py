@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from app.services.scraper.live_clock import match_clock
+from app.services.scraper.live_service import LiveMatchService
+from benchmarks.live_benchmark import main as run_live_benchmark
+from benchmarks.match_simulator import MatchSimulator, SimulatedMatch
+
+HOME = {"id": 1, "name": "Home", "slug": "home"}
+AWAY = {"id": 2, "name": "Away", "slug": "away"}
+
+
+@pytest.mark.asyncio
+async def test_simulated_match_is_parsed_like_sofascore():
+    # Temps réel (speed 1) : coup d'envoi 30 minutes et 20 secondes plus tôt
+    kickoff = time.time() - (30 * 60 + 20)
+    match = SimulatedMatch.generate(42, HOME, AWAY, kickoff, speed=1.0, seed=3)
+    simulator = MatchSimulator([match])
+    service = LiveMatchService()
+    service.api = simulator
+
+    try:
+        live_data = await service.fetch_live_data(42)
+    finally:
+        await service.close()
+
+    assert live_data["status"] == "inprogress"
+    assert match_clock(live_data["match_info"]) == {"minute": 30, "added_time": None}
+    goals = [inc for inc in match.incidents if inc["incidentType"] == "goal" and inc["time"] <= 30]
+    score = live_data["match_info"]["score"]
+    assert score["home"] + score["away"] == len(goals)
+    assert live_data["stats"]["all"]
+    # Changement à la 30e minute, lu 20 secondes après
+    assert simulator.detection_lags == [pytest.approx(20, abs=1)]
+
+    assert match.status(kickoff + 91 * 60) == "finished"
+
+
+@pytest.mark.asyncio
+async def test_benchmark_reports_freshness_for_each_scale():
+    rows = await run_live_benchmark(["--matches", "2,4", "--speed", "900", "--duration", "4", "--poll", "0.2"])
+
+    assert [row["matches"] for row in rows] == [2, 4]
+    for row in rows:
+        assert row["changes_seen"] > 0
+        assert row["freshness_p95_s"] < 2
+        assert row["redis_ops_per_s"] > 0 and row["db_writes_per_s"] > 0
@@ -0,0 +1,92 @@
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api import live_routes
+from app.core.config import settings
+from app.services.scraper.kickoff_index import KickoffIndex
+from app.services.scraper.live_clock import derive_clock, match_clock
+from app.services.scraper.live_events import stream_key
+from app.services.scraper.live_latency import LAG_BOARD_KEY
+from app.services.scraper.replay_api import ReplaySofascoreAPI, cassette_path
+from tests.conftest import SEED_BASE_ID
+
+
+def test_clock_derived_at_read_time():
+    now = 1_000_000.0
+    first_half = {"period_start": now - 600, "initial": 0, "max": 2700, "status_code": 6}
+    assert derive_clock(first_half, now) == {"minute": 10, "added_time": None}
+    # La même horloge lue trois minutes plus tard
+    assert derive_clock(first_half, now + 180) == {"minute": 13, "added_time": None}
+
+    second_half = {"period_start": now - 47 * 60, "initial": 2700, "max": 5400, "status_code": 7}
+    assert derive_clock(second_half, now) == {"minute": 90, "added_time": 2}
+
+    halftime = {**first_half, "status_code": 31}
+    assert derive_clock(halftime, now + 3600) == {"minute": 45, "added_time": None}
+
+    assert derive_clock({"period_start": None}, now) == {"minute": None, "added_time": None}
+    # Cache écrit avant l'horloge brute
+    assert match_clock({"minute": 12}) == {"minute": 12, "added_time": None}
+
+
+def _record_event(cassette_dir, fixture_id, code, period_start, initial=0):
+    event = {"event": {
+        "status": {"type": "inprogress", "code": code},
+        "time": {"currentPeriodStartTimestamp": period_start, "initial": initial, "max": initial + 2700},
+        "changes": {"changeTimestamp": time.time()},
+        "homeScore": {"current": 0}, "awayScore": {"current": 0},
+    }}
+    with open(cassette_path(cassette_dir, f"/event/{fixture_id}"), "w") as f:
+        json.dump(event, f)
+
+
+class _CountingReplay(ReplaySofascoreAPI):
+
+    def __init__(self, cassette_dir):
+        super().__init__(cassette_dir)
+        self.calls = 0
+
+    async def _get(self, endpoint):
+        self.calls += 1
+        return await super()._get(endpoint)
+
+
+@pytest.mark.asyncio
+async def test_tracker_skips_halftime_and_api_keeps_the_clock(client, tmp_path, monkeypatch):
+    fixture_id = SEED_BASE_ID + 950
+    service = live_routes.live_service
+    original_api = service.api
+    service.api = _CountingReplay(tmp_path)
+    monkeypatch.setattr(settings, "LIVE_POLL_SPACING_SECONDS", 0)
+    index = KickoffIndex(lead=timedelta(hours=1), max_duration=timedelta(hours=3))
+    index.add(fixture_id, datetime.utcnow() - timedelta(minutes=50))
+
+    try:
+        # Mi-temps : une lecture, puis plus rien avant la fin de la pause
+        _record_event(tmp_path, fixture_id, 31, time.time() - 47 * 60)
+        await service.track_due_fixtures(index, datetime.utcnow())
+        calls = service.api.calls
+        assert calls > 0
+        assert await service.redis.ttl(f"live:fixture:{fixture_id}") > settings.LIVE_HALFTIME_QUIET_SECONDS
+        await service.track_due_fixtures(index, datetime.utcnow())
+        assert service.api.calls == calls
+
+        response = (await client.get(f"/live/match/{fixture_id}")).json()["data"]
+        assert (response["minute"], response["added_time"]) == (45, None)
+
+        # Deuxième période : minute recalculée à chaque lecture du cache
+        _record_event(tmp_path, fixture_id, 7, time.time() - 10 * 60, initial=2700)
+        await service.update_live_match(fixture_id)
+        response = (await client.get(f"/live/match/{fixture_id}")).json()["data"]
+        assert response["minute"] == 55
+    finally:
+        service.api = original_api
+        service._next_polls.pop(fixture_id, None)
+        service._halftime_since.pop(fixture_id, None)
+        key = stream_key(fixture_id)
+        await service.redis.delete(f"live:fixture:{fixture_id}", f"live:stale:{fixture_id}", key, f"{key}:seen", f"{key}:state")
+        await service.redis.hdel(LAG_BOARD_KEY, str(fixture_id))
+        await service.redis.zrem("live:events:active", key)
@@ -0,0 +1,168 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from sqlalchemy import select
+
+from app.api import live_routes
+from app.auth import verify_websocket_api_key
+from app.db.database import AsyncSessionLocal
+from app.db.models import Fixture, MatchEvent, MatchStatistics
+from app.main import app
+from app.services.scraper.live_events import LiveEventFanout, MatchPersister, stream_key
+from app.services.scraper.live_service import LiveMatchService
+from tests.conftest import SEED_BASE_ID
+
+GOAL = {"id": 77001, "incidentType": "goal", "incidentClass": "regular", "time": 12,
+        "isHome": True, "homeScore": 1, "awayScore": 0}
+CARD = {"id": 77002, "incidentType": "card", "incidentClass": "yellow", "time": 30, "isHome": False}
+STATS = {"statistics": [
+    {"period": "ALL", "groups": [{"statisticsItems": [{"key": "fouls", "homeValue": 9, "awayValue": 11}]}]},
+]}
+
+
+@pytest.fixture
+async def service():
+    service = LiveMatchService()
+    yield service
+    await service.redis.aclose()
+
+
+async def _drop_stream(service, fixture_id):
+    key = stream_key(fixture_id)
+    await service.redis.delete(key, f"{key}:seen", f"{key}:state")
+    await service.redis.zrem("live:events:active", key)
+
+
+@pytest.mark.asyncio
+async def test_append_writes_each_change_once(service):
+    fixture_id = SEED_BASE_ID + 930
+    try:
+        ids = await service.events.append(fixture_id, "inprogress", {"home": 1, "away": 0}, [GOAL])
+        assert len(ids) == 3
+
+        # Même état au passage suivant : rien de nouveau
+        assert await service.events.append(fixture_id, "inprogress", {"home": 1, "away": 0}, [GOAL]) == []
+
+        # Carton et but annulé (VAR) : score revenu à 0-0
+        ids = await service.events.append(fixture_id, "inprogress", {"home": 0, "away": 0}, [GOAL, CARD])
+        assert len(ids) == 2
+
+        records = await service.events.read(fixture_id)
+        assert [r["type"] for r in records] == ["incident", "score", "status", "incident", "score"]
+        assert records[-1]["home"] == 0 and records[3]["kind"] == "card"
+        assert [r["id"] for r in await service.events.read(fixture_id, since=records[2]["id"])] == ids
+    finally:
+        await _drop_stream(service, fixture_id)
+
+
+class _FailingPersister(MatchPersister):
+
+    async def handle(self, fixture_id, records):
+        raise RuntimeError("crash")
+
+
+@pytest.mark.asyncio
+async def test_persister_group_replays_after_consumer_crash(service, seed_data):
+    await seed_data(4)
+    fixture_id = SEED_BASE_ID
+    group = f"test-persister-{uuid.uuid4().hex}"
+
+    crashed = _FailingPersister(service, consumer="crashed", block_ms=10)
+    crashed.group = group
+    survivor = MatchPersister(service, consumer="survivor", block_ms=10, claim_idle_ms=0)
+    survivor.group = group
+
+    try:
+        # Statistiques finales portées par le statut : le cache live n'est pas relu
+        await service.events.append(fixture_id, "finished", {"home": 1, "away": 0}, [GOAL], stats=STATS)
+
+        # Messages lus mais jamais acquittés par le consommateur planté
+        with pytest.raises(RuntimeError):
+            await crashed.poll()
+        assert (await service.redis.xpending(stream_key(fixture_id), group))["pending"] == 3
+
+        assert await survivor.claim_stale(stream_key(fixture_id)) == 3
+        assert (await service.redis.xpending(stream_key(fixture_id), group))["pending"] == 0
+
+        async with AsyncSessionLocal() as session:
+            fixture = (await session.execute(select(Fixture).where(Fixture.sofascore_id == fixture_id))).scalar_one()
+            events = (await session.execute(select(MatchEvent).where(MatchEvent.fixture_id == fixture.id))).scalars().all()
+            fouls = (await session.execute(
+                select(MatchStatistics.fouls).where(MatchStatistics.fixture_id == fixture.id)
+            )).scalars().all()
+        assert [e.sofascore_id for e in events] == [GOAL["id"]]
+        assert fixture.has_events
+        assert sorted(fouls) == [9, 11]
+    finally:
+        await _drop_stream(service, fixture_id)
+
+
+def test_websocket_replays_then_pushes_new_events():
+    fixture_id = SEED_BASE_ID + 931
+    app.dependency_overrides[verify_websocket_api_key] = lambda: None
+    redis = live_routes.live_service.redis
+
+    try:
+        with TestClient(app) as client:
+            first = client.portal.call(live_routes.live_service.events.append, fixture_id, "inprogress", {"home": 0, "away": 0}, [])
+            with client.websocket_connect(f"/live/match/{fixture_id}/ws?since=0") as websocket:
+                assert [websocket.receive_json()["id"] for _ in first] == first
+
+                client.portal.call(live_routes.live_service.events.append, fixture_id, "inprogress", {"home": 1, "away": 0}, [GOAL])
+                pushed = [websocket.receive_json() for _ in range(2)]
+                assert [r["type"] for r in pushed] == ["incident", "score"]
+                assert pushed[1]["home"] == 1
+            client.portal.call(_drop_stream, live_routes.live_service, fixture_id)
+    finally:
+        app.dependency_overrides.pop(verify_websocket_api_key, None)
+        # Connexions ouvertes sur la boucle du TestClient
+        redis.connection_pool.reset()
+
+
+def _eventually(predicate, timeout=2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_websocket_rejects_bad_since_and_unsubscribes_on_disconnect():
+    fixture_id = SEED_BASE_ID + 932
+    app.dependency_overrides[verify_websocket_api_key] = lambda: None
+
+    try:
+        with TestClient(app) as client:
+            with pytest.raises(WebSocketDisconnect) as closed:
+                with client.websocket_connect(f"/live/match/{fixture_id}/ws?since=abc") as websocket:
+                    websocket.receive_json()
+            assert closed.value.code == 1008
+
+            # Aucun événement en vue : le départ du client libère quand même l'abonnement
+            with client.websocket_connect(f"/live/match/{fixture_id}/ws"):
+                assert _eventually(lambda: fixture_id in live_routes.live_fanout.subscribers)
+            assert _eventually(lambda: fixture_id not in live_routes.live_fanout.subscribers)
+    finally:
+        app.dependency_overrides.pop(verify_websocket_api_key, None)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_subscribers_all_receive_events(service):
+    fixture_id = SEED_BASE_ID + 935
+    fanout = LiveEventFanout(service.redis, block_ms=50)
+
+    queues = await asyncio.gather(fanout.subscribe(fixture_id), fanout.subscribe(fixture_id))
+    try:
+        assert len(fanout.subscribers[fixture_id]) == 2
+
+        await service.events.append(fixture_id, "inprogress", {"home": 1, "away": 0}, [GOAL])
+        for queue in queues:
+            record = await asyncio.wait_for(queue.get(), timeout=2)
+            assert record["type"] == "incident"
+    finally:
+        for queue in queues:
+            fanout.unsubscribe(fixture_id, queue)
+        await _drop_stream(service, fixture_id)
@@ -0,0 +1,68 @@
+import json
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.api import live_routes
+from app.services.scraper.live_events import stream_key
+from app.services.scraper.live_latency import LAG_BOARD_KEY
+from app.services.scraper.replay_api import ReplaySofascoreAPI, cassette_path
+from tests.conftest import SEED_BASE_ID
+
+
+def _lag_count(stage, fixture_id):
+    return REGISTRY.get_sample_value("live_lag_seconds_count", {"stage": stage, "fixture": str(fixture_id)})
+
+
+def _record_event(cassette_dir, fixture_id, status, changed_at):
+    event = {"event": {
+        "status": {"type": status},
+        "changes": {"changeTimestamp": changed_at},
+        "homeScore": {"current": 1}, "awayScore": {"current": 0},
+    }}
+    with open(cassette_path(cassette_dir, f"/event/{fixture_id}"), "w") as f:
+        json.dump(event, f)
+
+
+@pytest.mark.asyncio
+async def test_lag_measured_once_per_change_and_shown_on_debug_endpoint(client, tmp_path):
+    fixture_id = SEED_BASE_ID + 940
+    service = live_routes.live_service
+    original_api = service.api
+    service.api = ReplaySofascoreAPI(tmp_path)
+    changed_at = time.time() - 12
+
+    try:
+        _record_event(tmp_path, fixture_id, "inprogress", changed_at)
+        for _ in range(2):
+            await service.update_live_match(fixture_id)
+        # Deux lectures, un seul changement amont
+        assert _lag_count("fetched", fixture_id) == 1
+        assert _lag_count("cached", fixture_id) == 1
+
+        for _ in range(2):
+            assert (await client.get(f"/live/match/{fixture_id}")).status_code == 200
+        assert _lag_count("api", fixture_id) == 1
+
+        response = await client.get("/live/debug/lag")
+        lag = {m["sofascore_id"]: m for m in response.json()["data"]["matches"]}[fixture_id]
+        assert 12 <= lag["last_change_lag_seconds"] < 20
+        assert lag["data_age_seconds"] < 5 and not lag["slo_breached"]
+
+        # Fin de match : le match quitte le tableau et les séries par match disparaissent
+        _record_event(tmp_path, fixture_id, "finished", time.time())
+        await service.update_live_match(fixture_id)
+        assert not await service.redis.hexists(LAG_BOARD_KEY, str(fixture_id))
+        assert _lag_count("cached", fixture_id) is None
+        # Processus API (sans le forget du tracker) : statut final servi, série non recréée
+        for _ in range(2):
+            assert (await client.get(f"/live/match/{fixture_id}")).status_code == 200
+            assert _lag_count("api", fixture_id) is None
+        assert fixture_id not in live_routes.api_lag._last
+    finally:
+        service.api = original_api
+        key = stream_key(fixture_id)
+        await service.redis.delete(f"live:fixture:{fixture_id}", f"live:stale:{fixture_id}", key, f"{key}:seen", f"{key}:state")
+        await service.redis.hdel(LAG_BOARD_KEY, str(fixture_id))
+        await service.redis.zrem("live:events:active", key)
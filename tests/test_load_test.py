@@ -0,0 +1,30 @@
+import pytest
+
+from benchmarks.load_test import TRAFFIC_MIX, build_report, check_budget, main as run_load_test
+
+
+def test_budget_violations():
+    report = build_report({"live_match": [10.0] * 98 + [80.0, 200.0]}, {"live_match": 1}, elapsed=1.0)
+    assert report["live_match"]["p50_ms"] == 10.0
+    assert report["live_match"]["p99_ms"] == 80.0
+
+    budget = {"max_error_rate": 0.0, "endpoints": {
+        "live_match": {"p95_ms": 50, "p99_ms": 50},
+        "standings": {"p95_ms": 50},
+    }}
+    violations = check_budget(report, budget)
+
+    assert "live_match: p99_ms 80.0 > 50" in violations
+    assert "live_match: error_rate 0.01 > 0.0" in violations
+    assert "standings: aucune requête mesurée" in violations
+    assert not any("p95_ms" in v for v in violations)
+
+
+@pytest.mark.asyncio
+async def test_match_day_mix_runs_without_errors():
+    report, _ = await run_load_test(["--requests", "120", "--concurrency", "4", "--no-budget"])
+
+    for name, _, _ in TRAFFIC_MIX:
+        assert report[name]["requests"] > 0, name
+        assert report[name]["errors"] == 0, name
+    assert report["total"]["requests"] == 120
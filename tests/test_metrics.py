@@ -0,0 +1,66 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.core.metrics import endpoint_label
+from app.services.scraper.live_service import LiveMatchService
+from app.services.scraper.metered_api import MeteredSofascoreAPI
+from app.services.scraper.replay_api import ReplaySofascoreAPI
+from tests.conftest import SEED_BASE_ID
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_route_latency_and_sql_per_route(client, seed_data):
+    seed = await seed_data(4)
+    labels = {"method": "GET", "route": "/fixtures"}
+    before = _sample("http_request_sql_statements_sum", **labels)
+
+    response = await client.get("/fixtures", params={"season_id": seed["season_id"]})
+    assert response.status_code == 200
+
+    assert (await client.get("/metrics")).status_code == 403
+    metrics = await client.get("/metrics", headers={"Authorization": f"Bearer {settings.ADMIN_SECRET}"})
+    assert metrics.status_code == 200
+    # Gabarit de route, pas l'URL (un identifiant = une série)
+    assert 'http_request_duration_seconds_count{method="GET",route="/fixtures",status="200"}' in metrics.text
+    assert 'db_pool_connections_in_use{pool="api"}' in metrics.text
+    assert _sample("http_request_sql_statements_sum", **labels) - before >= 2
+    assert _sample("http_request_sql_duration_seconds_sum", **labels) > 0
+
+
+@pytest.mark.asyncio
+async def test_sofascore_calls_by_endpoint_template(tmp_path):
+    assert endpoint_label("/event/12345/lineups?x=1") == "/event/{id}/lineups"
+
+    api = MeteredSofascoreAPI(ReplaySofascoreAPI(tmp_path))
+    errors = _sample("sofascore_request_errors_total", endpoint="/event/{id}/incidents")
+
+    for event_id in (1, 2):
+        with pytest.raises(Exception, match="404"):
+            await api._get(f"/event/{event_id}/incidents")
+
+    assert _sample("sofascore_request_errors_total", endpoint="/event/{id}/incidents") == errors + 2
+    assert _sample("sofascore_request_duration_seconds_count", endpoint="/event/{id}/incidents") >= 2
+
+
+@pytest.mark.asyncio
+async def test_live_cache_hit_ratio_and_redis_latency():
+    service = LiveMatchService(settings.REDIS_URL)
+    fixture_id = SEED_BASE_ID + 900
+    hits, misses = _sample("live_cache_lookups_total", result="hit"), _sample("live_cache_lookups_total", result="miss")
+
+    try:
+        await service.cache_live_data(fixture_id, {"status": "inprogress"})
+        assert await service.get_cached_live_data(fixture_id) == {"status": "inprogress"}
+        await service.get_cached_live_data_many([fixture_id, fixture_id + 1])
+    finally:
+        await service.redis.delete(f"live:fixture:{fixture_id}", f"live:stale:{fixture_id}")
+        await service.redis.aclose()
+
+    assert _sample("live_cache_lookups_total", result="hit") == hits + 2
+    assert _sample("live_cache_lookups_total", result="miss") == misses + 1
+    assert _sample("redis_command_duration_seconds_count", command="mget") >= 1
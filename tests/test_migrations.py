@@ -0,0 +1,54 @@
+import io
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from app.db.models import Base
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+
+
+def _config(buffer=None) -> Config:
+    return Config(str(ALEMBIC_INI), output_buffer=buffer)
+
+
+def _offline_sql(revision_range: str) -> str:
+    # Mode --sql : aucune connexion à la base
+    buffer = io.StringIO()
+    command.upgrade(_config(buffer), revision_range, sql=True)
+    return buffer.getvalue()
+
+
+def test_single_migration_head():
+    assert len(ScriptDirectory.from_config(_config()).get_heads()) == 1
+
+
+def test_migrations_cover_every_table_and_index():
+    sql = _offline_sql("head")
+
+    for table in Base.metadata.sorted_tables:
+        assert f"CREATE TABLE {table.name} " in sql
+        for index in table.indexes:
+            assert f" {index.name} ON {table.name} " in sql, index.name
+
+
+def test_hot_indexes_created_concurrently_outside_transaction():
+    sql = _offline_sql("0002:0003")
+
+    assert "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fixtures_season_date" in sql
+    assert "WHERE is_live" in sql
+
+    # Les CREATE INDEX CONCURRENTLY suivent un COMMIT (autocommit_block)
+    first_index = sql.index("CREATE INDEX CONCURRENTLY")
+    assert sql.rfind("COMMIT;", 0, first_index) > sql.rfind("BEGIN;", 0, first_index)
+
+
+def test_match_tables_partitioned_by_season():
+    sql = _offline_sql("0003:0004")
+
+    for table in ["fixtures", "match_events", "lineups", "match_statistics"]:
+        assert f"CREATE TABLE {table} (LIKE {table}_legacy INCLUDING DEFAULTS) PARTITION BY LIST (season_id)" in sql
+        assert f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT" in sql
+        assert f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, season_id)" in sql
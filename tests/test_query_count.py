@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.database import AsyncSessionLocal
+from app.db.instrumentation import install_query_counter, count_queries, assert_max_queries
+from app.db.models import MatchEvent, EventType
+
+
+def test_counter_counts_statements():
+    engine = create_engine("sqlite://")
+    install_query_counter(engine)
+
+    with engine.connect() as conn:
+        with count_queries() as counter:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+        # Hors du bloc, rien n'est compté
+        conn.execute(text("SELECT 3"))
+
+    assert counter.count == 2
+
+
+def test_assert_max_queries_fails_above_threshold():
+    engine = create_engine("sqlite://")
+    install_query_counter(engine)
+
+    with engine.connect() as conn:
+        with pytest.raises(AssertionError, match="3 requêtes SQL"):
+            with assert_max_queries(2):
+                for i in range(3):
+                    conn.execute(text(f"SELECT {i}"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("team_count", [2, 8])
+async def test_league_top_teams_constant_queries(client, seed_data, team_count):
+    seed = await seed_data(team_count)
+
+    with assert_max_queries(1):
+        response = await client.get(
+            f"/statistics/league/{seed['league_id']}/top-teams",
+            params={"season_id": seed["season_id"]}
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]["top_teams"]) == team_count
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("team_count", [2, 8])
+async def test_fixtures_list_constant_queries(client, seed_data, team_count):
+    seed = await seed_data(team_count)
+
+    # COUNT + SELECT avec jointures, quel que soit le nombre de matchs
+    with assert_max_queries(2):
+        response = await client.get("/fixtures", params={"season_id": seed["season_id"]})
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]["fixtures"]) == team_count // 2
+
+
+@pytest.mark.asyncio
+async def test_season_statistics_single_query(client, seed_data):
+    seed = await seed_data(4)
+    fixture_id = seed["fixture_ids"][0]
+    home_team_id = seed["team_ids"][0]
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            for i, event_type in enumerate([EventType.GOAL, EventType.YELLOW_CARD, EventType.YELLOW_CARD, EventType.RED_CARD]):
+                session.add(MatchEvent(
+                    fixture_id=fixture_id, team_id=home_team_id,
+                    type=event_type, minute=10 + i, is_home=True
+                ))
+
+    with assert_max_queries(1):
+        response = await client.get(f"/seasons/{seed['season_id']}/statistics")
+
+    assert response.status_code == 200
+    statistics = response.json()["data"]["statistics"]
+    assert statistics["total_matches"] == 2
+    assert statistics["finished_matches"] == 2
+    assert statistics["total_goals"] == 1
+    assert statistics["total_yellow_cards"] == 2
+    assert statistics["total_red_cards"] == 1
+
+
+def test_nested_counters_both_record():
+    engine = create_engine("sqlite://")
+    install_query_counter(engine)
+
+    with engine.connect() as conn:
+        with count_queries() as outer:
+            conn.execute(text("SELECT 1"))
+            with count_queries() as inner:
+                conn.execute(text("SELECT 2"))
+
+    assert (outer.count, inner.count) == (2, 1)
+    assert outer.duration >= inner.duration > 0
@@ -0,0 +1,176 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.db.database import engine
+from app.db.instrumentation import count_queries
+from app.db.partitions import ensure_season_partitions, drop_season_partitions
+from tests.conftest import SEED_BASE_ID
+
+
+@pytest.fixture
+async def bulk_seed(seed_data):
+    # Volume suffisant pour des statistiques de planificateur réalistes
+    seed = await seed_data(40)
+    params = {
+        "base": SEED_BASE_ID + 1000,
+        "league_id": seed["league_id"],
+        "season_id": seed["season_id"],
+        "team_ids": seed["team_ids"],
+    }
+
+    async with engine.begin() as conn:
+        # Neuf autres compétitions : les filtres league / season deviennent sélectifs
+        result = await conn.execute(text("""
+            INSERT INTO leagues (sofascore_id, name, type)
+            SELECT :base + g, 'Bulk League ' || g, 'OTHER'
+            FROM generate_series(1, 9) AS g
+            RETURNING id
+        """), params)
+        league_ids = [seed["league_id"], *result.scalars().all()]
+        result = await conn.execute(text("""
+            INSERT INTO seasons (sofascore_id, league_id, year, current)
+            SELECT :base + l.n, l.id, '2099', false
+            FROM unnest(CAST(:league_ids AS INTEGER[])) WITH ORDINALITY AS l(id, n)
+            WHERE l.id <> :league_id
+            ORDER BY l.n
+            RETURNING id
+        """), {**params, "league_ids": league_ids})
+        season_ids = [seed["season_id"], *result.scalars().all()]
+        params.update(league_ids=league_ids, season_ids=season_ids)
+
+    for season_id in season_ids[1:]:
+        await ensure_season_partitions(season_id)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("""
+            INSERT INTO fixtures (sofascore_id, league_id, season_id, home_team_id, away_team_id,
+                                  date, status, is_live, group_name)
+            SELECT :base + g,
+                   (CAST(:league_ids AS INTEGER[]))[1 + g % 10],
+                   (CAST(:season_ids AS INTEGER[]))[1 + g % 10],
+                   (CAST(:team_ids AS INTEGER[]))[1 + g % 40],
+                   (CAST(:team_ids AS INTEGER[]))[1 + (g + 7) % 40],
+                   now() - g * interval '1 hour',
+                   CAST(CASE WHEN g % 10 = 0 THEN 'NOT_STARTED' ELSE 'FINISHED' END AS matchstatus),
+                   g % 200 = 0, 'Group A'
+            FROM generate_series(1, 3000) AS g
+        """), params)
+        await conn.execute(text("""
+            INSERT INTO players (sofascore_id, team_id, name)
+            SELECT :base + g, (CAST(:team_ids AS INTEGER[]))[1 + g % 40], 'Bulk Player ' || g
+            FROM generate_series(1, 400) AS g
+        """), params)
+        await conn.execute(text("""
+            INSERT INTO match_events (fixture_id, season_id, team_id, player_id, type, minute, is_home)
+            SELECT f.id, f.season_id, f.home_team_id, p.id,
+                   CAST((ARRAY['GOAL', 'YELLOW_CARD', 'SUBSTITUTION'])[1 + (f.id + p.id) % 3] AS eventtype),
+                   (f.id + p.id) % 90, true
+            FROM fixtures f
+            JOIN players p ON p.team_id = f.home_team_id AND p.sofascore_id % 3 = f.id % 3
+            WHERE f.season_id = ANY(CAST(:season_ids AS INTEGER[]))
+        """), params)
+        await conn.execute(text("ANALYZE fixtures"))
+        await conn.execute(text("ANALYZE match_events"))
+
+        result = await conn.execute(text(
+            "SELECT id FROM players WHERE sofascore_id = :base + 1"
+        ), params)
+        seed["player_id"] = result.scalar()
+
+    yield seed
+
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "DELETE FROM match_events WHERE fixture_id IN "
+            "(SELECT id FROM fixtures WHERE season_id = ANY(CAST(:season_ids AS INTEGER[])))"
+        ), params)
+        await conn.execute(text(
+            "DELETE FROM fixtures WHERE season_id = ANY(CAST(:season_ids AS INTEGER[])) AND season_id <> :season_id"
+        ), params)
+        await conn.execute(text(
+            "DELETE FROM seasons WHERE id = ANY(CAST(:season_ids AS INTEGER[])) AND id <> :season_id"
+        ), params)
+        await conn.execute(text(
+            "DELETE FROM leagues WHERE id = ANY(CAST(:league_ids AS INTEGER[])) AND id <> :league_id"
+        ), params)
+
+    for season_id in season_ids[1:]:
+        await drop_season_partitions(season_id)
+
+
+async def _plan_names(statements, parameters, key: str) -> set:
+    # EXPLAIN de chaque requête réellement émise par l'endpoint ; seq scan
+    # désactivé pour que le petit jeu de test ne masque pas les index
+    names = set()
+    async with engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+        for statement, params in zip(statements, parameters):
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", params)
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            names.update(_collect(plan[0]["Plan"], key))
+        await conn.rollback()
+    return names
+
+
+async def _indexes_used(statements, parameters) -> set:
+    # Index de partition ramenés à l'index de la table parente
+    used = await _plan_names(statements, parameters, "Index Name")
+    async with engine.connect() as conn:
+        parents = dict((await conn.execute(text(
+            "SELECT c.relname, p.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE c.relkind = 'i'"
+        ))).all())
+    return {parents.get(name, name) for name in used}
+
+
+def _collect(node, key: str) -> set:
+    names = {node[key]} if key in node else set()
+    for child in node.get("Plans", []):
+        names |= _collect(child, key)
+    return names
+
+
+@pytest.mark.asyncio
+# Filtre season_id : couvert par l'élagage de partitions (test suivant)
+@pytest.mark.parametrize("path, params, expected", [
+    ("/fixtures", lambda s: {"league_id": s["league_id"]}, {"ix_fixtures_league_date"}),
+    ("/fixtures", lambda s: {"team_id": s["team_ids"][0]},
+     {"ix_fixtures_home_team_date", "ix_fixtures_away_team_date"}),
+    ("/fixtures", lambda s: {"status": "notstarted"}, {"ix_fixtures_status_date"}),
+    ("/fixtures", lambda s: {"live": "true"}, {"ix_fixtures_live_date"}),
+    ("/fixtures/{fixture_id}/events", lambda s: {}, {"ix_match_events_fixture_type"}),
+    ("/events/goals", lambda s: {"player_id": s["player_id"]}, {"ix_match_events_player_type"}),
+])
+async def test_endpoint_query_uses_index(client, bulk_seed, path, params, expected):
+    seed = bulk_seed
+    url = path.format(fixture_id=seed["fixture_ids"][0])
+
+    with count_queries() as counter:
+        response = await client.get(url, params=params(seed))
+    assert response.status_code == 200
+
+    used = await _indexes_used(counter.statements, counter.parameters)
+    assert expected <= used, f"Index attendus {expected}, utilisés {used}"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, params, table", [
+    ("/fixtures", lambda s: {"season_id": s["season_id"]}, "fixtures"),
+    ("/fixtures/{fixture_id}/events", lambda s: {}, "match_events"),
+])
+async def test_season_query_scans_one_partition(client, bulk_seed, path, params, table):
+    seed = bulk_seed
+    url = path.format(fixture_id=seed["fixture_ids"][0])
+
+    with count_queries() as counter:
+        response = await client.get(url, params=params(seed))
+    assert response.status_code == 200
+
+    scanned = await _plan_names(counter.statements, counter.parameters, "Relation Name")
+    partitions = {name for name in scanned if name.startswith(f"{table}_")}
+    assert partitions == {f"{table}_season_{seed['season_id']}"}, partitions
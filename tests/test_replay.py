@@ -0,0 +1,175 @@
+import json
+import time
+
+import pytest
+from sqlalchemy import delete, select, text
+
+from app.db.database import engine, AsyncSessionLocal
+from app.db.instrumentation import count_queries
+from app.db.partitions import drop_season_partitions, partition_name
+from app.db.models import (
+    League, Season, Team, Player, Fixture, MatchEvent, Lineup, MatchStatistics, PlayerSeasonAggregate
+)
+from app.services.scraper.replay_api import RecordingSofascoreAPI, ReplaySofascoreAPI, cassette_path
+from benchmarks.trace_report import main as trace_report
+from pipeline.benchmark_ingestion import main as run_benchmark
+from tests.conftest import SEED_BASE_ID
+
+BASE_ID = SEED_BASE_ID + 700
+
+
+class _Upstream:
+    # API "réelle" minimale pour l'enregistrement
+
+    async def _get(self, endpoint):
+        if endpoint.endswith("/missing"):
+            raise Exception(f"Failed to fetch {endpoint}: 404")
+        return {"endpoint": endpoint}
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path):
+    recorder = RecordingSofascoreAPI(tmp_path, upstream=_Upstream())
+    assert await recorder._get("/event/1/lineups") == {"endpoint": "/event/1/lineups"}
+    with pytest.raises(Exception):
+        await recorder._get("/event/1/missing")
+    assert cassette_path(tmp_path, "/event/1/lineups").name == "event_1_lineups.json"
+
+    replay = ReplaySofascoreAPI(tmp_path, latency=0.02)
+    started = time.perf_counter()
+    assert await replay._get("/event/1/lineups") == {"endpoint": "/event/1/lineups"}
+    assert time.perf_counter() - started >= 0.02
+
+    # Erreur enregistrée et endpoint jamais vu : rejoués comme des échecs HTTP
+    with pytest.raises(Exception, match="404"):
+        await replay._get("/event/1/missing")
+    with pytest.raises(Exception, match="404"):
+        await replay._get("/event/2/lineups")
+    assert replay.missing == ["/event/2/lineups"]
+    assert replay.calls == 3
+
+
+def _write(directory, endpoint, payload):
+    with open(cassette_path(directory, endpoint), "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+
+
+def _team(offset):
+    return {"id": BASE_ID + offset, "name": f"Replay Team {offset}", "slug": f"replay-team-{offset}"}
+
+
+def _players(team):
+    return [{"id": BASE_ID + team * 100 + n, "name": f"Replay Player {team}-{n}"} for n in range(3)]
+
+
+@pytest.fixture
+def cassettes(tmp_path):
+    events = []
+    for i, (home, away) in enumerate([(0, 1), (2, 3)]):
+        event_id = BASE_ID + i
+        events.append({
+            "id": event_id,
+            "tournament": {"uniqueTournament": {
+                "id": BASE_ID, "name": "Replay Cup", "slug": "replay-cup", "category": {"name": "Test"},
+            }, "groupName": "Group A"},
+            "season": {"id": BASE_ID, "year": "2097", "name": "Replay Cup 2097"},
+            "homeTeam": _team(home),
+            "awayTeam": _team(away),
+            "startTimestamp": 1_900_000_000,
+            "status": {"type": "finished"},
+            "homeScore": {"current": 1},
+            "awayScore": {"current": 0},
+        })
+        _write(tmp_path, f"/event/{event_id}/lineups", {
+            "confirmed": True,
+            **{side: {
+                "formation": "4-4-2", "playerColor": {}, "goalkeeperColor": {}, "missingPlayers": [],
+                "players": [{"player": p, "substitute": False} for p in _players(team)],
+            } for side, team in (("home", home), ("away", away))},
+        })
+        _write(tmp_path, f"/event/{event_id}/incidents", {"incidents": [
+            {"id": BASE_ID + i, "incidentType": "goal", "incidentClass": "regular", "time": 30,
+             "isHome": True, "player": {"id": BASE_ID + home * 100}},
+        ]})
+        _write(tmp_path, f"/event/{event_id}/statistics", {"statistics": [
+            {"period": "ALL", "groups": [{"statisticsItems": [{"key": "fouls", "homeValue": 9, "awayValue": 11}]}]},
+        ]})
+
+    for team in range(4):
+        _write(tmp_path, f"/team/{BASE_ID + team}/players", {"players": [{"player": p} for p in _players(team)]})
+
+    _write(tmp_path, f"/unique-tournament/{BASE_ID}/season/{BASE_ID}/events/round/1", {"events": events})
+    return tmp_path
+
+
+@pytest.fixture
+async def replay_cleanup():
+    yield
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            season_id = await session.scalar(select(Season.id).where(Season.sofascore_id == BASE_ID))
+            if season_id:
+                for model in (PlayerSeasonAggregate, MatchStatistics, MatchEvent, Lineup, Fixture):
+                    await session.execute(delete(model).where(model.season_id == season_id))
+                team_ids = select(Team.id).where(Team.sofascore_id.between(BASE_ID, BASE_ID + 3))
+                await session.execute(delete(Player).where(Player.team_id.in_(team_ids)))
+                await session.execute(delete(Team).where(Team.id.in_(team_ids)))
+                await session.execute(delete(Season).where(Season.id == season_id))
+                await session.execute(delete(League).where(League.sofascore_id == BASE_ID))
+    if season_id:
+        await drop_season_partitions(season_id)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_benchmark_round_replay(cassettes, replay_cleanup):
+    args = [
+        "--scenarios", "round", "--cassettes", str(cassettes),
+        "--league", str(BASE_ID), "--season", str(BASE_ID), "--rounds", "1",
+    ]
+    with count_queries() as counter:
+        [result] = await run_benchmark(args)
+
+    assert result["fixtures"] == 2
+    # season_id des lignes filles transmis par les services : aucune relecture du match par ligne
+    assert not [s for s in counter.statements if s.startswith("SELECT fixtures.season_id \nFROM")]
+    # Par match : 2 effectifs, managers (non enregistré), lineups x2, stats, incidents
+    assert result["http_calls"] == 2 * 7
+    assert result["sql_statements"] > 0
+
+    # Second passage avec --reset : même volume ingéré
+    [again] = await run_benchmark(args + ["--reset"])
+    assert again["fixtures"] == 2
+
+    # Saison créée en cours de run : ses matchs sont dans sa partition, pas dans la partition par défaut
+    async with AsyncSessionLocal() as session:
+        season_id = await session.scalar(select(Season.id).where(Season.sofascore_id == BASE_ID))
+        assert await session.scalar(text(f"SELECT count(*) FROM {partition_name('fixtures', season_id)}")) == 2
+        assert await session.scalar(
+            text("SELECT count(*) FROM fixtures_default WHERE season_id = :id"), {"id": season_id}
+        ) == 0
+
+
+@pytest.mark.asyncio
+async def test_benchmark_trace_per_fixture(cassettes, replay_cleanup, tmp_path):
+    trace_path = tmp_path / "traces.jsonl"
+    await run_benchmark([
+        "--scenarios", "round", "--cassettes", str(cassettes),
+        "--league", str(BASE_ID), "--season", str(BASE_ID), "--rounds", "1",
+        "--trace", str(trace_path),
+    ])
+
+    fixtures, operations = trace_report([str(trace_path)])
+
+    assert sorted(f["event_id"] for f in fixtures) == [BASE_ID, BASE_ID + 1]
+    for row in fixtures:
+        # Appels Sofascore et SQL rattachés au span du match
+        assert row["http_calls"] == 7
+        assert row["sql_statements"] > 0
+        assert row["http_ms"] + row["sql_ms"] + row["python_ms"] <= row["total_ms"] + 1
+    names = {op["operation"] for op in operations}
+    assert {"ingest_team", "ingest_lineups", "get_or_create Team", "sofascore /event/{id}/lineups"} <= names
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.db import database
+from app.db.database import SessionRouter, AsyncSessionLocal, PRIMARY_STICKY_COOKIE, create_engine_for
+
+
+def _request(method: str, cookie: str = None) -> Request:
+    headers = [(b"cookie", f"{PRIMARY_STICKY_COOKIE}={cookie}".encode())] if cookie else []
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+def test_reads_go_to_replica_and_writes_to_primary():
+    router = SessionRouter("primary", "replica", sticky_seconds=5)
+
+    assert router.sessionmaker_for(_request("GET")) == "replica"
+    assert router.sessionmaker_for(_request("POST")) == "primary"
+    assert router.sessionmaker_for(_request("DELETE")) == "primary"
+
+
+def test_read_your_writes_window():
+    router = SessionRouter("primary", "replica", sticky_seconds=5)
+
+    assert router.sessionmaker_for(_request("GET", str(time.time() + 5))) == "primary"
+    assert router.sessionmaker_for(_request("GET", str(time.time() - 1))) == "replica"
+    assert router.sessionmaker_for(_request("GET", "invalide")) == "replica"
+
+    # Fenêtre désactivée : le cookie est ignoré
+    router = SessionRouter("primary", "replica")
+    assert router.sessionmaker_for(_request("GET", str(time.time() + 5))) == "replica"
+
+
+@pytest.fixture
+async def replica_statements(monkeypatch):
+    # Seconde connexion sur la même base, jouant le rôle de réplique
+    replica_engine = create_engine_for("api_replica", settings.DATABASE_URL)
+    statements = []
+    event.listen(
+        replica_engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+    replica = async_sessionmaker(replica_engine, expire_on_commit=False, class_=AsyncSession)
+    monkeypatch.setattr(database, "session_router", SessionRouter(AsyncSessionLocal, replica, 5))
+
+    yield statements
+
+    await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_route_reads_from_replica(client, seed_data, replica_statements):
+    seed = await seed_data()
+
+    response = await client.get("/fixtures", params={"season_id": seed["season_id"]})
+    assert response.status_code == 200
+    assert len(response.json()["data"]["fixtures"]) == len(seed["fixture_ids"])
+    assert any("FROM fixtures" in s for s in replica_statements)
+
+    replica_statements.clear()
+    client.cookies.set(PRIMARY_STICKY_COOKIE, str(time.time() + 5))
+    response = await client.get("/fixtures", params={"season_id": seed["season_id"]})
+    assert response.status_code == 200
+    assert replica_statements == []
@@ -0,0 +1,65 @@
+import httpx
+import pytest
+from sofascore_wrapper.api import BASE_URL
+
+from app.services.scraper.transport import HttpxTransport, SofascoreClient
+
+
+class _Browser:
+    # Repli "navigateur" minimal
+
+    def __init__(self):
+        self.urls = []
+
+    async def get_json(self, url):
+        self.urls.append(url)
+        return 200, {"via": "browser"}
+
+    async def close(self):
+        pass
+
+
+def _transport(handler):
+    return HttpxTransport(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def _sofascore(request):
+    path = request.url.path[len("/api/v1"):]
+    if path == "/event/1/lineups":
+        return httpx.Response(200, json={"confirmed": True})
+    if path == "/event/2/lineups":
+        return httpx.Response(403, text="<html>challenge</html>")
+    if path == "/event/3/lineups":
+        return httpx.Response(200, text="<html>Just a moment...</html>", headers={"content-type": "text/html"})
+    return httpx.Response(404, json={"error": {"code": 404}})
+
+
+@pytest.mark.asyncio
+async def test_plain_http_keeps_wrapper_contract():
+    client = SofascoreClient(_transport(_sofascore))
+
+    assert await client._get("/event/1/lineups") == {"confirmed": True}
+    assert await client._raw_get(f"{BASE_URL}/event/1/lineups") == {"confirmed": True}
+
+    with pytest.raises(Exception, match="Failed to fetch /event/9/lineups: 404"):
+        await client._get("/event/9/lineups")
+    with pytest.raises(Exception, match="403"):
+        await client._get("/event/2/lineups")
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_challenge_falls_back_to_browser_then_cools_down():
+    browser = _Browser()
+    client = SofascoreClient(_transport(_sofascore), browser, challenge_cooldown=300)
+
+    assert await client._get("/event/1/lineups") == {"confirmed": True}
+    assert await client._get("/event/3/lineups") == {"via": "browser"}
+    # Pendant le cooldown, plus d'aller-retour HTTP voué au challenge
+    assert await client._get("/event/1/lineups") == {"via": "browser"}
+    assert client.fallbacks == 2
+    assert browser.urls == [f"{BASE_URL}/event/3/lineups", f"{BASE_URL}/event/1/lineups"]
+
+    client._challenged_until = 0
+    assert await client._get("/event/1/lineups") == {"confirmed": True}
+    await client.close()
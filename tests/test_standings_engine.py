@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import select
+
+from app.db.database import AsyncSessionLocal
+from app.db.models import Standing, Fixture, MatchStatus
+from app.services.standings_engine import compute_group_table, recompute_standings
+
+
+def _ranking(rows):
+    return [row["team_id"] for row in rows]
+
+
+def test_points_then_goal_difference_then_goals_for():
+    results = [
+        (1, 2, 3, 0),
+        (3, 4, 1, 0),
+        (1, 3, 0, 0),
+        (2, 4, 2, 2),
+    ]
+    rows = compute_group_table([1, 2, 3, 4], results)
+
+    assert _ranking(rows) == [1, 3, 4, 2]
+    assert rows[0]["points"] == 4
+    assert rows[0]["goal_difference"] == 3
+    assert [row["rank"] for row in rows] == [1, 2, 3, 4]
+
+
+def test_head_to_head_breaks_remaining_tie():
+    # 1 et 2 à égalité parfaite (points, différence, buts marqués) : 2 a battu 1
+    results = [
+        (1, 2, 0, 1),
+        (1, 3, 1, 0),
+        (1, 4, 0, 0),
+        (2, 3, 0, 0),
+        (2, 4, 0, 1),
+        (3, 4, 0, 0),
+    ]
+    rows = compute_group_table([1, 2, 3, 4], results)
+
+    assert _ranking(rows) == [4, 2, 1, 3]
+    tied = rows[1:3]
+    assert tied[0]["points"] == tied[1]["points"] == 4
+    assert tied[0]["goal_difference"] == tied[1]["goal_difference"]
+    assert tied[0]["goals_for"] == tied[1]["goals_for"]
+
+
+def test_teams_without_matches_are_listed():
+    rows = compute_group_table([1, 2], [], team_names={1: "B", 2: "A"})
+
+    assert _ranking(rows) == [2, 1]
+    assert all(row["total_matches"] == 0 for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_recompute_standings_updates_table(seed_data):
+    seed = await seed_data(4)
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            await recompute_standings(session, seed["season_id"])
+
+        result = await session.execute(
+            select(Standing).where(Standing.season_id == seed["season_id"]).order_by(Standing.rank)
+        )
+        standings = result.scalars().all()
+
+    # Seed : équipe 0 - équipe 1 (0-1), équipe 2 - équipe 3 (2-1)
+    assert [s.team_id for s in standings] == [
+        seed["team_ids"][2], seed["team_ids"][1], seed["team_ids"][3], seed["team_ids"][0]
+    ]
+    assert [s.points for s in standings] == [3, 3, 0, 0]
+    assert all(s.total_matches == 1 for s in standings)
+
+
+@pytest.mark.asyncio
+async def test_live_standings_include_matches_in_progress(client, seed_data):
+    seed = await seed_data(4)
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            fixture = await session.get(Fixture, seed["fixture_ids"][0])
+            fixture.status = MatchStatus.IN_PROGRESS
+            fixture.home_score, fixture.away_score = 3, 0
+
+    response = await client.get(f"/live/standings/{seed['season_id']}")
+
+    assert response.status_code == 200
+    group = response.json()["data"]["standings"]["Group A"]
+    assert group[0]["team"]["id"] == seed["team_ids"][0]
+    assert group[0]["points"] == 3
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+from sqlalchemy import select
+
+from app.api import live_routes
+from app.db.database import AsyncSessionLocal
+from app.db.models import MatchStatTimeline
+from app.services.scraper.live_clock import timeline_position
+from app.services.scraper.stat_timeline import timeline_key
+from tests.conftest import SEED_BASE_ID
+
+
+def _stats(possession, shots, xg):
+    # Format de _parse_stats (période "all")
+    return {"all": {"match_overview": {
+        "ballPossession": {"home": possession, "away": 100 - possession},
+        "totalShotsOnGoal": {"home": shots, "away": 1},
+        "expectedGoals": {"home": xg, "away": 0.1},
+    }}}
+
+
+@pytest.mark.asyncio
+async def test_timeline_recorded_live_then_flushed_to_db(client, seed_data):
+    await seed_data(4)
+    fixture_id = SEED_BASE_ID
+    service = live_routes.live_service
+    timeline = service.timeline
+
+    try:
+        assert await timeline.record(fixture_id, 10, _stats(55, 1, 0.12)) == 3
+        # Rien n'a changé : aucun échantillon écrit
+        assert await timeline.record(fixture_id, 11, _stats(55, 1, 0.12)) == 0
+        assert await timeline.record(fixture_id, 20, _stats(60, 3, 0.87)) == 3
+        assert len((await timeline.redis.hget(timeline_key(fixture_id), "expectedGoals"))) == 2 * 10
+
+        response = await client.get(f"/live/match/{fixture_id}/timeline?stats=ballPossession,expectedGoals")
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert list(data["stats"]) == ["ballPossession", "expectedGoals"]
+        assert data["stats"]["expectedGoals"] == [
+            {"minute": 10, "added_time": None, "home": 0.12, "away": 0.1},
+            {"minute": 20, "added_time": None, "home": 0.87, "away": 0.1},
+        ]
+        assert [p["minute"] for p in data["momentum"]] == [10, 20]
+        assert data["momentum"][1]["value"] > 0
+
+        # Fin de match : copie en base, Redis vidé, même réponse
+        await service.persist_match_data(fixture_id, incidents=[])
+        assert not await timeline.redis.exists(timeline_key(fixture_id))
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(
+                select(MatchStatTimeline).where(MatchStatTimeline.sofascore_id == fixture_id)
+            )).scalars().all()
+        assert {r.stat_key: r.sample_count for r in rows}["totalShotsOnGoal"] == 2
+
+        response = await client.get(f"/live/match/{fixture_id}/timeline?stats=ballPossession,expectedGoals")
+        assert response.json()["data"] == data
+    finally:
+        await timeline.discard(fixture_id)
+
+
+@pytest.mark.asyncio
+async def test_added_time_kept_apart_from_second_half(client):
+    fixture_id = SEED_BASE_ID + 936
+    timeline = live_routes.live_service.timeline
+    now = time.time()
+    first_half = {"period_start": now - 48 * 60, "initial": 0, "max": 2700, "status_code": 6}
+    second_half = {"period_start": now - 3 * 60, "initial": 2700, "max": 5400, "status_code": 7}
+
+    try:
+        # 45+3 puis 48e minute : deux points, dans l'ordre du match
+        await timeline.record(fixture_id, timeline_position(first_half, now), _stats(55, 1, 0.3))
+        await timeline.record(fixture_id, timeline_position(second_half, now), _stats(40, 1, 0.5))
+        assert timeline_position({**first_half, "status_code": 31}, now) is None
+
+        data = (await client.get(f"/live/match/{fixture_id}/timeline?stats=expectedGoals")).json()["data"]
+        assert [(p["minute"], p["added_time"]) for p in data["stats"]["expectedGoals"]] == [(45, 3), (48, None)]
+        assert [(p["minute"], p["added_time"]) for p in data["momentum"]] == [(45, 3), (48, None)]
+    finally:
+        await timeline.discard(fixture_id)
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.services.scraper.tracker_cluster import TrackerCluster
+from tests.conftest import SEED_BASE_ID
+
+FIXTURES = [SEED_BASE_ID + 920 + i for i in range(5)]
+
+
+@pytest.fixture
+async def redis_client():
+    client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_instances_share_fixtures_and_take_over_on_failure(redis_client):
+    tracker_a = TrackerCluster(redis_client, "test-a", lease_seconds=0.5)
+    tracker_b = TrackerCluster(redis_client, "test-b", lease_seconds=0.5)
+
+    try:
+        # Instance seule : tous les matchs
+        assert await tracker_a.claim(FIXTURES, instances=1) == set(FIXTURES)
+
+        # Arrivée de B : A rend son surplus, B le prend, aucun match en double
+        owned_a = await tracker_a.claim(FIXTURES, instances=2)
+        owned_b = await tracker_b.claim(FIXTURES, instances=2)
+        assert len(owned_a) == 3 and len(owned_b) == 2
+        assert owned_a | owned_b == set(FIXTURES) and not owned_a & owned_b
+        assert await tracker_b.owner(min(owned_b)) == "test-b"
+
+        # B s'arrête sans prévenir : ses baux expirent, A reprend tout
+        await asyncio.sleep(0.6)
+        assert await tracker_a.claim(FIXTURES, instances=1) == set(FIXTURES)
+        assert await tracker_b.claim(FIXTURES, instances=2) == set()
+    finally:
+        await tracker_a.leave()
+        await tracker_b.leave()
+
+
+@pytest.mark.asyncio
+async def test_leases_renewed_during_a_long_pass(redis_client):
+    tracker = TrackerCluster(redis_client, "test-pass", lease_seconds=0.3)
+    other = TrackerCluster(redis_client, "test-other", lease_seconds=0.3)
+
+    try:
+        assert await tracker.claim(FIXTURES[:2], instances=1) == set(FIXTURES[:2])
+        # Passage plus long que le bail : renouvelé entre deux matchs, pas seulement au suivant
+        for _ in range(4):
+            await asyncio.sleep(0.12)
+            assert await tracker.keep_alive() == set(FIXTURES[:2])
+        assert await other.claim(FIXTURES[:2], instances=2) == set()
+        assert await tracker.owner(FIXTURES[0]) == "test-pass"
+
+        # Bail repris ailleurs : oublié au renouvellement suivant
+        await redis_client.set(f"tracker:lease:{FIXTURES[0]}", "test-other")
+        await asyncio.sleep(0.12)
+        assert await tracker.keep_alive() == {FIXTURES[1]}
+    finally:
+        await redis_client.delete(f"tracker:lease:{FIXTURES[0]}")
+        await tracker.leave()
+        await other.leave()
+
+
+@pytest.mark.asyncio
+async def test_load_is_reported_per_instance(client, redis_client):
+    tracker = TrackerCluster(redis_client, "test-load", lease_seconds=5)
+
+    try:
+        await tracker.claim(FIXTURES[:2], instances=await tracker.heartbeat())
+        await tracker.heartbeat(polled=2, pass_seconds=1.5)
+
+        response = await client.get("/live/trackers")
+        assert response.status_code == 200
+        loads = {i["instance"]: i for i in response.json()["data"]["instances"]}
+        assert loads["test-load"]["owned"] == "2"
+        assert loads["test-load"]["polled"] == "2"
+
+        await tracker.leave()
+        assert "test-load" not in {i["instance"] for i in await tracker.instances()}
+        assert await tracker.owner(FIXTURES[0]) is None
+    finally:
+        await tracker.leave()
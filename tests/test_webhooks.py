@@ -0,0 +1,275 @@
+import asyncio
+import json
+import uuid
+
+import httpcore
+import httpx
+import pytest
+from sqlalchemy import delete
+
+from app.auth import verify_api_key
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal, engine
+from app.db.models import APIKey, WebhookSubscription
+from app.main import app
+from app.services.scraper.live_events import stream_key
+from app.services.scraper.live_service import LiveMatchService
+from app.services.scraper import webhooks
+from app.services.scraper.webhooks import PublicOnlyTransport, WebhookDispatcher, queue_key, verify_signature
+from tests.conftest import SEED_BASE_ID
+
+GOAL = {"id": 78001, "incidentType": "goal", "incidentClass": "regular", "time": 12,
+        "isHome": False, "homeScore": 0, "awayScore": 1}
+CARD = {"id": 78002, "incidentType": "card", "incidentClass": "yellow", "time": 30, "isHome": True}
+
+
+class Sink:
+    # Récepteur HTTP local (httpx.MockTransport) : enregistre les envois, réponses programmées par URL
+
+    def __init__(self, responses=None, delay=0.0, delays=None):
+        self.received = []
+        self.responses = responses or {}
+        self.delay = delay
+        self.delays = delays or {}
+        self.in_flight = self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delays.get(str(request.url), self.delay))
+        self.in_flight -= 1
+        self.received.append(request)
+        statuses = self.responses.get(str(request.url), [])
+        return httpx.Response(statuses.pop(0) if statuses else 200)
+
+
+class Dialer(httpcore.AsyncNetworkBackend):
+    # Réseau simulé : enregistre les adresses composées, connexion toujours refusée
+
+    def __init__(self):
+        self.dialled = []
+
+    async def connect_tcp(self, host, port, **kwargs):
+        self.dialled.append(host)
+        raise httpcore.ConnectError("connexion refusée")
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+@pytest.fixture
+def public_dns(monkeypatch):
+    # Résolution DNS simulée : hôtes *.test publics sauf internal.test, adresses IP telles quelles
+    addresses = {"internal.test": ["10.0.0.5"]}
+
+    async def resolve_host(host, port):
+        if not host.endswith(".test"):
+            return [host]
+        return addresses.get(host, ["93.184.216.34"])
+
+    monkeypatch.setattr(webhooks, "resolve_host", resolve_host)
+    return addresses
+
+
+@pytest.fixture
+async def api_key():
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            key = APIKey(key=f"test_{uuid.uuid4().hex}", name="webhook tests")
+            session.add(key)
+    yield key
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(delete(WebhookSubscription).where(WebhookSubscription.api_key_id == key.id))
+            await session.execute(delete(APIKey).where(APIKey.id == key.id))
+    await engine.dispose()
+
+
+async def _subscribe(api_key, url, **filters) -> WebhookSubscription:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            subscription = WebhookSubscription(
+                api_key_id=api_key.id, url=url, secret=f"whsec_{uuid.uuid4().hex}", **filters
+            )
+            session.add(subscription)
+    return subscription
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_filters_signs_batches_and_retries(seed_data, api_key, public_dns, monkeypatch):
+    await seed_data(4)
+    fixture_id = SEED_BASE_ID
+    # Équipe extérieure du match suivi ; l'autre abonnement vise un autre match
+    by_team = await _subscribe(api_key, "https://sink.test/team", team_ids=[SEED_BASE_ID + 1])
+    other = await _subscribe(api_key, "https://sink.test/other", fixture_ids=[SEED_BASE_ID + 2])
+
+    sink = Sink(responses={"https://sink.test/team": [503]})
+    service = LiveMatchService()
+    dispatcher = WebhookDispatcher(service, client=httpx.AsyncClient(transport=httpx.MockTransport(sink)), block_ms=10)
+    dispatcher.group = f"test-webhooks-{uuid.uuid4().hex}"
+    monkeypatch.setattr(settings, "WEBHOOK_RETRY_BASE_SECONDS", 0.01)
+
+    try:
+        ids = await service.events.append(fixture_id, "finished", {"home": 0, "away": 1}, [GOAL, CARD])
+        await dispatcher.poll()
+        await dispatcher.drain()
+
+        # Un seul envoi pour les trois événements filtrés (le score n'est pas demandé), refusé : en attente
+        assert len(sink.received) == 1
+        first = sink.received[0]
+        assert str(first.url) == "https://sink.test/team"
+        assert [e["event"] for e in json.loads(first.content)["events"]] == ["goal", "card", "full_time"]
+        assert verify_signature(
+            by_team.secret, first.headers["X-Webhook-Timestamp"], first.content, first.headers["X-Webhook-Signature"]
+        )
+        # Id dérivé des ids du journal : identique si le lot est rejoué
+        assert first.headers["X-Webhook-Id"] == f"{by_team.id}:{fixture_id}:{ids[0]}:{ids[-1]}"
+        assert await service.redis.zcard(queue_key(by_team.id)) == 1
+
+        await asyncio.sleep(0.05)
+        assert await dispatcher.dispatch_due() == 1
+        await dispatcher.drain()
+        retry = sink.received[1]
+        assert retry.headers["X-Webhook-Id"] == first.headers["X-Webhook-Id"]
+        assert retry.headers["X-Webhook-Attempt"] == "2"
+        assert await service.redis.zcard(queue_key(by_team.id)) == 0
+        assert not any(str(request.url) == other.url for request in sink.received)
+    finally:
+        await service.redis.delete(queue_key(by_team.id), queue_key(other.id))
+        key = stream_key(fixture_id)
+        await service.redis.delete(key, f"{key}:seen", f"{key}:state")
+        await service.redis.zrem("live:events:active", key)
+        await service.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_partner_does_not_hold_the_group(api_key, public_dns):
+    fixture_id = SEED_BASE_ID + 933
+    filters = {"fixture_ids": [fixture_id], "event_types": ["score"]}
+    slow = await _subscribe(api_key, "https://sink.test/slow", max_concurrency=1, **filters)
+    fast = await _subscribe(api_key, "https://sink.test/fast", **filters)
+
+    sink = Sink(delays={slow.url: 0.5})
+    service = LiveMatchService()
+    dispatcher = WebhookDispatcher(service, client=httpx.AsyncClient(transport=httpx.MockTransport(sink)), block_ms=10)
+    dispatcher.group = f"test-webhooks-{uuid.uuid4().hex}"
+
+    try:
+        for home in (1, 2):
+            await service.events.append(fixture_id, "inprogress", {"home": home, "away": 0}, [])
+            started = asyncio.get_running_loop().time()
+            await dispatcher.poll()
+            # Messages acquittés sans attendre le partenaire lent
+            assert asyncio.get_running_loop().time() - started < 0.3
+            assert (await service.redis.xpending(stream_key(fixture_id), dispatcher.group))["pending"] == 0
+            await asyncio.sleep(0.05)
+
+        # Partenaire rapide servi deux fois ; le lent a un envoi en cours, l'autre attend sa place
+        assert [str(r.url) for r in sink.received] == [fast.url, fast.url]
+        assert await service.redis.zcard(queue_key(slow.id)) == 2
+
+        await dispatcher.drain()
+        assert await dispatcher.dispatch_due() == 1
+        await dispatcher.drain()
+        assert [str(r.url) for r in sink.received].count(slow.url) == 2
+        assert await service.redis.zcard(queue_key(slow.id)) == 0
+    finally:
+        key = stream_key(fixture_id)
+        await service.redis.delete(key, f"{key}:seen", f"{key}:state", queue_key(slow.id), queue_key(fast.id))
+        await service.redis.zrem("live:events:active", key)
+        await service.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limited_per_subscription(public_dns):
+    sink = Sink(delay=0.02)
+    service = LiveMatchService()
+    dispatcher = WebhookDispatcher(service, client=httpx.AsyncClient(transport=httpx.MockTransport(sink)))
+    subscription = WebhookSubscription(id=-1, url="https://sink.test/slow", secret="s", max_concurrency=2)
+
+    try:
+        payloads = [{"delivery_id": str(n), "events": []} for n in range(6)]
+        assert all(await asyncio.gather(*(dispatcher.deliver(subscription, p) for p in payloads)))
+    finally:
+        await service.close()
+
+    assert len(sink.received) == 6
+    assert sink.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_webhook_routes_scoped_to_api_key(client, api_key, public_dns):
+    app.dependency_overrides[verify_api_key] = lambda: api_key
+
+    # https seulement hors DEBUG, aucune adresse interne (SSRF)
+    for url in ("ftp://nope", "http://partner.test/hook", "https://127.0.0.1/hook",
+                "https://169.254.169.254/latest/meta-data", "https://internal.test/hook"):
+        response = await client.post("/webhooks", params={"url": url})
+        assert response.status_code == 422, url
+    response = await client.post("/webhooks", params={"url": "https://partner.test/hook", "event_types": ["offside"]})
+    assert response.status_code == 422
+
+    response = await client.post("/webhooks", params={
+        "url": "https://partner.test/hook", "team_ids": [SEED_BASE_ID], "event_types": ["goal", "full_time"],
+    })
+    created = response.json()["data"]
+    assert created["secret"].startswith("whsec_")
+    assert created["event_types"] == ["goal", "full_time"]
+
+    listed = (await client.get("/webhooks")).json()["data"]["webhooks"]
+    assert [w["id"] for w in listed] == [created["id"]] and "secret" not in listed[0]
+
+    assert (await client.delete(f"/webhooks/{created['id']}")).status_code == 200
+    assert (await client.get("/webhooks")).json()["data"]["webhooks"][0]["is_active"] is False
+
+
+@pytest.mark.asyncio
+async def test_delivery_refused_when_host_turns_private(api_key, public_dns):
+    sink = Sink()
+    service = LiveMatchService()
+    dispatcher = WebhookDispatcher(service, client=httpx.AsyncClient(transport=httpx.MockTransport(sink)))
+    subscription = await _subscribe(api_key, "https://rebind.test/hook")
+
+    try:
+        # Hôte public à l'enregistrement, privé au moment de l'envoi (DNS rebinding)
+        public_dns["rebind.test"] = ["127.0.0.1"]
+        assert not await dispatcher.deliver(subscription, {"delivery_id": "x", "events": []})
+        assert sink.received == []
+        assert await service.redis.zcard(queue_key(subscription.id)) == 0
+        async with AsyncSessionLocal() as session:
+            refused = await session.get(WebhookSubscription, subscription.id)
+        assert refused.failure_count == 1 and "non publique" in refused.last_error
+    finally:
+        await service.close()
+
+
+@pytest.mark.asyncio
+async def test_connection_limited_to_checked_addresses(api_key, public_dns, monkeypatch):
+    dialer = Dialer()
+    service = LiveMatchService()
+    dispatcher = WebhookDispatcher(service, client=httpx.AsyncClient(transport=PublicOnlyTransport(dialer)))
+    subscription = await _subscribe(api_key, "https://rebind.test/hook")
+    payload = {"delivery_id": "x", "events": []}
+
+    try:
+        # TTL 0 : publique à la vérification, privée à la résolution suivante
+        answers = [["93.184.216.34"], ["127.0.0.1"]]
+
+        async def resolve_host(host, port):
+            return answers.pop(0)
+
+        monkeypatch.setattr(webhooks, "resolve_host", resolve_host)
+        assert not await dispatcher.deliver(subscription, payload)
+        assert dialer.dialled == [] and answers == []
+        async with AsyncSessionLocal() as session:
+            refused = await session.get(WebhookSubscription, subscription.id)
+        assert refused.failure_count == 1 and "127.0.0.1" in refused.last_error
+
+        # Hôte public : la connexion vise l'adresse vérifiée, jamais le nom
+        answers.extend([["93.184.216.34"], ["93.184.216.34"]])
+        assert not await dispatcher.deliver(subscription, payload)
+        assert dialer.dialled == ["93.184.216.34"]
+        assert await service.redis.zcard(queue_key(subscription.id)) == 1
+    finally:
+        await service.redis.delete(queue_key(subscription.id))
+        await service.close()